@@ -0,0 +1,326 @@
+# apps/api/async_views.py
+
+import asyncio
+import contextvars
+import logging
+import re
+from abc import ABC, abstractmethod
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import DatabaseError, connections
+from django.utils.decorators import classonlymethod
+from django.utils.http import parse_etags
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+from apps.api.bulk import aresolve_entities, parse_lookup_items
+from apps.api.cache import response_cache
+from apps.api.conditional import make_etag
+from apps.eol.models import CatalogRevision
+from core.metrics import timed
+from core.routers import read_from_primary
+
+
+logger = logging.getLogger(__name__)
+
+PREFER_WAIT = re.compile(r"(?:^|[,;])\s*wait\s*=\s*(\d+)", re.IGNORECASE)
+
+
+class RevisionWatcher:
+    """
+    Tells long-polling requests when the catalog revision moves.
+
+    One task per event loop re-reads `CatalogRevision` every
+    `API_LONG_POLL["POLL_INTERVAL"]` seconds while at least one request is waiting
+    and wakes all of them on a change, so hundreds of waiting requests cost one
+    single-row query per interval. The task runs outside any request context, on
+    the default executor, and stops once nobody waits.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._task = None
+        self._changed = None
+        self._latest = None
+        self._waiters = 0
+
+    def _bind(self, loop):
+        if self._loop is not loop:
+            self._loop, self._task, self._latest = loop, None, None
+            self._changed = asyncio.Event()
+
+    async def wait(self, revision, timeout):
+        """
+        Wait until the revision differs from `revision`. Returns the new
+        revision, or None once `timeout` seconds have passed.
+        """
+        self._bind(asyncio.get_running_loop())
+        if self._latest is not None and self._latest.revision > revision.revision:
+            return self._latest
+
+        self._waiters += 1
+        try:
+            if self._task is None or self._task.done():
+                self._task = self._loop.create_task(self._poll(), context=contextvars.Context())
+            deadline = self._loop.time() + timeout
+            while (remaining := deadline - self._loop.time()) > 0:
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), remaining)
+                except TimeoutError:
+                    return None
+                if self._latest.revision > revision.revision:
+                    return self._latest
+            return None
+        finally:
+            self._waiters -= 1
+
+    async def _poll(self):
+        read = sync_to_async(CatalogRevision.current, thread_sensitive=False)
+        while self._waiters:
+            try:
+                current = await read()
+            except DatabaseError as exc:
+                logger.warning("Cannot read the catalog revision: %s", exc)
+            else:
+                if self._latest is None or current.revision != self._latest.revision:
+                    self._latest = current
+                    changed, self._changed = self._changed, asyncio.Event()
+                    changed.set()
+            await asyncio.sleep(settings.API_LONG_POLL["POLL_INTERVAL"])
+
+
+revision_watcher = RevisionWatcher()
+
+
+class AsyncViewSetView(View, ABC):
+    """
+    Base of the async (ASGI) read endpoints.
+
+    Every request is served through an instance of a sync catalog viewset
+    (`viewset_class`), so filters, pagination, serializers, authentication,
+    permissions and throttling are exactly the viewset's own:
+    - `prepare()` runs in one `sync_to_async` call: DRF's `initial()` (auth,
+      permission and throttle checks), the catalog revision read and building the
+      lazy queryset.
+    - `respond()` runs on the event loop; querysets are evaluated with the async ORM
+      API (`acount`, `aget`, `async for`).
+    - A request sending `Prefer: wait=<seconds>` whose validators still match is
+      held until the catalog revision moves instead of getting an immediate 304 (see
+      `settings.API_LONG_POLL`). It gives back its DB connection and is woken by
+      `revision_watcher` instead of polling on its own.
+    """
+
+    viewset_class = None
+    basename = None
+    action = None
+    detail = False
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch_action(self, request, *args, **kwargs):
+        viewset = self.viewset_class(
+            basename=self.basename,
+            detail=self.detail,
+            action_map={request.method.lower(): self.action},
+        )
+        viewset.args, viewset.kwargs = args, kwargs
+        request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.request = request
+        viewset.headers = viewset.default_response_headers
+
+        try:
+            state = await sync_to_async(self.prepare)(viewset, request)
+            response = await self.respond(viewset, request, state)
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+
+        response = viewset.finalize_response(request, response, *args, **kwargs)
+        return response.render()
+
+    def prepare(self, viewset, request):
+        viewset.initial(request, *viewset.args, **viewset.kwargs)
+
+    @abstractmethod
+    async def respond(self, viewset, request, state):
+        """Build the response from what `prepare()` returned."""
+
+    #
+    # ─── Long polling ──────────────────────────────────────────────────────────────
+    #
+    def get_wait(self, request):
+        match = PREFER_WAIT.search(request.headers.get("Prefer", ""))
+        if match is None:
+            return 0
+        return min(int(match[1]), settings.API_LONG_POLL["MAX_WAIT"])
+
+    async def wait_for_revision(self, revision, timeout):
+        # The request's DB connection is not needed while it waits.
+        await sync_to_async(connections.close_all)()
+        revision = await revision_watcher.wait(revision, timeout)
+        if revision is not None:
+            # The watcher reads the primary; a replica may not have caught up yet.
+            read_from_primary()
+        return revision
+
+    @staticmethod
+    def prefer_applied(response, wait):
+        if wait:
+            response["Preference-Applied"] = f"wait={wait}"
+        return response
+
+
+class AsyncListView(AsyncViewSetView):
+    """
+    Async `list`: same filters, ordering, pagination (page number or keyset),
+    response cache and validators as the viewset's `list`.
+    """
+
+    action = "list"
+
+    async def get(self, request, *args, **kwargs):
+        return await self.dispatch_action(request, *args, **kwargs)
+
+    def prepare(self, viewset, request):
+        super().prepare(viewset, request)
+        viewset.get_catalog_revision()
+        if getattr(viewset, "values_list_enabled", False):
+            values_serializer = viewset.get_values_serializer()
+            return viewset.get_values_queryset(values_serializer), values_serializer
+        return viewset.filter_queryset(viewset.get_queryset()), None
+
+    async def respond(self, viewset, request, state):
+        queryset, values_serializer = state
+        revision = viewset.get_catalog_revision()
+        etag = viewset.get_list_etag(revision)
+
+        wait = 0
+        not_modified = viewset.check_not_modified(request, etag, revision.updated_at)
+        if not_modified is not None:
+            wait = self.get_wait(request)
+            if not wait or not_modified.status_code != status.HTTP_304_NOT_MODIFIED:
+                return not_modified
+            revision = await self.wait_for_revision(revision, wait)
+            if revision is None:
+                return self.prefer_applied(not_modified, wait)
+            viewset._catalog_revision = revision
+            etag = viewset.get_list_etag(revision)
+
+        key = None
+        data = None
+        if response_cache.enabled:
+            key = viewset.get_cache_key(request)
+            data = response_cache.get(key, revision.revision)
+        if data is None:
+            data = await self.get_data(viewset, request, queryset, values_serializer)
+            if key is not None:
+                response_cache.set(key, viewset.get_cache_namespace(), revision.revision, data)
+
+        response = viewset.set_validators(Response(data), etag, revision.updated_at)
+        return self.prefer_applied(response, wait)
+
+    async def get_data(self, viewset, request, queryset, values_serializer):
+        page = None
+        if viewset.paginator is not None:
+            page = await viewset.paginator.apaginate_queryset(queryset, request, view=viewset)
+        rows = page if page is not None else [row async for row in queryset]
+
+        if values_serializer is not None:
+            data = values_serializer.many(rows)
+        else:
+            data = viewset.get_serializer(rows, many=True).data
+        if page is not None:
+            return viewset.get_paginated_response(data).data
+        return data
+
+
+class AsyncDetailView(AsyncViewSetView):
+    """
+    Async `retrieve`, validated like the viewset's (object `updated_at`, or the
+    catalog revision for models without one).
+    """
+
+    action = "retrieve"
+    detail = True
+
+    async def get(self, request, *args, **kwargs):
+        return await self.dispatch_action(request, *args, **kwargs)
+
+    def prepare(self, viewset, request):
+        super().prepare(viewset, request)
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        return queryset.filter(**{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]})
+
+    async def respond(self, viewset, request, queryset):
+        try:
+            instance = await queryset.aget()
+        except ObjectDoesNotExist:
+            raise NotFound()
+        viewset.check_object_permissions(request, instance)
+
+        if getattr(instance, "updated_at", None) is None:
+            viewset._catalog_revision = await CatalogRevision.acurrent()
+        etag, last_modified = viewset.get_object_validators(instance)
+        not_modified = viewset.check_not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        with timed("serialize"):
+            data = viewset.get_serializer(instance).data
+        return viewset.set_validators(Response(data), etag, last_modified)
+
+
+class AsyncLookupView(AsyncViewSetView):
+    """
+    Async bulk `lookup`. Responses carry an ETag over the catalog revision and the
+    requested pairs; repeating the POST with `If-None-Match` and `Prefer: wait=N`
+    long-polls: it returns fresh results once the catalog changes, or 304 when
+    nothing changed within N seconds.
+    """
+
+    action = "lookup"
+
+    async def post(self, request, *args, **kwargs):
+        return await self.dispatch_action(request, *args, **kwargs)
+
+    def prepare(self, viewset, request):
+        super().prepare(viewset, request)
+        viewset.get_catalog_revision()
+        return parse_lookup_items(request.data, settings.API_BULK_LOOKUP_MAX_ITEMS)
+
+    def get_etag(self, viewset, revision, pairs):
+        return make_etag(viewset.basename, "lookup", revision.revision, viewset.request.accepted_renderer.format, pairs)
+
+    @staticmethod
+    def etag_matches(request, etag):
+        header = request.headers.get("If-None-Match")
+        if not header:
+            return False
+        etags = {value.removeprefix("W/") for value in parse_etags(header)}
+        return "*" in etags or etag.removeprefix("W/") in etags
+
+    async def respond(self, viewset, request, pairs):
+        revision = viewset.get_catalog_revision()
+        etag = self.get_etag(viewset, revision, pairs)
+
+        wait = 0
+        if self.etag_matches(request, etag):
+            wait = self.get_wait(request)
+            changed = await self.wait_for_revision(revision, wait) if wait else None
+            if changed is None:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                return self.prefer_applied(viewset.set_validators(response, etag, revision.updated_at), wait)
+            revision = changed
+            etag = self.get_etag(viewset, revision, pairs)
+
+        matches = await aresolve_entities(viewset.get_queryset(), pairs)
+        response = Response(viewset.get_lookup_data(pairs, matches))
+        return self.prefer_applied(viewset.set_validators(response, etag, revision.updated_at), wait)
@@ -0,0 +1,380 @@
+# apps/api/bulk.py
+
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Length
+from rest_framework.exceptions import ValidationError
+
+from apps.api.serializers import BulkEntityItemSerializer
+from apps.eol import changes
+from apps.eol.aliases import alias_hash, normalize_alias, prefix_candidates
+from apps.eol.lifecycle import LIFECYCLE_DATE_FIELDS
+from apps.eol.models import Vendor
+from apps.eol.signals import catalog_bulk_changed
+
+
+# SQLite caps a statement at 999 bound parameters; a chunk binds at most
+# LOOKUP_CHUNK_SIZE names plus the same number of vendor ids.
+LOOKUP_CHUNK_SIZE = 400
+
+# Rows written per transaction by bulk create/upsert. Existing rows of a chunk are
+# read with the same (name IN, vendor_id IN) query as lookups, so it shares the limit.
+WRITE_CHUNK_SIZE = LOOKUP_CHUNK_SIZE
+
+# Alias hashes bound per query, below SQLite's 999 bound parameters.
+ALIAS_CHUNK_SIZE = 900
+
+DATE_FIELDS = LIFECYCLE_DATE_FIELDS
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _get_items(data, max_items, expected):
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise ValidationError({"items": f"Expected a list of {expected} objects."})
+    if len(items) > max_items:
+        raise ValidationError({"items": f"At most {max_items} items are allowed per request."})
+    return items
+
+
+def parse_lookup_items(data, max_items):
+    """
+    Validate the payload of a bulk lookup request.
+
+    Expects `{"items": [{"vendor": "<vendor name>", "name": "<entity name>"}, ...]}`
+    and returns a list of (vendor name, name) tuples in input order.
+    Validation is done by hand because running a nested DRF serializer over
+    tens of thousands of rows costs more than the lookup itself.
+    """
+    items = _get_items(data, max_items, "{vendor, name}")
+
+    pairs = []
+    errors = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[index] = "Expected an object with 'vendor' and 'name'."
+            continue
+        vendor = item.get("vendor")
+        name = item.get("name")
+        if not isinstance(vendor, str) or not isinstance(name, str) or not vendor or not name:
+            errors[index] = "Both 'vendor' and 'name' must be non-empty strings."
+            continue
+        pairs.append((vendor, name))
+
+    if errors:
+        raise ValidationError({"items": errors})
+    return pairs
+
+
+def resolve_entities(queryset, pairs):
+    """
+    Resolve (vendor name, entity name) pairs against `queryset`.
+
+    - Vendor names are resolved once, in chunks.
+    - Entities are fetched with `name IN (...) AND vendor_id IN (...)` per chunk of
+      distinct names, which is served by the (vendor, name) index.
+    Returns a list aligned with `pairs` holding the matched object or None.
+    """
+    vendor_ids = {}
+    for chunk_qs in _vendor_lookup_querysets(pairs):
+        vendor_ids.update(chunk_qs)
+
+    found = {}
+    for chunk_qs in _entity_lookup_querysets(queryset, pairs, vendor_ids):
+        for obj in chunk_qs:
+            found[(obj.vendor_id, obj.name)] = obj
+
+    return [found.get((vendor_ids.get(vendor), name)) for vendor, name in pairs]
+
+
+async def aresolve_entities(queryset, pairs):
+    """
+    `resolve_entities` for async views, running the same queries through the
+    async ORM API.
+    """
+    vendor_ids = {}
+    for chunk_qs in _vendor_lookup_querysets(pairs):
+        vendor_ids.update([row async for row in chunk_qs])
+
+    found = {}
+    for chunk_qs in _entity_lookup_querysets(queryset, pairs, vendor_ids):
+        async for obj in chunk_qs:
+            found[(obj.vendor_id, obj.name)] = obj
+
+    return [found.get((vendor_ids.get(vendor), name)) for vendor, name in pairs]
+
+
+def _vendor_lookup_querysets(pairs):
+    vendor_names = list({vendor for vendor, _ in pairs})
+    for chunk in _chunks(vendor_names, LOOKUP_CHUNK_SIZE * 2):
+        yield Vendor.objects.filter(name__in=chunk).values_list("name", "id")
+
+
+def _entity_lookup_querysets(queryset, pairs, vendor_ids):
+    # name -> vendor ids it was requested for (only pairs whose vendor exists)
+    wanted = {}
+    for vendor, name in pairs:
+        vendor_id = vendor_ids.get(vendor)
+        if vendor_id is not None:
+            wanted.setdefault(name, set()).add(vendor_id)
+
+    queryset = queryset.order_by()
+    for names in _chunks(list(wanted), LOOKUP_CHUNK_SIZE):
+        ids = set().union(*(wanted[name] for name in names))
+        if len(ids) > LOOKUP_CHUNK_SIZE:
+            ids = None  # too many vendors to bind; the name filter alone is selective enough
+        chunk_qs = queryset.filter(name__in=names)
+        if ids is not None:
+            chunk_qs = chunk_qs.filter(vendor_id__in=ids)
+        yield chunk_qs
+
+
+def parse_resolve_items(data, max_items):
+    """
+    Validate the payload of an alias resolve request.
+
+    Expects `{"items": [{"alias": "<raw string>", "vendor": "<vendor name>"}, ...]}`
+    where `vendor` is optional and an item may also be the raw string alone.
+    Returns a list of (raw string, vendor name or None) in input order.
+    """
+    items = _get_items(data, max_items, "{alias, vendor}")
+
+    entries = []
+    errors = {}
+    for index, item in enumerate(items):
+        vendor = None
+        if isinstance(item, dict):
+            vendor = item.get("vendor")
+            item = item.get("alias")
+        if not isinstance(item, str) or not normalize_alias(item):
+            errors[index] = "'alias' must be a string with at least one letter or digit."
+            continue
+        if vendor is not None and (not isinstance(vendor, str) or not vendor):
+            errors[index] = "'vendor' must be a non-empty string when given."
+            continue
+        entries.append((item, vendor))
+
+    if errors:
+        raise ValidationError({"items": errors})
+    return entries
+
+
+def resolve_aliases(alias_model, entries):
+    """
+    Match (raw string, vendor name or None) entries against `alias_model`.
+
+    - Every input is normalized once; distinct keys are probed through the
+      `key_hash` index in chunks (keys are compared too, so a hash collision can
+      never produce a wrong match).
+    - Exact matches come first. Only inputs left without one probe their prefixes,
+      longest first: "C9300-48P-E" falls back to an alias "C9300-48P", then "C9300".
+    - Only keys and prefixes of a length some alias has are probed; the stored
+      lengths are read once per call from the `Length("key")` index.
+    - A vendor name restricts an entry's matches to that vendor's entities.
+    Returns a list aligned with `entries` of (match type, matched key, entity ids),
+    with match type "exact", "prefix" or None.
+    """
+    keys = [normalize_alias(text) for text, _ in entries]
+    vendor_ids = {}
+    for chunk_qs in _vendor_lookup_querysets([(vendor, None) for _, vendor in entries if vendor is not None]):
+        vendor_ids.update(chunk_qs)
+
+    lengths = set(
+        alias_model.objects.order_by().values_list(Length("key"), flat=True).distinct()
+    )
+    probed = {key for key in keys if len(key) in lengths}
+    found = _find_alias_keys(alias_model, probed)
+    results = [None] * len(entries)
+    misses = []
+    for index, (key, (_, vendor)) in enumerate(zip(keys, entries)):
+        ids = _alias_matches(found, key, vendor, vendor_ids)
+        if ids:
+            results[index] = ("exact", key, ids)
+        else:
+            misses.append(index)
+
+    prefixes = {candidate for index in misses for candidate in prefix_candidates(keys[index], lengths)}
+    found.update(_find_alias_keys(alias_model, prefixes - probed))
+    for index in misses:
+        vendor = entries[index][1]
+        results[index] = (None, None, [])
+        for candidate in prefix_candidates(keys[index], lengths):
+            ids = _alias_matches(found, candidate, vendor, vendor_ids)
+            if ids:
+                results[index] = ("prefix", candidate, ids)
+                break
+    return results
+
+
+def _find_alias_keys(alias_model, keys):
+    # key -> [(entity id, vendor id)] of the aliases with that key
+    by_hash = {alias_hash(key): key for key in keys}
+    entity_field = alias_model.ENTITY_FIELD
+    found = {}
+    for hashes in _chunks(list(by_hash), ALIAS_CHUNK_SIZE):
+        rows = alias_model.objects.filter(key_hash__in=hashes).values_list(
+            "key_hash", "key", f"{entity_field}_id", f"{entity_field}__vendor_id",
+        )
+        for key_hash, key, entity_id, vendor_id in rows:
+            if by_hash.get(key_hash) == key:
+                found.setdefault(key, []).append((entity_id, vendor_id))
+    return found
+
+
+def _alias_matches(found, key, vendor, vendor_ids):
+    entries = found.get(key)
+    if not entries:
+        return []
+    if vendor is not None:
+        vendor_id = vendor_ids.get(vendor)
+        entries = [entry for entry in entries if entry[1] == vendor_id]
+    return sorted({entity_id for entity_id, _ in entries})
+
+
+def parse_write_items(data, max_items):
+    """
+    Validate the rows of a bulk create/upsert request.
+
+    Expects `{"items": [{"vendor": <id>, "name": "...", <lifecycle dates>...}, ...]}`.
+    Rows are validated independently (`BulkEntityItemSerializer`, no queries);
+    a row repeating the (vendor, name) of an earlier row is an error.
+    Returns (rows, errors): a list of (index, attrs) and a dict index -> errors.
+    """
+    items = _get_items(data, max_items, "{vendor, name, ...}")
+
+    rows = []
+    errors = {}
+    seen = {}
+    for index, item in enumerate(items):
+        serializer = BulkEntityItemSerializer(data=item)
+        if not serializer.is_valid():
+            errors[index] = serializer.errors
+            continue
+        attrs = serializer.validated_data
+        key = (attrs["vendor"], attrs["name"])
+        if key in seen:
+            errors[index] = {"non_field_errors": [f"Duplicate of row {seen[key]}."]}
+            continue
+        seen[key] = index
+        rows.append((index, attrs))
+    return rows, errors
+
+
+def existing_vendor_ids(vendor_ids):
+    """
+    The ids among `vendor_ids` that belong to a vendor, in one query per chunk of ids.
+    """
+    vendor_ids = list(vendor_ids)
+    known = set()
+    for chunk in _chunks(vendor_ids, LOOKUP_CHUNK_SIZE * 2):
+        known.update(Vendor.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+    return known
+
+
+def write_entities(model, rows, upsert, known_vendor_ids=None):
+    """
+    Create (or, with `upsert`, create-or-update) `model` rows keyed on (vendor, name).
+
+    - Rows naming a vendor that does not exist fail on their own; pass
+      `known_vendor_ids` when the caller already looked the vendors up.
+    - Rows are written in chunked transactions with `bulk_create`; upserts use
+      `update_conflicts` on the (vendor, name) constraint. Dates missing from a row
+      keep their stored value, and rows whose dates did not change are skipped.
+    - Lifecycle (and software version) fields are computed here, since bulk_create
+      bypasses save(). `catalog_bulk_changed` is sent once if anything was written,
+      even when a later chunk fails.
+    Returns a dict index -> (status, pk or errors), with status one of "created",
+    "updated", "unchanged" or "failed".
+    """
+    results = {}
+
+    known = known_vendor_ids
+    if known is None:
+        known = existing_vendor_ids({attrs["vendor"] for _, attrs in rows})
+
+    valid = []
+    for index, attrs in rows:
+        if attrs["vendor"] in known:
+            valid.append((index, attrs))
+        else:
+            results[index] = ("failed", {"vendor": [f'Invalid pk "{attrs["vendor"]}" - object does not exist.']})
+
+    update_fields = [*DATE_FIELDS, *model.LIFECYCLE_FIELDS, "updated_at"]
+    written = False
+    created_vendor_ids = set()
+    try:
+        for chunk in _chunks(valid, WRITE_CHUNK_SIZE):
+            try:
+                with transaction.atomic():
+                    chunk_results = _write_chunk(model, chunk, upsert, update_fields)
+            except IntegrityError:
+                # A concurrent writer created one of the rows between our read and insert.
+                chunk_results = {
+                    index: ("failed", {"non_field_errors": ["Conflicting concurrent write; retry the row."]})
+                    for index, _ in chunk
+                }
+            results.update(chunk_results)
+            written = written or any(status in ("created", "updated") for status, _ in chunk_results.values())
+            created_vendor_ids.update(
+                attrs["vendor"] for index, attrs in chunk if chunk_results[index][0] == "created"
+            )
+    finally:
+        # Also when a later chunk raised: the committed chunks must not stay
+        # behind the catalog revision, response cache and vendor counters.
+        if written:
+            catalog_bulk_changed.send(sender=model, vendor_ids=created_vendor_ids)
+    return results
+
+
+def _write_chunk(model, chunk, upsert, update_fields):
+    names = list({attrs["name"] for _, attrs in chunk})
+    vendor_ids = list({attrs["vendor"] for _, attrs in chunk})
+    existing = {
+        (obj.vendor_id, obj.name): obj
+        for obj in model.objects.order_by().filter(name__in=names, vendor_id__in=vendor_ids)
+    }
+
+    results = {}
+    pending = []
+    for index, attrs in chunk:
+        current = existing.get((attrs["vendor"], attrs["name"]))
+        if current is not None and not upsert:
+            results[index] = ("failed", {"non_field_errors": ["An object with this vendor and name already exists."]})
+            continue
+        if current is not None and all(
+            getattr(current, field) == attrs[field] for field in DATE_FIELDS if field in attrs
+        ):
+            results[index] = ("unchanged", current.pk)
+            continue
+
+        # Always a fresh instance: rows with a pk would conflict on the primary key
+        # instead of (vendor, name). Unset dates are carried over from `current`.
+        obj = model(vendor_id=attrs["vendor"], name=attrs["name"])
+        for field in DATE_FIELDS:
+            setattr(obj, field, attrs[field] if field in attrs else getattr(current, field, None))
+        obj.set_lifecycle_fields()
+        if hasattr(obj, "set_version_fields"):
+            obj.set_version_fields()
+        pending.append((index, "created" if current is None else "updated", obj, current))
+
+    if pending:
+        objs = [obj for _, _, obj, _ in pending]
+        if upsert:
+            model.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["vendor", "name"],
+                update_fields=update_fields,
+            )
+        else:
+            model.objects.bulk_create(objs)
+        for index, status, obj, current in pending:
+            results[index] = (status, current.pk if current is not None else obj.pk)
+        for status, action in (("created", changes.Action.CREATE), ("updated", changes.Action.UPDATE)):
+            changes.record(model, action, [
+                results[index][1] for index, row_status, _, _ in pending if row_status == status
+            ])
+    return results
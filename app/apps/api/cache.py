@@ -0,0 +1,136 @@
+# apps/api/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe in-process LRU cache with a per-entry time to live.
+
+    - Entries expire after `timeout` seconds and the least recently used entry is
+      dropped once `max_entries` is reached.
+    - Entries are grouped by namespace, so `invalidate()` evicts what depends on one
+      piece of data only.
+    - Each entry remembers the revision of a `RevisionCounter` it was built under
+      and is ignored once the revision moves on: evictions only reach the writing
+      process, the revision fence covers the other workers.
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.timeout > 0
+
+    def get(self, key, revision):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != revision or entry[2] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def set(self, key, namespace, revision, data):
+        with self._lock:
+            self._entries[key] = (namespace, revision, time.monotonic() + self.timeout, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *namespaces):
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[0] in namespaces]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "timeout": self.timeout,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class ResponseCache(TTLCache):
+    """
+    Serialized list responses, namespaced by model label and fenced by
+    `CatalogRevision`.
+    """
+
+
+response_cache = ResponseCache(
+    max_entries=settings.API_RESPONSE_CACHE.get("MAX_ENTRIES", 0),
+    timeout=settings.API_RESPONSE_CACHE.get("TIMEOUT", 0),
+)
+
+
+class CachedListMixin:
+    """
+    Serves `list` from `response_cache`, keyed on the request path plus the
+    normalized query parameters (filters, search, ordering, page, cursor).
+
+    Place it after `ConditionalGetMixin` so 304 checks still run first.
+    """
+
+    # Query parameters that do not change the response data.
+    cache_ignored_params = ("format",)
+
+    def get_cache_namespace(self):
+        return self.get_queryset().model._meta.label_lower
+
+    def get_cache_key(self, request):
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            if key not in self.cache_ignored_params
+            for value in values
+            if value != ""
+        )
+        return (request.build_absolute_uri(request.path), tuple(params))
+
+    def list(self, request, *args, **kwargs):
+        if not response_cache.enabled:
+            return super().list(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        revision = self.get_catalog_revision().revision
+        data = response_cache.get(key, revision)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set(key, self.get_cache_namespace(), revision, response.data)
+        return response
@@ -0,0 +1,94 @@
+# apps/api/conditional.py
+
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.eol.models import CatalogRevision
+from core.metrics import timed
+
+
+def make_etag(*parts):
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode(), usedforsecurity=False)
+    return "W/" + quote_etag(digest.hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified validators to `list` and `retrieve`.
+
+    - Lists are validated against the global `CatalogRevision`, which every save and
+      delete of a Vendor/Product/Software bumps. Checking it is a single-row read, so a
+      304 is returned before the queryset is filtered, paginated or serialized.
+    - Detail objects are validated against their own `updated_at` (plus the vendor
+      name, which is part of the representation). Models without `updated_at` fall
+      back to the catalog revision.
+    ETags are weak and include the negotiated renderer format.
+    """
+
+    def get_catalog_revision(self):
+        # Memoized per request so other mixins can share the read.
+        if not hasattr(self, "_catalog_revision"):
+            self._catalog_revision = CatalogRevision.current()
+        return self._catalog_revision
+
+    def list(self, request, *args, **kwargs):
+        revision = self.get_catalog_revision()
+        etag = self.get_list_etag(revision)
+        not_modified = self.check_not_modified(request, etag, revision.updated_at)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, revision.updated_at)
+
+    def get_list_etag(self, revision):
+        return make_etag(self.basename, "list", revision.revision, self.request.accepted_renderer.format)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        not_modified = self.check_not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        with timed("serialize"):
+            data = self.get_serializer(instance).data
+        return self.set_validators(Response(data), etag, last_modified)
+
+    def get_object_validators(self, instance):
+        format = self.request.accepted_renderer.format
+        updated_at = getattr(instance, "updated_at", None)
+        if updated_at is None:
+            revision = self.get_catalog_revision()
+            return make_etag(self.basename, instance.pk, revision.revision, format), revision.updated_at
+
+        vendor = getattr(instance, "vendor", None)
+        return make_etag(
+            self.basename,
+            instance.pk,
+            updated_at.isoformat(),
+            vendor.name if vendor is not None else "",
+            format,
+        ), updated_at
+
+    def check_not_modified(self, request, etag, last_modified):
+        conditional = get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()),
+        )
+        if conditional is None:
+            return None
+        if conditional.status_code == status.HTTP_412_PRECONDITION_FAILED:
+            return Response(status=status.HTTP_412_PRECONDITION_FAILED)
+        return self.set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+    @staticmethod
+    def set_validators(response, etag, last_modified):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
@@ -0,0 +1,77 @@
+# apps/api/exports.py
+
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, values_serializer, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield one representation dict per row.
+
+    Uses a server-side `values()` iterator joined with the vendor table, so
+    neither model instances nor the full result set are held in memory. Rows are
+    shaped by a `ValuesSerializer`, i.e. exactly like the list endpoint.
+    """
+    rows = values_serializer.values(queryset).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield values_serializer.to_representation(row)
+
+
+def _batched(lines, chunk_size):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= chunk_size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def iter_ndjson(queryset, values_serializer, chunk_size=EXPORT_CHUNK_SIZE):
+    lines = (
+        json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in iter_rows(queryset, values_serializer, chunk_size)
+    )
+    return _batched(lines, chunk_size)
+
+
+def iter_csv(queryset, values_serializer, chunk_size=EXPORT_CHUNK_SIZE):
+    writer = csv.writer(_Echo())
+    header = writer.writerow([name for name, _, _ in values_serializer.plan])
+    lines = (
+        writer.writerow(["" if value is None else value for value in row.values()])
+        for row in iter_rows(queryset, values_serializer, chunk_size)
+    )
+    yield header
+    yield from _batched(lines, chunk_size)
+
+
+EXPORT_FORMATS = {
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+}
+
+
+def streaming_export(queryset, values_serializer, format, filename):
+    """
+    Build a StreamingHttpResponse for `queryset` in the given export format.
+    """
+    response = StreamingHttpResponse(
+        EXPORT_FORMATS[format](queryset, values_serializer),
+        content_type="text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{format}"'
+    return response
@@ -0,0 +1,101 @@
+# apps/api/fastpath.py
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from core.metrics import timed
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer that renders `values()` rows in the exact shape of a
+    ModelSerializer, without building model instances.
+
+    The plan is derived from the ModelSerializer's own fields: every field maps to a
+    `values()` lookup (its `source`, with dots turned into `__`), and values are
+    converted with that field's `to_representation`. Primary-key relations are
+    emitted as the raw id, as `PrimaryKeyRelatedField` does.
+    Fields that cannot be read from a flat row (method fields, nested or many-to-many
+    serializers, `source="*"`) raise ImproperlyConfigured.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.serializer_class = serializer_class
+        self.plan = []
+        for name, field in serializer_class(context=context).fields.items():
+            if field.write_only:
+                continue
+            if (
+                field.source == "*"
+                or isinstance(field, (
+                    serializers.SerializerMethodField,
+                    serializers.BaseSerializer,
+                    serializers.ManyRelatedField,
+                ))
+            ):
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} cannot be rendered from values() rows."
+                )
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                convert = None
+            else:
+                convert = field.to_representation
+            self.plan.append((name, field.source.replace(".", LOOKUP_SEP), convert))
+
+        self.lookups = list(dict.fromkeys(lookup for _, lookup, _ in self.plan))
+
+    def values(self, queryset, *extra):
+        """
+        Return `queryset.values()` with every lookup the plan (and `extra`) needs.
+        """
+        return queryset.values(*dict.fromkeys(self.lookups + list(extra)))
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookup, convert in self.plan:
+            value = row[lookup]
+            data[name] = value if value is None or convert is None else convert(value)
+        return data
+
+    def many(self, rows):
+        with timed("serialize"):
+            return [self.to_representation(row) for row in rows]
+
+
+class ValuesListMixin:
+    """
+    Serves `list` through `ValuesSerializer` built from `serializer_class`.
+
+    Pagination runs on the `values()` queryset; ordering fields and annotations
+    (e.g. `search_rank`) are selected as well so keyset cursors can be read from
+    the rows. Set `values_list_enabled = False` to fall back to the regular
+    ModelSerializer path.
+    """
+
+    values_list_enabled = True
+
+    def get_values_serializer(self):
+        return ValuesSerializer(self.get_serializer_class(), context=self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        if not self.values_list_enabled:
+            return super().list(request, *args, **kwargs)
+
+        values_serializer = self.get_values_serializer()
+        queryset = self.get_values_queryset(values_serializer)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.many(page))
+        return Response(values_serializer.many(queryset))
+
+    def get_values_queryset(self, values_serializer):
+        """
+        The filtered list queryset as `values()` rows for `values_serializer`.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = [field for field in getattr(self, "ordering_fields", None) or [] if field != "__all__"]
+        extra += list(queryset.query.annotations)
+        return values_serializer.values(queryset, *extra)
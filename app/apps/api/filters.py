@@ -0,0 +1,119 @@
+# apps/api/filters.py
+
+import django_filters
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from apps.eol import search
+from apps.eol.lifecycle import LifecycleStatus
+from apps.eol.models import Product, Software
+from apps.eol.versions import normalize_family, version_sort_key
+
+
+ENTITY_FILTERSET_FIELDS = {
+    "vendor": ["exact"],
+    "end_of_life_date": ["lte", "gte", 'isnull'],
+    "end_of_sale_date": ["lte", "gte", 'isnull'],
+    "end_of_engineering_date": ["lte", "gte", 'isnull'],
+    "end_of_life_announced_date": ["lte", "gte", 'isnull'],
+}
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter served by the SQLite FTS5 index (see apps.eol.search).
+
+    Every search word is matched as a word prefix in the object name or vendor name
+    and matches are annotated with `search_rank`. Falls back to the regular
+    `icontains` search when the index is unavailable or the view searches fields
+    that are not indexed.
+    """
+
+    indexed_fields = {"name", "vendor__name"}
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        search_fields = set(self.get_search_fields(view, request) or ())
+        if terms and search_fields and search_fields <= self.indexed_fields:
+            searched = search.search(queryset, " ".join(terms))
+            if searched is not None:
+                return searched
+        return super().filter_queryset(request, queryset, view)
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that sorts full-text matches by relevance (best first) unless
+    the client asked for an explicit ordering.
+    """
+
+    rank_field = "search_rank"
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and self.rank_field in queryset.query.annotations:
+            return [self.rank_field, *(self.get_default_ordering(view) or [])]
+        return super().get_ordering(request, queryset, view)
+
+
+class VersionFilter(django_filters.CharFilter):
+    """
+    Compares `version_key` against the sort key of the given version string, so
+    `version__lt=17.3` is an indexed range scan.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("field_name", "version_key")
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if value in django_filters.constants.EMPTY_VALUES:
+            return qs
+        key = version_sort_key(value)
+        if key is None:
+            raise ValidationError({self.field_name: f"'{value}' is not a version."})
+        return super().filter(qs, key)
+
+
+class EntityFilterSet(django_filters.FilterSet):
+    """
+    Filters shared by products and software: vendor, lifecycle date ranges and the
+    precomputed lifecycle status (`?status=end_of_sale&status=end_of_life`).
+    Subclasses set `Meta.model`.
+    """
+
+    status = django_filters.MultipleChoiceFilter(
+        field_name="lifecycle_status",
+        choices=LifecycleStatus.choices,
+        help_text="Current lifecycle status; repeat the parameter to match any of several.",
+    )
+
+    class Meta:
+        fields = ENTITY_FILTERSET_FIELDS
+
+
+class ProductFilterSet(EntityFilterSet):
+    class Meta(EntityFilterSet.Meta):
+        model = Product
+
+
+class SoftwareFilterSet(EntityFilterSet):
+    """
+    Entity filters plus `family` and version comparisons, e.g.
+    `?family=ios-xe&version__lt=17.3&end_of_sale_date__lte=2025-01-01`.
+    """
+
+    family = django_filters.CharFilter(
+        method="filter_family",
+        help_text="Software family, compared case- and separator-insensitively ('IOS XE' == 'ios-xe').",
+    )
+    version = VersionFilter(lookup_expr="exact", help_text="Exact version, e.g. 17.3.1")
+    version__gt = VersionFilter(lookup_expr="gt", help_text="Versions newer than this one")
+    version__gte = VersionFilter(lookup_expr="gte", help_text="This version or newer")
+    version__lt = VersionFilter(lookup_expr="lt", help_text="Versions older than this one")
+    version__lte = VersionFilter(lookup_expr="lte", help_text="This version or older")
+
+    class Meta(EntityFilterSet.Meta):
+        model = Software
+
+    def filter_family(self, queryset, name, value):
+        return queryset.filter(family_key=normalize_family(value))
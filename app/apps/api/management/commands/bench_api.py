@@ -0,0 +1,353 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack, nullcontext
+from datetime import timedelta
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Max, Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from apps.api.cache import response_cache
+from apps.api.models import APIToken
+from apps.api.schema import code_version
+from apps.eol import changes
+from apps.eol.lifecycle import LifecycleStatus
+from apps.eol.models import Vendor, Product, Software
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Reproducible API benchmark: runs list, filter, search, detail, lookup and write "
+        "requests in-process against the configured database and reports latency "
+        "percentiles, queries and peak Python memory per request. Writes are rolled back, "
+        "so their timings exclude COMMIT and its fsync. "
+        "Save a run with --output and compare a later commit with --compare."
+    )
+
+    # name -> kind; the request itself is built by `request_<name with _>`.
+    scenarios = {
+        "vendors-list": "read",
+        "products-list": "read",
+        "products-list-cursor": "read",
+        "products-filter-status": "read",
+        "products-filter-dates": "read",
+        "products-vendor": "read",
+        "products-search": "read",
+        "products-ordering": "read",
+        "products-detail": "read",
+        "products-lookup": "read",
+        "software-version": "read",
+        "changes": "read",
+        "products-patch": "write",
+        "products-bulk-upsert": "write",
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenarios", nargs="+", choices=list(self.scenarios), default=list(self.scenarios))
+        parser.add_argument("--iterations", type=int, default=50, help="Timed requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=3, help="Untimed requests per scenario.")
+        parser.add_argument("--memory-iterations", type=int, default=3, help="Extra requests traced with tracemalloc.")
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--lookup-items", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--prefix", default="/api/v1/")
+        parser.add_argument("--response-cache", action="store_true", help="Keep the per-worker list response cache on.")
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+        parser.add_argument("--output", help="Also write the JSON results to this file.")
+        parser.add_argument("--compare", help="JSON results of an earlier run to compare against.")
+        parser.add_argument(
+            "--max-regression", type=float, metavar="PERCENT",
+            help="With --compare: fail if a p95 grew by more than PERCENT or a query count grew.",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be positive.")
+        self.rng = random.Random(options["seed"])
+        self.options = options
+        self.prefix = options["prefix"].rstrip("/")
+        self.load_samples()
+
+        baseline = None
+        if options["compare"]:
+            baseline = {row["scenario"]: row for row in json.loads(Path(options["compare"]).read_text())["results"]}
+
+        max_entries = response_cache.max_entries
+        if not options["response_cache"]:
+            response_cache.max_entries = 0
+        token = None
+        try:
+            # The test client always sends "Host: testserver".
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], API_THROTTLE_RATES={}):
+                if any(self.scenarios[name] == "write" for name in options["scenarios"]):
+                    token = self.create_token()
+                client = Client(headers={"authorization": f"Bearer {token.generate_jwt()}"} if token else {})
+                # Writes invalidate caches, so they run last.
+                names = sorted(options["scenarios"], key=lambda name: self.scenarios[name] == "write")
+                results = [self.run_scenario(client, name) for name in names]
+        finally:
+            response_cache.max_entries = max_entries
+            if token is not None:
+                user = token.user
+                token.delete()
+                user.delete()
+
+        report = {"meta": self.get_meta(), "results": results}
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2))
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(results, baseline)
+
+        if baseline is not None and options["max_regression"] is not None:
+            regressions = self.find_regressions(results, baseline, options["max_regression"])
+            if regressions:
+                raise CommandError("Regressions: " + "; ".join(regressions))
+
+    # ─── SAMPLES ───
+
+    def load_samples(self):
+        """
+        Ids, names and dates the requests draw from, sampled once with `--seed`.
+        """
+        self.product_count = Product.objects.count()
+        if not self.product_count:
+            raise CommandError("No products to benchmark against; run generate_catalog first.")
+        self.vendor_ids = list(Vendor.objects.order_by("pk").values_list("pk", flat=True))
+        # Random ids in the pk range (gaps are just skipped): no table scan, and the
+        # same seed draws the same rows.
+        bounds = Product.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        sample = {self.rng.randint(bounds["low"], bounds["high"]) for _ in range(900)}
+        self.product_rows = list(
+            Product.objects.filter(pk__in=sample).order_by("pk").values_list("pk", "vendor_id", "vendor__name", "name")
+        )
+        self.product_pks = [row[0] for row in self.product_rows]
+        self.families = list(
+            Software.objects.exclude(family_key=None).order_by().values_list("family", flat=True).distinct()[:50]
+        ) or ["OS"]
+
+    def random_page(self, count):
+        return self.rng.randint(1, max(1, min(50, count // self.options["page_size"])))
+
+    def random_date(self):
+        return (timezone.localdate() + timedelta(days=self.rng.randint(-3650, 3650))).isoformat()
+
+    # ─── REQUESTS ───
+
+    def request_vendors_list(self):
+        return "get", f"/vendors/?page={self.random_page(len(self.vendor_ids))}&page_size={self.options['page_size']}", None
+
+    def request_products_list(self):
+        return "get", f"/products/?page={self.random_page(self.product_count)}&page_size={self.options['page_size']}", None
+
+    def request_products_list_cursor(self):
+        ordering = self.rng.choice(["name", "-end_of_life_date", "vendor__name"])
+        return "get", f"/products/?pagination=cursor&ordering={ordering}&page_size={self.options['page_size']}", None
+
+    def request_products_filter_status(self):
+        status = self.rng.choice(LifecycleStatus.values)
+        return "get", f"/products/?status={status}&page={self.rng.randint(1, 5)}&page_size={self.options['page_size']}", None
+
+    def request_products_filter_dates(self):
+        # No longer sold but still supported on a given day.
+        day = self.random_date()
+        return "get", (
+            f"/products/?end_of_sale_date__lte={day}&end_of_life_date__gte={day}"
+            f"&page_size={self.options['page_size']}"
+        ), None
+
+    def request_products_vendor(self):
+        return "get", f"/products/?vendor={self.rng.choice(self.vendor_ids)}&page_size={self.options['page_size']}", None
+
+    def request_products_search(self):
+        _, _, vendor_name, name = self.rng.choice(self.product_rows)
+        term = self.rng.choice([name.split()[0], vendor_name.split()[0], name])
+        return "get", f"/products/?search={term}&page_size={self.options['page_size']}", None
+
+    def request_products_ordering(self):
+        ordering = self.rng.choice(["-end_of_life_date", "end_of_sale_date", "next_transition_date", "-name"])
+        return "get", f"/products/?ordering={ordering}&page={self.random_page(self.product_count)}&page_size={self.options['page_size']}", None
+
+    def request_products_detail(self):
+        return "get", f"/products/{self.rng.choice(self.product_pks)}/", None
+
+    def request_products_lookup(self):
+        rows = self.rng.sample(self.product_rows, min(len(self.product_rows), self.options["lookup_items"]))
+        return "post", "/products/lookup/", {"items": [{"vendor": vendor, "name": name} for _, _, vendor, name in rows]}
+
+    def request_software_version(self):
+        family = self.rng.choice(self.families)
+        return "get", f"/software/?family={family}&version__lt={self.rng.randint(1, 10)}.0&page_size={self.options['page_size']}", None
+
+    def request_changes(self):
+        return "get", f"/changes/?since={max(0, changes.latest_cursor() - 1000)}&limit=500", None
+
+    def request_products_patch(self):
+        pk, *_ = self.rng.choice(self.product_rows)
+        return "patch", f"/products/{pk}/", {"end_of_life_date": self.random_date()}
+
+    def request_products_bulk_upsert(self):
+        rows = self.rng.sample(self.product_rows, min(len(self.product_rows), 100))
+        return "post", "/products/bulk-upsert/", {
+            "items": [{"vendor": vendor_id, "name": name, "end_of_life_date": self.random_date()} for _, vendor_id, _, name in rows],
+        }
+
+    # ─── MEASUREMENT ───
+
+    def create_token(self):
+        user = User.objects.create(username=f"bench-api-{time.time_ns()}")
+        token = APIToken.objects.create(
+            name=user.username, user=user, can_write=True, can_edit=True,
+            valid_until=timezone.now() + timedelta(hours=1),
+        )
+        token.allowed_vendors.set(self.vendor_ids)
+        return token
+
+    def build_request(self, name):
+        method, path, body = getattr(self, "request_" + name.replace("-", "_"))()
+        return method, self.prefix + path, body
+
+    def send(self, client, name, request):
+        method, url, body = request
+        write = self.scenarios[name] == "write"
+        with transaction.atomic() if write else nullcontext():
+            if body is None:
+                response = getattr(client, method)(url)
+            else:
+                response = getattr(client, method)(url, body, content_type="application/json")
+            size = len(b"".join(response.streaming_content) if response.streaming else response.content)
+            if write:
+                transaction.set_rollback(True)
+        return response.status_code, size
+
+    def run_scenario(self, client, name):
+        for _ in range(self.options["warmup"]):
+            self.send(client, name, self.build_request(name))
+
+        latencies, queries, sizes, statuses = [], [], [], {}
+        for _ in range(self.options["iterations"]):
+            # Built outside the timed block: some requests read the database.
+            request = self.build_request(name)
+            with ExitStack() as stack:
+                captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in settings.DATABASES]
+                started = time.perf_counter()
+                status, size = self.send(client, name, request)
+                latencies.append(time.perf_counter() - started)
+            queries.append(sum(len(context) for context in captured))
+            sizes.append(size)
+            statuses[status] = statuses.get(status, 0) + 1
+
+        # Separate pass: tracing slows requests down, so it is not timed.
+        peaks = []
+        for _ in range(self.options["memory_iterations"]):
+            request = self.build_request(name)
+            tracemalloc.start()
+            try:
+                self.send(client, name, request)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+
+        return {
+            "scenario": name,
+            "kind": self.scenarios[name],
+            "iterations": len(latencies),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "queries_median": statistics.median(queries),
+            "queries_max": max(queries),
+            "peak_memory_kib": round(max(peaks) / 1024, 1) if peaks else None,
+            "response_bytes_median": statistics.median(sizes),
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            # Writes are rolled back: no COMMIT (nor its fsync) is measured.
+            "committed": self.scenarios[name] != "write",
+        }
+
+    def get_meta(self):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        return {
+            "created_at": timezone.now().isoformat(),
+            "commit": commit,
+            "code_version": code_version(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connections["default"].vendor,
+            "db_profile": getattr(settings, "DB_PROFILE", None),
+            "catalog": {
+                "vendors": len(self.vendor_ids),
+                "products": self.product_count,
+                "software": Software.objects.count(),
+            },
+            "options": {
+                key: self.options[key]
+                for key in ("iterations", "warmup", "memory_iterations", "page_size", "lookup_items", "seed", "response_cache")
+            },
+        }
+
+    # ─── REPORTING ───
+
+    def print_table(self, results, baseline):
+        self.stdout.write(
+            f"{'scenario':<24} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'peak KiB':>9} {'bytes':>9}"
+            + ("  p95 vs baseline" if baseline else "")
+        )
+        for row in results:
+            line = (
+                f"{row['scenario']:<24} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+                f"{row['queries_median']:>8} {row['peak_memory_kib'] or 0:>9.0f} {row['response_bytes_median']:>9.0f}"
+            )
+            before = (baseline or {}).get(row["scenario"])
+            if before:
+                change = 100 * (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+                line += f"  {change:+.1f}% (queries {before['queries_median']} -> {row['queries_median']})"
+            if set(row["statuses"]) - {"200", "201"}:
+                line += f"  statuses {row['statuses']}"
+            if not row.get("committed", True):
+                line += "  (rolled back)"
+            self.stdout.write(line)
+        if any(not row.get("committed", True) for row in results):
+            self.stdout.write(
+                "Rolled-back writes exclude COMMIT and its fsync, which dominate SQLite write "
+                "latency: compare them with each other, not with production timings."
+            )
+
+    @staticmethod
+    def find_regressions(results, baseline, max_regression):
+        regressions = []
+        for row in results:
+            before = baseline.get(row["scenario"])
+            if not before:
+                continue
+            if before["p95_ms"] and 100 * (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] > max_regression:
+                regressions.append(f"{row['scenario']} p95 {before['p95_ms']} -> {row['p95_ms']} ms")
+            if row["queries_median"] > before["queries_median"]:
+                regressions.append(f"{row['scenario']} queries {before['queries_median']} -> {row['queries_median']}")
+        return regressions
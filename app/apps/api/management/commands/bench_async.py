@@ -0,0 +1,169 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+from django.test.utils import override_settings
+
+from apps.api.cache import response_cache
+from apps.eol.models import Product, Software
+
+
+MODELS = {
+    "product": ("products", Product),
+    "software": ("software", Software),
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the sync catalog viewsets against the async (ASGI) endpoints in-process, "
+        "with the same request mix and concurrency, and report throughput, latency "
+        "percentiles and peak thread count. Runs against the configured database, with the "
+        "list response cache off unless --response-cache is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=sorted(MODELS), default="product")
+        parser.add_argument("--endpoints", nargs="+", choices=["list", "detail", "lookup"], default=["list", "detail", "lookup"])
+        parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and mode.")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--lookup-items", type=int, default=200)
+        parser.add_argument("--long-poll", type=int, default=0, metavar="N", help="Also hold N concurrent async long-polls.")
+        parser.add_argument("--long-poll-wait", type=int, default=5, metavar="SECONDS")
+        parser.add_argument("--prefix", default="/api/v1/")
+        parser.add_argument("--token", help="JWT sent as a Bearer token.")
+        parser.add_argument("--throttle", action="store_true", help="Keep API throttling enabled.")
+        parser.add_argument(
+            "--response-cache", action="store_true",
+            help="Keep the per-worker list response cache on (every list request then repeats one cached page).",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+        prefix, model = MODELS[options["model"]]
+        obj = model.objects.select_related("vendor").order_by("pk").first()
+        if obj is None:
+            raise CommandError(f"No {options['model']} rows to benchmark against.")
+
+        self.headers = {}
+        if options["token"]:
+            self.headers["authorization"] = f"Bearer {options['token']}"
+
+        pairs = list(
+            model.objects.order_by("?").values_list("vendor__name", "name")[:options["lookup_items"]]
+        )
+        requests = {
+            "list": ("get", f"{prefix}/?page_size={options['page_size']}", None),
+            "detail": ("get", f"{prefix}/{obj.pk}/", None),
+            "lookup": ("post", f"{prefix}/lookup/", {"items": [{"vendor": v, "name": n} for v, n in pairs]}),
+        }
+
+        max_entries = response_cache.max_entries
+        if not options["response_cache"]:
+            response_cache.max_entries = 0
+        try:
+            # The test client always sends "Host: testserver".
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                with nullcontext() if options["throttle"] else override_settings(API_THROTTLE_RATES={}):
+                    results = asyncio.run(self.run(requests, options))
+        finally:
+            response_cache.max_entries = max_entries
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'endpoint':<10} {'mode':<6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'threads':>8}  statuses"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['endpoint']:<10} {row['mode']:<6} {row['throughput']:>9.1f} {row['p50_ms']:>8.1f} "
+                f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['peak_threads']:>8}  {row['statuses']}"
+            )
+
+    async def run(self, requests, options):
+        client = AsyncClient()
+        results = []
+        for endpoint in options["endpoints"]:
+            method, path, body = requests[endpoint]
+            for mode, url in (("sync", options["prefix"] + path), ("async", options["prefix"] + "async/" + path)):
+                # One untimed request warms caches and connections for both modes alike.
+                await self.request(client, method, url, body)
+                stats = await self.load(client, method, url, body, options["requests"], options["concurrency"])
+                results.append({"endpoint": endpoint, "mode": mode, **stats})
+
+        if options["long_poll"]:
+            url = options["prefix"] + "async/" + requests["list"][1]
+            etag = (await self.request(client, "get", url, None))["ETag"]
+            headers = {"if-none-match": etag, "prefer": f"wait={options['long_poll_wait']}"}
+            stats = await self.load(client, "get", url, None, options["long_poll"], options["long_poll"], headers)
+            results.append({"endpoint": "long-poll", "mode": "async", **stats})
+        return results
+
+    async def request(self, client, method, url, body, headers=None):
+        async with ThreadSensitiveContext():
+            # Like ASGIHandler: sync code of one request runs in its own thread.
+            headers = {**self.headers, **(headers or {})}
+            if method == "post":
+                return await client.post(url, body, content_type="application/json", headers=headers)
+            return await client.get(url, headers=headers)
+
+    async def load(self, client, method, url, body, total, concurrency, headers=None):
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        statuses = Counter()
+        peak_threads = threading.active_count()
+        done = False
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await self.request(client, method, url, body, headers)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] += 1
+
+        async def sample_threads():
+            nonlocal peak_threads
+            while not done:
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(0.005)
+
+        sampler = asyncio.create_task(sample_threads())
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        done = True
+        await sampler
+
+        return {
+            "requests": total,
+            "concurrency": concurrency,
+            "seconds": round(elapsed, 3),
+            "throughput": round(total / elapsed, 1),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "peak_threads": peak_threads,
+            "statuses": dict(statuses),
+        }
+
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.api import snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the downloadable catalog snapshot (/api/v1/snapshot/) if the catalog changed "
+        "since the last one. Run after imports or from cron so downloads never wait for a build."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Rebuild even if the catalog did not change.")
+        parser.add_argument("--interval", type=float, help="Keep checking for changes every INTERVAL seconds.")
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        while True:
+            started = time.monotonic()
+            manifest, built = snapshots.build_snapshot(force=force)
+            if built:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Built {manifest['file']} (revision {manifest['revision']}, {manifest['size']} bytes, "
+                    f"{manifest['counts']}) in {time.monotonic() - started:.2f}s."
+                ))
+            elif not options["interval"]:
+                self.stdout.write(f"{manifest['file']} is up to date (revision {manifest['revision']}).")
+            if not options["interval"]:
+                break
+            force = False
+            time.sleep(options["interval"])
@@ -0,0 +1,329 @@
+import sqlite3
+import tempfile
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+from apps.api.cache import response_cache
+from apps.api.models import APIToken
+from apps.api.tokens import token_cache
+from apps.eol.models import CatalogRevision, Vendor, Product, Software, ProductAlias, SoftwareAlias
+from core.query_budgets import inspect_queries, query_budget
+
+
+# Admin views covered for every ModelAdmin of these apps.
+ADMIN_APPS = ("eol", "api")
+ADMIN_VIEWS = ("changelist", "add", "change")
+
+
+@dataclass
+class Scenario:
+    """
+    One request to `endpoint`; `paged` lists are also run at a second page size,
+    `new_revision` ones right after a catalog change.
+    """
+    endpoint: str
+    method: str = "GET"
+    kwargs: dict = field(default_factory=dict)
+    query: str = ""
+    body: dict = None
+    headers: dict = field(default_factory=dict)
+    paged: bool = False
+    admin: bool = False
+    write: bool = False
+    new_revision: bool = False
+
+
+class Command(BaseCommand):
+    help = (
+        "Check settings.QUERY_BUDGETS: runs requests to every API endpoint and to the admin "
+        "changelist, add and change pages of the catalog and token models against a throwaway "
+        "test database with a small generated catalog. Fails when a request runs more queries "
+        "than its budget, a list's queries grow with its page size, one statement shape "
+        "repeats REPEAT_THRESHOLD times (N+1), or an endpoint has no budget."
+    )
+
+    small_page = 2
+    large_page = 50
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=120, help="Products and software generated.")
+        parser.add_argument("--verbose-report", action="store_true", help="List every request, not just failures.")
+        parser.add_argument(
+            "--current-database", action="store_true",
+            help="Use the configured databases instead of creating test databases (from a TransactionTestCase). "
+                 "The generated catalog is left in them.",
+        )
+
+    def handle(self, *args, **options):
+        max_entries = response_cache.max_entries
+        response_cache.max_entries = 0
+        try:
+            with self.database(options["current_database"]), tempfile.TemporaryDirectory() as snapshot_dir, override_settings(
+                API_THROTTLE_RATES={},
+                CATALOG_SNAPSHOT_DIR=snapshot_dir,
+                API_SCHEMA_CACHE={**settings.API_SCHEMA_CACHE, "DIR": ""},
+                QUERY_INSPECTOR={**settings.QUERY_INSPECTOR, "DETECT": False},
+                API_METRICS={**settings.API_METRICS, "TOKEN": "query-budgets"},
+            ):
+                self.seed(options["rows"])
+                failures, rows = self.run_checks()
+        finally:
+            response_cache.max_entries = max_entries
+
+        for endpoint, method, label, count, budget, problems in rows:
+            if problems or options["verbose_report"]:
+                budget_text = "-" if budget is None else budget
+                self.stdout.write(f"{method:<6} {endpoint:<36} {count:>4} / {budget_text:<4} {label}")
+                for problem in problems:
+                    self.stdout.write(f"       {problem}")
+        if failures:
+            raise CommandError(f"{failures} query budget check(s) failed.")
+        self.stdout.write(self.style.SUCCESS(f"{len(rows)} requests within their query budgets."))
+
+    # ─── DATA ───
+
+    @staticmethod
+    @contextmanager
+    def database(current):
+        if current:
+            yield
+            return
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases=set(settings.DATABASES))
+        try:
+            yield
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def seed(self, rows):
+        call_command(
+            "generate_catalog", vendors=5, products=rows, software=rows, skew=0, seed=1, stdout=StringIO(),
+        )
+        self.vendor = Vendor.objects.order_by("pk").first()
+        self.product = Product.objects.filter(vendor=self.vendor).order_by("pk").first()
+        self.software = Software.objects.filter(vendor=self.vendor).order_by("pk").first()
+        ProductAlias.objects.create(product=self.product, alias="BUDGET-100")
+        SoftwareAlias.objects.create(software=self.software, alias="BUDGET-100")
+
+        self.superuser = User.objects.create_superuser("query-budgets", password=None)
+        self.token = APIToken.objects.create(
+            name="query-budgets", user=self.superuser, can_write=True, can_edit=True, can_delete=True,
+            valid_until=timezone.now() + timedelta(hours=1),
+        )
+        self.token.allowed_vendors.set(Vendor.objects.all())
+
+    # ─── SCENARIOS ───
+
+    def get_scenarios(self):
+        vendor = self.vendor
+        scenarios = [
+            Scenario("api-root"),
+            Scenario("schema"),
+            Scenario("swagger-ui"),
+            Scenario("redoc"),
+            Scenario("cache-stats"),
+            Scenario("changes"),
+            Scenario("changes", query="since=0&limit=100"),
+            Scenario("snapshot", new_revision=True),
+            Scenario("snapshot-manifest", new_revision=True),
+            Scenario("metrics", headers={"authorization": "Bearer query-budgets"}),
+            Scenario("eol_index"),
+            Scenario("vendor-list", paged=True),
+            Scenario("vendor-list", query="search=" + vendor.name.split()[0]),
+            Scenario("vendor-detail", kwargs={"pk": vendor.pk}),
+            Scenario("async-vendor-list", paged=True),
+            Scenario("async-vendor-detail", kwargs={"pk": vendor.pk}),
+        ]
+        for basename, obj in (("product", self.product), ("software", self.software)):
+            lookup = {"items": [{"vendor": vendor.name, "name": obj.name}, {"vendor": vendor.name, "name": "missing"}]}
+            resolve = {"items": ["budget 100", "BUDGET-100-E", {"alias": "budget100", "vendor": vendor.name}, "missing"]}
+            item = {"vendor": vendor.pk, "name": obj.name, "end_of_life_date": "2030-01-01"}
+            scenarios += [
+                Scenario(f"{basename}-list", paged=True),
+                Scenario(f"{basename}-list", query=f"vendor={vendor.pk}&ordering=-end_of_life_date", paged=True),
+                Scenario(f"{basename}-list", query="search=" + obj.name.split()[0], paged=True),
+                Scenario(f"{basename}-list", query="pagination=cursor", paged=True),
+                Scenario(f"{basename}-list", method="POST", body={**item, "name": "Budget 1"}, write=True),
+                Scenario(f"{basename}-detail", kwargs={"pk": obj.pk}),
+                Scenario(f"{basename}-detail", method="PUT", kwargs={"pk": obj.pk}, body=item, write=True),
+                Scenario(f"{basename}-detail", method="PATCH", kwargs={"pk": obj.pk}, body={"end_of_life_date": "2031-01-01"}, write=True),
+                Scenario(f"{basename}-detail", method="DELETE", kwargs={"pk": obj.pk}, write=True),
+                Scenario(f"{basename}-export"),
+                Scenario(f"{basename}-lookup", method="POST", body=lookup),
+                Scenario(f"{basename}-resolve", method="POST", body=resolve),
+                Scenario(f"{basename}-bulk-create", method="POST", body={"items": [{**item, "name": f"Budget {i}"} for i in range(20)]}, write=True),
+                Scenario(f"{basename}-bulk-upsert", method="POST", body={"items": [item, {**item, "name": "Budget 2"}]}, write=True),
+                Scenario(f"async-{basename}-list", paged=True),
+                Scenario(f"async-{basename}-detail", kwargs={"pk": obj.pk}),
+                Scenario(f"async-{basename}-lookup", method="POST", body=lookup),
+            ]
+
+        objects = {Vendor: vendor, Product: self.product, Software: self.software, APIToken: self.token}
+        for model in self.admin_models():
+            prefix = f"admin:{model._meta.app_label}_{model._meta.model_name}"
+            scenarios += [
+                Scenario(f"{prefix}_changelist", paged=True, admin=True),
+                Scenario(f"{prefix}_add", admin=True),
+                Scenario(f"{prefix}_change", kwargs={"object_id": objects[model].pk}, admin=True),
+            ]
+            if admin.site._registry[model].search_fields:
+                scenarios.append(Scenario(f"{prefix}_changelist", query="q=a", paged=True, admin=True))
+        return scenarios
+
+    @staticmethod
+    def admin_models():
+        return [model for model in admin.site._registry if model._meta.app_label in ADMIN_APPS]
+
+    def endpoints(self):
+        """
+        URL names the budgets must cover: all outside the admin, plus the admin views
+        in ADMIN_VIEWS of the project's models.
+        """
+        names = set()
+        pending = [(get_resolver(), "")]
+        while pending:
+            resolver, namespace = pending.pop()
+            for pattern in resolver.url_patterns:
+                if isinstance(pattern, URLResolver):
+                    pending.append((pattern, f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace))
+                elif pattern.name and not namespace:
+                    names.add(pattern.name)
+        for model in self.admin_models():
+            names.update(f"admin:{model._meta.app_label}_{model._meta.model_name}_{view}" for view in ADMIN_VIEWS)
+        return names
+
+    # ─── CHECKS ───
+
+    def run_checks(self):
+        scenarios = self.get_scenarios()
+        api_client = Client(headers={"authorization": f"Bearer {self.token.generate_jwt()}"})
+        admin_client = Client()
+        admin_client.force_login(self.superuser)
+
+        failures = 0
+        rows = []
+        for scenario in scenarios:
+            client = admin_client if scenario.admin else api_client
+            budget = query_budget(scenario.method, scenario.endpoint)
+            try:
+                count, problems = self.check_scenario(client, scenario, budget)
+            except Exception as exc:
+                count, problems = 0, [f"raised {exc.__class__.__name__}: {exc}"]
+            failures += bool(problems)
+            rows.append((scenario.endpoint, scenario.method, scenario.query, count, budget, problems))
+
+        covered = {(scenario.endpoint, scenario.method) for scenario in scenarios}
+        covered_endpoints = {endpoint for endpoint, _ in covered}
+        for endpoint in sorted(self.endpoints() - covered_endpoints):
+            failures += 1
+            rows.append((endpoint, "-", "", 0, None, ["no scenario in check_query_budgets"]))
+        for endpoint, budget in settings.QUERY_BUDGETS.items():
+            # A plain number covers every method of the endpoint.
+            methods = budget if isinstance(budget, dict) else {}
+            stale = [method for method in methods if (endpoint, method) not in covered]
+            if endpoint not in covered_endpoints:
+                stale = list(methods) or ["-"]
+            for method in stale:
+                failures += 1
+                rows.append((endpoint, method, "", 0, query_budget(method, endpoint), ["budget without a scenario"]))
+        return failures, rows
+
+    def check_scenario(self, client, scenario, budget):
+        problems = []
+        count, repeated, status = self.measure(client, scenario, self.large_page if scenario.paged else None)
+        if status >= 400:
+            problems.append(f"status {status}")
+        if budget is None:
+            problems.append("no budget declared in QUERY_BUDGETS")
+        elif count > budget:
+            problems.append(f"over budget by {count - budget}")
+        for shape, times, site in repeated:
+            problems.append(f"{times} queries of one shape from {site}: {shape}")
+        if scenario.paged:
+            small, _, _ = self.measure(client, scenario, self.small_page)
+            if count > small:
+                problems.append(f"queries grow with the page size ({small} at {self.small_page} rows, {count} at {self.large_page})")
+        return count, problems
+
+    def measure(self, client, scenario, page_size):
+        """
+        Send the scenario's request twice: cold (the first request of its kind fills
+        per-process caches) and warm. Returns the larger query count, the repeated
+        shapes of both and the status of the last one.
+        """
+        url = reverse(scenario.endpoint, kwargs=scenario.kwargs)
+        query = scenario.query
+        model_admin = None
+        if page_size is not None:
+            if scenario.admin:
+                model_admin = admin.site._registry[self.model_for(scenario.endpoint)]
+                list_per_page, model_admin.list_per_page = model_admin.list_per_page, page_size
+            else:
+                query = f"{query}&page_size={page_size}" if query else f"page_size={page_size}"
+        if query:
+            url = f"{url}?{query}"
+        count = 0
+        repeated = []
+        try:
+            for _ in range(2):
+                with self.restored_afterwards() if scenario.write else nullcontext():
+                    # Per-worker caches: token permissions and content types.
+                    token_cache.clear()
+                    ContentType.objects.clear_cache()
+                    if scenario.new_revision:
+                        CatalogRevision.bump()
+                    with inspect_queries() as inspector:
+                        response = self.send(client, scenario, url)
+                count = max(count, inspector.count)
+                repeated += [shape for shape in inspector.repeated() if shape not in repeated]
+        finally:
+            if model_admin is not None:
+                model_admin.list_per_page = list_per_page
+        return count, repeated, response.status_code
+
+    @staticmethod
+    @contextmanager
+    def restored_afterwards():
+        """
+        Undo a write request. It runs in autocommit like in production (inside an
+        atomic block its own BEGIN would not be counted); the database is copied
+        before and copied back after with SQLite's backup API.
+        """
+        connection.ensure_connection()
+        saved = sqlite3.connect(":memory:")
+        connection.connection.backup(saved)
+        try:
+            yield
+        finally:
+            saved.backup(connection.connection)
+            saved.close()
+
+    @staticmethod
+    def send(client, scenario, url):
+        method = getattr(client, scenario.method.lower())
+        if scenario.body is None:
+            response = method(url, headers=scenario.headers)
+        else:
+            response = method(url, scenario.body, content_type="application/json", headers=scenario.headers)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def model_for(self, endpoint):
+        name = endpoint.removeprefix("admin:").rsplit("_", 1)[0]
+        return next(model for model in self.admin_models() if f"{model._meta.app_label}_{model._meta.model_name}" == name)
@@ -0,0 +1,109 @@
+import re
+from datetime import date
+
+import django_filters
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+
+from apps.api.views import VendorViewSet, ProductViewSet, SoftwareViewSet
+
+
+# `SCAN eol_product` without `USING ... INDEX` reads the whole table in rowid order.
+FULL_SCAN_RE = re.compile(r"\bSCAN (\w+)\s*$")
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def sample_values(filter):
+    """
+    Values to run `filter` with. Filters are applied directly (no form
+    validation), so related objects do not need to exist.
+    """
+    if isinstance(filter, django_filters.BooleanFilter):
+        return [True, False]
+    if isinstance(filter, django_filters.DateFilter):
+        return [date.today()]
+    if isinstance(filter, django_filters.ModelChoiceFilter):
+        return [filter.queryset.model(pk=1)]
+    if isinstance(filter, django_filters.MultipleChoiceFilter):
+        return [[filter.extra["choices"][0][0]]]
+    if isinstance(filter, django_filters.ChoiceFilter):
+        return [filter.extra["choices"][0][0]]
+    return ["1.0"]
+
+
+def iter_plans():
+    """
+    EXPLAIN QUERY PLAN of every filter x ordering combination advertised by the
+    catalog viewsets: yields (label, plan, filtered).
+    """
+    for viewset in (VendorViewSet, ProductViewSet, SoftwareViewSet):
+        queryset = viewset.queryset
+        connection = connections[router.db_for_read(queryset.model)]
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN checks require SQLite.")
+
+        filtered = [(None, queryset)]
+        filterset_class = getattr(viewset, "filterset_class", None)
+        if filterset_class is not None:
+            filterset = filterset_class(queryset=queryset)
+            for name, filter in filterset.filters.items():
+                for value in sample_values(filter):
+                    filtered.append((f"{name}={value!r}", filter.filter(queryset, value)))
+
+        orderings = [tuple(viewset.ordering)]
+        for field in viewset.ordering_fields:
+            orderings += [(field,), (f"-{field}",)]
+
+        for description, filtered_queryset in filtered:
+            for ordering in orderings:
+                label = f"{viewset.__name__}: {description or '(no filter)'} ordering={','.join(ordering)}"
+                yield label, filtered_queryset.order_by(*ordering).explain(), description is not None
+
+
+def plan_problems(plan, filtered):
+    """
+    - A filtered query must find its rows through an index (no plain SCAN).
+    - An unfiltered query must read rows in the requested order, from an index
+      or the rowid order of the table, instead of sorting it in a temp b-tree.
+    A filtered query may still sort its (already narrowed) result.
+    """
+    lines = plan.splitlines()
+    scans = [match.group(1) for line in lines if (match := FULL_SCAN_RE.search(line))]
+    sorts = any(TEMP_SORT in line for line in lines)
+
+    problems = []
+    if filtered and scans:
+        problems.append(f"filter scans {', '.join(scans)}")
+    if not filtered and sorts:
+        problems.append("sorts the whole table in a temporary b-tree")
+    return problems
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN for every filter x ordering combination advertised by "
+        "the catalog endpoints and fail if a filter is evaluated by scanning the table or "
+        "an unfiltered ordering is served by sorting the whole table. Plans depend on the "
+        "data and its ANALYZE statistics; apps/api/tests/test_query_plans.py checks them "
+        "on a seeded, analyzed database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan.")
+
+    def handle(self, *args, **options):
+        failures = 0
+        checked = 0
+        for label, plan, filtered in iter_plans():
+            problems = plan_problems(plan, filtered)
+            checked += 1
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{label}: {'; '.join(problems)}"))
+                self.stdout.write(f"    {plan.replace(chr(10), chr(10) + '    ')}")
+            elif options["verbose_plans"]:
+                self.stdout.write(f"{label}\n    {plan.replace(chr(10), chr(10) + '    ')}")
+
+        if failures:
+            raise CommandError(f"{failures} of {checked} query plans do not use an index.")
+        self.stdout.write(self.style.SUCCESS(f"All {checked} query plans use an index."))
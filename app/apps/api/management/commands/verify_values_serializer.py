@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.api.fastpath import ValuesSerializer
+from apps.api.views import ProductViewSet, SoftwareViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every Product and Software row through both the ModelSerializer and the "
+        "values() fast path and fail unless the JSON output is byte-identical."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        chunk_size = options["chunk_size"]
+
+        for viewset in (ProductViewSet, SoftwareViewSet):
+            serializer_class = viewset.serializer_class
+            values_serializer = ValuesSerializer(serializer_class)
+            queryset = viewset.queryset.select_related("vendor").order_by("pk")
+
+            checked = 0
+            last_pk = 0
+            while True:
+                chunk = queryset.filter(pk__gt=last_pk)[:chunk_size]
+                instances = list(chunk)
+                if not instances:
+                    break
+                rows = list(values_serializer.values(chunk))
+
+                expected = renderer.render(serializer_class(instances, many=True).data)
+                actual = renderer.render(values_serializer.many(rows))
+                if expected != actual:
+                    for instance, row in zip(instances, rows):
+                        slow = renderer.render(serializer_class(instance).data)
+                        fast = renderer.render(values_serializer.to_representation(row))
+                        if slow != fast:
+                            raise CommandError(
+                                f"{serializer_class.__name__} mismatch for pk={instance.pk}:\n"
+                                f"  serializer: {slow.decode()}\n  values():   {fast.decode()}"
+                            )
+                    raise CommandError(f"{serializer_class.__name__} output differs for pks > {last_pk}.")
+
+                checked += len(instances)
+                last_pk = instances[-1].pk
+
+            self.stdout.write(f"{serializer_class.__name__}: {checked} rows byte-identical.")
+
+        self.stdout.write(self.style.SUCCESS("values() fast path matches the ModelSerializer output."))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.api.schema import CachedSpectacularAPIView, code_version, schema_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the OpenAPI schema in every format served by /api/v1/schema/ and store it in "
+        "settings.API_SCHEMA_CACHE['DIR'], so workers of this code version never run the "
+        "generator. Run at build or deploy time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lang", nargs="+", default=[None], help="Also render these ?lang= variants.")
+
+    def handle(self, *args, **options):
+        view = CachedSpectacularAPIView.as_view()
+        factory = RequestFactory()
+        self.stdout.write(f"Code version: {code_version()}")
+        for lang in options["lang"]:
+            path = reverse("schema") + (f"?lang={lang}" if lang else "")
+            for renderer in CachedSpectacularAPIView.renderer_classes:
+                started = time.monotonic()
+                generated = schema_cache.generated
+                response = view(factory.get(path, HTTP_ACCEPT=renderer.media_type))
+                state = "generated" if schema_cache.generated > generated else "cached"
+                self.stdout.write(
+                    f"{renderer.media_type}{f' [{lang}]' if lang else ''}: {len(response.content)} bytes, "
+                    f"{state} in {time.monotonic() - started:.2f}s."
+                )
+        self.stdout.write(self.style.SUCCESS("Schema cache is warm."))
@@ -1,7 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from apps.eol.models import Vendor
-from apps.eol.abstracts import TimeMixin
+from apps.eol.abstracts import RevisionCounter, TimeMixin
 from rest_framework_simplejwt.tokens import AccessToken
 from datetime import timedelta
 from django.utils import timezone
@@ -113,4 +113,16 @@ class APIToken(
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "API Token"
-        verbose_name_plural = "API Tokens"
\ No newline at end of file
+        verbose_name_plural = "API Tokens"
+
+
+class APITokenRevision(RevisionCounter):
+    """
+    Single-row counter bumped on every change to an APIToken or its allowed vendors.
+    Cached token state from an older revision is discarded (see apps/api/tokens.py),
+    so revocations reach every worker on their next request.
+    """
+
+    class Meta:
+        verbose_name = "API Token Revision"
+        verbose_name_plural = "API Token Revisions"
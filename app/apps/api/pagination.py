@@ -1,6 +1,328 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = "page_size"
-    max_page_size = 1000
\ No newline at end of file
+    max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        `paginate_queryset` for async views: the COUNT(*) and the page are read
+        with the async ORM API instead of through the paginator.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over the queryset's current ordering.
+
+    - The cursor stores the ordering values of the boundary row plus its `id`, which
+      is appended as a tiebreaker, so every position in the ordering is unique.
+    - A page is fetched with a lexicographic `WHERE (a, b, id) > (x, y, z)` filter and
+      `LIMIT page_size + 1`: no COUNT(*) and no OFFSET, so deep pages cost the same as
+      the first one and rows inserted/deleted elsewhere do not shift the page.
+    - NULLs sort after every value for ascending fields (and first for descending ones),
+      which keeps nullable lifecycle dates usable as keys.
+    """
+
+    page_size = StandardResultsSetPagination.page_size
+    page_size_query_param = StandardResultsSetPagination.page_size_query_param
+    max_page_size = StandardResultsSetPagination.max_page_size
+    cursor_query_param = "cursor"
+    tiebreaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        return StandardResultsSetPagination.get_page_size(self, request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([row async for row in self.get_page_queryset(queryset, request)])
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Return the (unevaluated) query for the requested page: the seek filter
+        plus `LIMIT page_size + 1`, the extra row telling whether more follow.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        self.keys = self.get_keys(queryset)
+        values, reverse = self.decode_cursor(request)
+        self.cursor_used = values is not None
+        self.reverse = reverse
+        self.boundary = values
+
+        keys = [(field, not descending) if reverse else (field, descending) for field, descending in self.keys]
+        queryset = queryset.order_by(*(self._order_expression(queryset.model, field, descending) for field, descending in keys))
+        if values is not None:
+            queryset = queryset.filter(self._after(queryset.model, keys, values))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        """
+        Trim the rows read from `get_page_queryset` to the page and record the
+        state the links are built from.
+        """
+        page_size, reverse = self.page_size, self.reverse
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor_used
+
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque keyset cursor taken from the `next`/`previous` links.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+    #
+    # ─── Links ──────────────────────────────────────────────────────────────────────
+    #
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.last_row is None:
+            # Empty page reached backwards: restart from the boundary we came from.
+            return self._link(self.boundary, reverse=False)
+        return self._link(self._row_values(self.last_row), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_row is None:
+            return self._link(self.boundary, reverse=True)
+        return self._link(self._row_values(self.first_row), reverse=True)
+
+    def _link(self, values, reverse):
+        url = remove_query_param(self.base_url, "page")
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values, reverse))
+
+    #
+    # ─── Cursor encoding ───────────────────────────────────────────────────────────
+    #
+    def encode_cursor(self, values, reverse):
+        payload = {"o": self._signature(), "v": values}
+        if reverse:
+            payload["r"] = 1
+        # isoformat() keeps full precision (DjangoJSONEncoder truncates microseconds).
+        raw = json.dumps(payload, default=lambda value: value.isoformat(), separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload["v"]
+            if payload["o"] != self._signature() or len(values) != len(self.keys):
+                raise ValueError
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        return values, bool(payload.get("r"))
+
+    def _signature(self):
+        return ",".join(("-" if descending else "") + field for field, descending in self.keys)
+
+    #
+    # ─── Ordering helpers ──────────────────────────────────────────────────────────
+    #
+    def get_keys(self, queryset):
+        """
+        Return [(field, descending), ...] for the queryset ordering, with the
+        tiebreaker appended so the key is unique.
+        """
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str) or item == "?":
+                continue
+            descending = item.startswith("-")
+            field = item.lstrip("-")
+            if field == "pk":
+                field = self.tiebreaker
+            keys.append((field, descending))
+            if field == self.tiebreaker:
+                break
+        if not any(field == self.tiebreaker for field, _ in keys):
+            keys.append((self.tiebreaker, False))
+        return keys
+
+    def _row_values(self, row):
+        values = []
+        for field, _ in self.keys:
+            if isinstance(row, dict):
+                values.append(row[field])
+                continue
+            value = row
+            for attr in field.split(LOOKUP_SEP):
+                value = getattr(value, attr, None) if value is not None else None
+            values.append(value)
+        return values
+
+    @staticmethod
+    def _is_nullable(model, path):
+        opts = model._meta
+        field = None
+        for name in path.split(LOOKUP_SEP):
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return False  # annotation, e.g. search_rank
+            if field.null:
+                return True
+            if field.is_relation:
+                opts = field.related_model._meta
+        return False
+
+    def _order_expression(self, model, field, descending):
+        if not self._is_nullable(model, field):
+            return f"-{field}" if descending else field
+        if descending:
+            return F(field).desc(nulls_first=True)
+        return F(field).asc(nulls_last=True)
+
+    def _after(self, model, keys, values):
+        """
+        Build the OR-of-ANDs filter selecting rows strictly after `values`.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(keys, values):
+            nullable = self._is_nullable(model, field)
+            if value is None:
+                beyond = Q(**{f"{field}__isnull": False}) if descending else None
+                same = Q(**{f"{field}__isnull": True})
+            else:
+                beyond = Q(**{f"{field}__lt" if descending else f"{field}__gt": value})
+                if nullable and not descending:
+                    beyond |= Q(**{f"{field}__isnull": True})
+                same = Q(**{field: value})
+            if beyond is not None:
+                condition |= equal & beyond
+            equal &= same
+        return condition
+
+
+class EntityResultsSetPagination(StandardResultsSetPagination):
+    """
+    Page-number pagination with an opt-in keyset mode.
+
+    Keyset mode is selected with `?pagination=cursor` (first page) or by passing a
+    `cursor` taken from a previous keyset response. It returns `next`/`previous`
+    links only and never runs a COUNT(*) query.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response["required"] = ["results"]
+        response["properties"]["count"]["description"] = "Omitted in keyset (cursor) mode."
+        return response
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` to use keyset pagination (no count, stable deep pages).",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+        ] + self.keyset_class().get_schema_operation_parameters(view)
@@ -2,12 +2,14 @@
 
 from rest_framework import permissions
 from rest_framework.exceptions import PermissionDenied, NotAuthenticated
-from apps.api.models import APIToken
+from apps.api.tokens import get_token_state
 from django.utils import timezone
 
 class TokenPermission(permissions.BasePermission):
     """
     - Safe (read‐only) methods (GET/HEAD/OPTIONS) are always allowed.
+    - Actions listed in the view's `read_only_actions` (e.g. bulk lookups sent as
+      POST) are treated like safe methods.
     - For POST:
         • JWT required. Check token exists and not expired.
         • token.can_write must be True.
@@ -20,20 +22,32 @@ class TokenPermission(permissions.BasePermission):
         • JWT required. Check token exists and not expired.
         • token.can_delete must be True.
         • The existing object's vendor must be in token.allowed_vendors.
+    - For bulk actions (the view's `bulk_actions`):
+        • JWT required. Check token exists and not expired.
+        • Every flag the action lists must be True.
+        • All existing vendors of the batch (`view.get_bulk_vendor_ids()`) must be
+          in token.allowed_vendors; checked as one set difference. Rows naming a
+          vendor that does not exist fail on their own.
+    Token state (flags + allowed vendor ids) comes from the token cache and is
+    memoized on the request, so has_permission/has_object_permission share it.
     """
 
-    def _get_api_token(self, token_payload):
+    def _get_api_token(self, request):
         """
-        Look up APIToken row by token_key. Check expiration (valid_until).
+        Look up the token state by token_key. Check expiration (valid_until).
         Raises PermissionDenied on any failure.
         """
+        api_token = getattr(request, "_api_token_state", None)
+        if api_token is not None:
+            return api_token
+
+        token_payload = request.auth
         token_key = token_payload.get("token_key")
         if not token_key:
             raise PermissionDenied("Malformed token: missing token_key.")
 
-        try:
-            api_token = APIToken.objects.get(key=token_key)
-        except APIToken.DoesNotExist:
+        api_token = get_token_state(token_key)
+        if api_token is None:
             raise PermissionDenied("Token has been revoked or does not exist.")
 
         valid_until_ts = token_payload.get("valid_until")
@@ -42,17 +56,35 @@ class TokenPermission(permissions.BasePermission):
         if timezone.now().timestamp() >= valid_until_ts:
             raise PermissionDenied("Token has expired.")
 
+        request._api_token_state = api_token
         return api_token
 
-    def has_permission(self, request, view):
+    def _is_read_only(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
+        return getattr(view, "action", None) in getattr(view, "read_only_actions", ())
+
+    def has_permission(self, request, view):
+        if self._is_read_only(request, view):
+            return True
 
         token_payload = request.auth
         if not token_payload:
             raise NotAuthenticated("A valid JWT is required for write/edit/delete operations.")
 
-        api_token = self._get_api_token(token_payload)
+        api_token = self._get_api_token(request)
+
+        bulk_flags = getattr(view, "bulk_actions", {}).get(getattr(view, "action", None))
+        if bulk_flags is not None:
+            for flag in bulk_flags:
+                if not getattr(api_token, flag):
+                    raise PermissionDenied(f"This token does not have {flag.removeprefix('can_')} permissions.")
+            denied = view.get_bulk_vendor_ids() - api_token.allowed_vendor_ids
+            if denied:
+                raise PermissionDenied(
+                    f"You may not write objects for vendor(s): {', '.join(map(str, sorted(denied)))}."
+                )
+            return True
 
         if request.method == "POST":
             if not api_token.can_write:
@@ -63,7 +95,7 @@ class TokenPermission(permissions.BasePermission):
                     vendor_id = int(vendor_id)
                 except (ValueError, TypeError):
                     raise PermissionDenied("Invalid vendor ID.")
-                if not api_token.allowed_vendors.filter(id=vendor_id).exists():
+                if not api_token.allows_vendor(vendor_id):
                     raise PermissionDenied("You may not create objects for that vendor.")
             return True
 
@@ -80,25 +112,24 @@ class TokenPermission(permissions.BasePermission):
         raise PermissionDenied(f"Method {request.method} not allowed.")
 
     def has_object_permission(self, request, view, obj):
-        if request.method in permissions.SAFE_METHODS:
+        if self._is_read_only(request, view):
             return True
 
-        token_payload = request.auth
-        api_token = self._get_api_token(token_payload)
+        api_token = self._get_api_token(request)
 
         if request.method in ["PUT", "PATCH"]:
             if not api_token.can_edit:
                 raise PermissionDenied("This token does not have edit permissions.")
-            obj_vendor = getattr(obj, "vendor", None)
-            if obj_vendor and not api_token.allowed_vendors.filter(id=obj_vendor.id).exists():
+            obj_vendor_id = getattr(obj, "vendor_id", None)
+            if obj_vendor_id and not api_token.allows_vendor(obj_vendor_id):
                 raise PermissionDenied("You may not edit objects for that vendor.")
             return True
 
         if request.method == "DELETE":
             if not api_token.can_delete:
                 raise PermissionDenied("This token does not have delete permissions.")
-            obj_vendor = getattr(obj, "vendor", None)
-            if obj_vendor and not api_token.allowed_vendors.filter(id=obj_vendor.id).exists():
+            obj_vendor_id = getattr(obj, "vendor_id", None)
+            if obj_vendor_id and not api_token.allows_vendor(obj_vendor_id):
                 raise PermissionDenied("You may not delete objects for that vendor.")
             return True
 
@@ -0,0 +1,143 @@
+# apps/api/ratelimit.py
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit (
+    key TEXT PRIMARY KEY,
+    window INTEGER NOT NULL,
+    current INTEGER NOT NULL,
+    previous INTEGER NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# A row stops affecting estimates once the window after its current one has
+# passed (`expires`); expired rows are purged every PURGE_INTERVAL hits of a process.
+PURGE_INTERVAL = 1000
+
+
+class SlidingWindowRateLimiter:
+    """
+    Sliding-window-counter rate limiter shared by every process on the host.
+
+    - State is one row per key in a small SQLite file: the current fixed window,
+      its hit count and the previous window's count. The request rate is estimated
+      as `previous * (1 - elapsed / duration) + current`, which smooths the burst a
+      fixed window allows at its boundary without storing timestamps.
+    - Each hit is a read-modify-write inside `BEGIN IMMEDIATE`, so concurrent
+      workers are serialized by SQLite's write lock.
+    - Connections are opened lazily per thread (and again after a fork).
+    - If the file cannot be written in time the request is allowed and a warning
+      is logged: rate limiting must not take the API down.
+    """
+
+    def __init__(self, path, busy_timeout=1.0):
+        self.path = str(path)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few counters on a power cut is acceptable.
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(SCHEMA)
+            local.connection, local.pid, local.hits = connection, os.getpid(), 0
+        return local.connection
+
+    def hit(self, key, limit, duration, now=None):
+        """
+        Count one request for `key` if it fits within `limit` per `duration` seconds.
+        Returns (allowed, wait), where `wait` is the number of seconds until a
+        rejected request would be allowed (None when allowed).
+        """
+        now = time.time() if now is None else now
+        window = math.floor(now / duration)
+        elapsed = now / duration - window
+
+        try:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT window, current, previous FROM rate_limit WHERE key = ?", (key,)
+                ).fetchone()
+                current, previous = self._roll(row, window)
+
+                estimate = previous * (1 - elapsed) + current
+                allowed = estimate < limit
+                if allowed:
+                    current += 1
+                connection.execute(
+                    "INSERT INTO rate_limit (key, window, current, previous, expires) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET window = excluded.window, "
+                    "current = excluded.current, previous = excluded.previous, expires = excluded.expires",
+                    (key, window, current, previous, (window + 2) * duration),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as exc:
+            logger.warning("Rate limiter unavailable, allowing request: %s", exc)
+            return True, None
+
+        self._maybe_purge(connection, now)
+        if allowed:
+            return True, None
+        return False, self._wait(current, previous, limit, elapsed, duration)
+
+    @staticmethod
+    def _roll(row, window):
+        """
+        Counters of (current, previous) window as seen from `window`.
+        """
+        if row is None:
+            return 0, 0
+        stored_window, current, previous = row
+        if stored_window == window:
+            return current, previous
+        if stored_window == window - 1:
+            return 0, current
+        return 0, 0
+
+    @staticmethod
+    def _wait(current, previous, limit, elapsed, duration):
+        # The estimate decays linearly with the previous window's share; once that is
+        # not enough (or there is none), the next window starts from zero.
+        if previous and current < limit:
+            fraction = 1 - (limit - current) / previous
+            if fraction > elapsed:
+                return (fraction - elapsed) * duration
+        return (1 - elapsed) * duration
+
+    def _maybe_purge(self, connection, now):
+        local = self._local
+        local.hits += 1
+        if local.hits % PURGE_INTERVAL:
+            return
+        try:
+            connection.execute("DELETE FROM rate_limit WHERE expires < ?", (now,))
+        except sqlite3.Error:
+            pass
+
+    def reset(self):
+        self._connection().execute("DELETE FROM rate_limit")
+
+
+rate_limiter = SlidingWindowRateLimiter(
+    path=settings.API_RATE_LIMIT_DB,
+)
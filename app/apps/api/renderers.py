@@ -0,0 +1,51 @@
+# apps/api/renderers.py
+
+import csv
+import io
+import json
+
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    Newline-delimited JSON. Streaming responses write their own body; this
+    renderer only handles regular (e.g. error) responses.
+    """
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return "".join(json.dumps(row, cls=JSONEncoder) + "\n" for row in rows).encode()
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """
+    Comma-separated values. Like `NDJSONRenderer`, only used for non-streaming
+    responses; dicts are written as a header row plus one value row.
+    """
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        if rows and isinstance(rows[0], dict):
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    key: "; ".join(map(str, value)) if isinstance(value, list) else value
+                    for key, value in row.items()
+                })
+        else:
+            csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
@@ -0,0 +1,173 @@
+# apps/api/schema.py
+
+import functools
+import gzip
+import hashlib
+import importlib.metadata
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from drf_spectacular.views import SpectacularAPIView
+
+from core.metrics import TimedViewMixin
+
+
+# Distributions whose introspection shapes the schema.
+SCHEMA_DEPENDENCIES = ("django", "djangorestframework", "drf-spectacular", "django-filter", "djangorestframework-simplejwt")
+
+_accepts_gzip = re.compile(r"\bgzip\b")
+
+
+@functools.cache
+def code_version():
+    """
+    Identifies the code the schema is generated from: `API_SCHEMA_CACHE["BUILD_ID"]`
+    (EOL_BUILD_ID, e.g. a commit sha set at deploy time) or else a hash of the
+    project's Python sources, the schema-relevant package versions and
+    SPECTACULAR_SETTINGS. Computed once per process.
+    """
+    build_id = settings.API_SCHEMA_CACHE["BUILD_ID"]
+    if build_id:
+        return build_id
+
+    digest = hashlib.sha256()
+    base_dir = Path(settings.BASE_DIR)
+    for directory in ("apps", "core"):
+        for path in sorted((base_dir / directory).rglob("*.py")):
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    for name in SCHEMA_DEPENDENCIES:
+        try:
+            digest.update(f"{name}=={importlib.metadata.version(name)}".encode())
+        except importlib.metadata.PackageNotFoundError:
+            pass
+    digest.update(repr(sorted(settings.SPECTACULAR_SETTINGS.items())).encode())
+    return "src-" + digest.hexdigest()[:20]
+
+
+class SchemaEntry:
+    """
+    One rendered schema with its precomputed gzip body and strong ETags (one per
+    encoding, as the bytes differ).
+    """
+
+    __slots__ = ("body", "gzipped", "etag", "gzip_etag")
+
+    def __init__(self, body):
+        self.body = body
+        self.gzipped = gzip.compress(body, mtime=0)
+        digest = hashlib.sha256(body).hexdigest()
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+
+class SchemaCache:
+    """
+    Rendered schemas keyed by (code version, renderer, language, API version).
+
+    - Each worker keeps them in memory; a miss first tries `API_SCHEMA_CACHE["DIR"]`,
+      where `manage.py warm_schema_cache` (or the first worker) left them, and only
+      then runs the generator.
+    - Keys include `code_version()`, so a deploy never serves a stale schema and old
+      files are simply no longer read.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.generated = 0
+        self.loaded = 0
+
+    def get(self, key, generate):
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                body = self.read(key)
+                if body is None:
+                    body = generate()
+                    self.generated += 1
+                    self.write(key, body)
+                else:
+                    self.loaded += 1
+                entry = self._entries[key] = SchemaEntry(body)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def path(key):
+        directory = settings.API_SCHEMA_CACHE["DIR"]
+        if not directory:
+            return None
+        name = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        return Path(directory) / f"schema-{name}"
+
+    def read(self, key):
+        path = self.path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write(self, key, body):
+        path = self.path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+
+
+schema_cache = SchemaCache()
+
+
+class CachedSpectacularAPIView(TimedViewMixin, SpectacularAPIView):
+    """
+    SpectacularAPIView serving pre-rendered bytes from `schema_cache`.
+
+    The generator only runs once per code version, renderer and language; responses
+    carry a strong ETag (304 on If-None-Match) and are sent gzipped to clients that
+    accept it.
+    """
+
+    def _get_schema_response(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        renderer = request.accepted_renderer
+        media_type = request.accepted_media_type
+        key = (code_version(), renderer.media_type, media_type, translation.get_language(), version)
+        entry = schema_cache.get(key, lambda: self.render_schema(request, version, renderer, media_type))
+
+        use_gzip = bool(_accepts_gzip.search(request.headers.get("Accept-Encoding", "")))
+        etag = entry.gzip_etag if use_gzip else entry.etag
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(entry.gzipped if use_gzip else entry.body, content_type=content_type)
+            response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, version)}"'
+            if use_gzip:
+                response["Content-Encoding"] = "gzip"
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+        # Clients revalidate; an unchanged schema costs a 304.
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def render_schema(self, request, version, renderer, media_type):
+        generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+        schema = generator.get_schema(request=request, public=self.serve_public)
+        return renderer.render(schema, media_type, {"request": request, "view": self})
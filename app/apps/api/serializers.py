@@ -17,8 +17,10 @@ class VendorSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "name",
+            "product_count",        # maintained counter
+            "software_count",       # maintained counter
         ]
-        read_only_fields = ["id"]
+        read_only_fields = ["id", "product_count", "software_count"]
 
 
 #
@@ -50,12 +52,16 @@ class EntitySerializer(serializers.ModelSerializer):
             "end_of_engineering_date",
             "end_of_sale_date",
             "end_of_life_date",
+            "lifecycle_status",     # derived from the dates
+            "next_transition_date", # derived from the dates
             "created_at",
             "updated_at",
         ]
         read_only_fields = [
             "id",
             "vendor_name",
+            "lifecycle_status",
+            "next_transition_date",
             "created_at",
             "updated_at",
         ]
@@ -74,3 +80,67 @@ class ProductSerializer(EntitySerializer):
 class SoftwareSerializer(EntitySerializer):
     class Meta(EntitySerializer.Meta):
         model = Software
+        fields = EntitySerializer.Meta.fields + [
+            "family",               # parsed from name
+            "version",              # parsed from name
+        ]
+        read_only_fields = EntitySerializer.Meta.read_only_fields + [
+            "family",
+            "version",
+        ]
+
+
+#
+# ─── 5) BULK LOOKUP (request documentation) ─────────────────────────────────────────
+#
+class LookupItemSerializer(serializers.Serializer):
+    vendor = serializers.CharField(help_text="Vendor name, matched exactly")
+    name = serializers.CharField(help_text="Product/software name, matched exactly")
+
+
+# Only used for the schema; the payload is validated by `apps.api.bulk.parse_lookup_items`.
+class BulkLookupSerializer(serializers.Serializer):
+    """
+    (vendor name, name) pairs to resolve in one call.
+    """
+    items = LookupItemSerializer(many=True)
+
+
+#
+# ─── 6) BULK CREATE / UPSERT ────────────────────────────────────────────────────────
+#
+class BulkEntityItemSerializer(serializers.Serializer):
+    """
+    One row of a bulk create/upsert. Validated row by row without touching the
+    database; vendor existence and scope are checked once for the whole batch.
+    """
+    vendor = serializers.IntegerField(min_value=1, help_text="ID of the Vendor")
+    name = serializers.CharField(max_length=300)
+    end_of_life_announced_date = serializers.DateField(required=False, allow_null=True)
+    end_of_engineering_date = serializers.DateField(required=False, allow_null=True)
+    end_of_sale_date = serializers.DateField(required=False, allow_null=True)
+    end_of_life_date = serializers.DateField(required=False, allow_null=True)
+
+
+# Only used for the schema; rows are validated one by one in `apps.api.bulk.parse_write_items`.
+class BulkWriteSerializer(serializers.Serializer):
+    """
+    Rows to create or upsert, keyed on (vendor, name).
+    """
+    items = BulkEntityItemSerializer(many=True)
+
+
+#
+# ─── 7) ALIAS RESOLVE (request documentation) ───────────────────────────────────────
+#
+class ResolveItemSerializer(serializers.Serializer):
+    alias = serializers.CharField(help_text="Raw inventory string, e.g. a part number; a plain string is accepted too")
+    vendor = serializers.CharField(required=False, help_text="Vendor name, matched exactly; restricts the matches")
+
+
+# Only used for the schema; the payload is validated by `apps.api.bulk.parse_resolve_items`.
+class BulkResolveSerializer(serializers.Serializer):
+    """
+    Raw strings to match against the alias index in one call.
+    """
+    items = ResolveItemSerializer(many=True)
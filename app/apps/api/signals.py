@@ -0,0 +1,60 @@
+# apps/api/signals.py
+
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.api.cache import response_cache
+from apps.api.models import APIToken, APITokenRevision
+from apps.api.tokens import token_cache
+from apps.eol.models import Vendor, Product, Software
+from apps.eol.signals import catalog_bulk_changed
+
+
+#
+# ─── RESPONSE CACHE INVALIDATION ───────────────────────────────────────────────────
+#
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+@receiver(catalog_bulk_changed, sender=Vendor)
+def invalidate_vendor_responses(sender, **kwargs):
+    # Product/software responses embed the vendor name.
+    response_cache.invalidate(
+        Vendor._meta.label_lower,
+        Product._meta.label_lower,
+        Software._meta.label_lower,
+    )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Software)
+@receiver(post_delete, sender=Software)
+@receiver(catalog_bulk_changed, sender=Product)
+@receiver(catalog_bulk_changed, sender=Software)
+def invalidate_entity_responses(sender, **kwargs):
+    # Vendor responses carry the product/software counters.
+    response_cache.invalidate(sender._meta.label_lower, Vendor._meta.label_lower)
+
+
+#
+# ─── TOKEN CACHE INVALIDATION ──────────────────────────────────────────────────────
+#
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def invalidate_token_state(sender, instance, **kwargs):
+    APITokenRevision.bump()
+    token_cache.invalidate(instance.key)
+
+
+@receiver(m2m_changed, sender=APIToken.allowed_vendors.through)
+def invalidate_token_vendors(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    APITokenRevision.bump()
+    if not reverse:
+        token_cache.invalidate(instance.key)
+    elif pk_set:
+        token_cache.invalidate(*APIToken.objects.filter(pk__in=pk_set).values_list("key", flat=True))
+    else:
+        # vendor.apitoken_set.clear(): the affected tokens are already unlinked.
+        token_cache.clear()
@@ -0,0 +1,240 @@
+# apps/api/snapshots.py
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from apps.api.exports import iter_rows
+from apps.api.fastpath import ValuesSerializer
+from apps.api.serializers import VendorSerializer, ProductSerializer, SoftwareSerializer
+from apps.eol import changes
+from apps.eol.models import CatalogRevision, Vendor, Product, Software
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_NAME = "catalog.json"
+SNAPSHOT_CHUNK_SIZE = 2000
+
+# Written in this order, so vendors precede the rows referring to them.
+SNAPSHOT_MODELS = (
+    ("vendor", Vendor, VendorSerializer),
+    ("product", Product, ProductSerializer),
+    ("software", Software, SoftwareSerializer),
+)
+
+_build_lock = threading.Lock()
+
+
+class _HashingWriter:
+    """File wrapper hashing and counting the (compressed) bytes written through it."""
+
+    def __init__(self, file):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+
+def snapshot_dir():
+    return Path(settings.CATALOG_SNAPSHOT_DIR)
+
+
+def load_manifest():
+    """
+    The manifest of the current snapshot, or None when none was built (or its file
+    is gone).
+    """
+    try:
+        manifest = json.loads((snapshot_dir() / MANIFEST_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if not snapshot_path(manifest).is_file():
+        return None
+    return manifest
+
+
+def snapshot_path(manifest):
+    return snapshot_dir() / manifest["file"]
+
+
+def open_snapshot(attempts=3):
+    """
+    `ensure_snapshot()` plus an open handle on its file: (manifest, file).
+
+    Another worker may publish a newer snapshot between reading the manifest and
+    opening the file; the manifest is then read again. Once open, the file can be
+    served to the end even if it is unlinked meanwhile.
+    """
+    for attempt in range(attempts):
+        manifest = ensure_snapshot()
+        try:
+            return manifest, open(snapshot_path(manifest), "rb")
+        except FileNotFoundError:
+            if attempt == attempts - 1:
+                raise
+
+
+def ensure_snapshot():
+    """
+    Return the manifest of a snapshot matching the current CatalogRevision, building
+    one first when the catalog changed since the last build. While nothing changes
+    this costs one single-row read and one small file read.
+    """
+    manifest = load_manifest()
+    if manifest is not None and manifest["revision"] == CatalogRevision.current().revision:
+        return manifest
+    return build_snapshot()[0]
+
+
+def build_snapshot(force=False):
+    """
+    Compile vendors, products and software into a gzipped NDJSON file and publish it
+    with its manifest. Returns (manifest, built).
+
+    - The first line is a header ({"snapshot": {...}}), every other line one object
+      as {"model": ..., "data": ...}, shaped like the list endpoints render it.
+    - The catalog revision and change-feed cursor are read before the rows, so rows
+      are never older than the stamp: a consumer can follow up with
+      `/api/v1/changes/?since=<change_cursor>` and at most re-apply a few upserts.
+    - Output is deterministic (no gzip timestamp, rows in pk order), so the sha256
+      only changes with the data and workers building the same revision agree.
+    - Files are written to a temp name and renamed into place; the manifest is
+      replaced last and never moves back to an older revision. The previous file is
+      kept for one more generation, for requests that read the old manifest just
+      before it was replaced.
+    """
+    with _build_lock:
+        revision = CatalogRevision.current()
+        manifest = load_manifest()
+        if not force and manifest is not None and manifest["revision"] == revision.revision:
+            return manifest, False
+
+        directory = snapshot_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        header = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "revision": revision.revision,
+            "change_cursor": changes.latest_cursor(),
+            "catalog_updated_at": revision.updated_at.isoformat(),
+        }
+
+        fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".catalog-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                writer = _HashingWriter(raw)
+                counts = write_snapshot(writer, header)
+            name = f"catalog-r{revision.revision}-{writer.sha256.hexdigest()[:12]}.ndjson.gz"
+            os.replace(tmp_name, directory / name)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        manifest = {
+            **header,
+            "file": name,
+            "sha256": writer.sha256.hexdigest(),
+            "size": writer.size,
+            "counts": counts,
+        }
+        current = load_manifest()
+        if current is None or current["revision"] <= manifest["revision"]:
+            publish_manifest(manifest)
+            remove_stale_snapshots(keep={name, current["file"]} if current is not None else {name})
+        return manifest, True
+
+
+def write_snapshot(file, header):
+    counts = {}
+    with gzip.GzipFile(filename="", mode="wb", fileobj=file, mtime=0) as gz:
+        gz.write(_dumps({"snapshot": header}))
+        for model_name, model, serializer_class in SNAPSHOT_MODELS:
+            values_serializer = ValuesSerializer(serializer_class)
+            batch = []
+            count = 0
+            for row in iter_rows(model.objects.order_by("pk"), values_serializer, SNAPSHOT_CHUNK_SIZE):
+                batch.append(_dumps({"model": model_name, "data": row}))
+                count += 1
+                if len(batch) >= SNAPSHOT_CHUNK_SIZE:
+                    gz.write(b"".join(batch))
+                    batch = []
+            gz.write(b"".join(batch))
+            counts[model_name] = count
+    return counts
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+
+def publish_manifest(manifest):
+    directory = snapshot_dir()
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".manifest-", suffix=".tmp")
+    with os.fdopen(fd, "w") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_name, directory / MANIFEST_NAME)
+
+
+def remove_stale_snapshots(keep):
+    # Downloads already streaming an old file keep their open handle.
+    for path in snapshot_dir().glob("catalog-r*.ndjson.gz"):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+# ─── RANGE REQUESTS ───
+
+def parse_range(header, size):
+    """
+    Parse a `Range: bytes=...` header against a file of `size` bytes.
+
+    Returns (start, end) inclusive, None when the header is absent, malformed or asks
+    for several ranges (the full file is served then, as RFC 9110 allows), or raises
+    ValueError when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[len("bytes="):].strip().partition("-")
+    if not sep or not (first == "" or first.isdigit()) or not (last == "" or last.isdigit()):
+        return None
+    if first == "":
+        # Suffix range: the last N bytes.
+        if not last:
+            return None
+        if int(last) == 0:
+            raise ValueError("Empty suffix range.")
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    if start >= size:
+        raise ValueError("Range starts past the end of the file.")
+    end = int(last) if last else size - 1
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def iter_file_range(file, start, end, chunk_size=64 * 1024):
+    """
+    Yield bytes `start`-`end` (inclusive) of the open binary `file`, then close it.
+    """
+    with file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = file.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
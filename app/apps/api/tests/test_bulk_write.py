@@ -0,0 +1,83 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.api import bulk
+from apps.api.bulk import WRITE_CHUNK_SIZE, write_entities
+from apps.api.models import APIToken
+from apps.eol.models import CatalogRevision, Vendor, Product
+
+
+class WriteEntitiesTests(TestCase):
+    """
+    Chunks committed before a failing chunk are announced with
+    `catalog_bulk_changed`, so revisions, caches and counters follow them.
+    """
+
+    def test_failure_after_committed_chunks(self):
+        vendor = Vendor.objects.create(name="Cisco")
+        rows = [(index, {"vendor": vendor.pk, "name": f"Switch {index}"}) for index in range(WRITE_CHUNK_SIZE + 1)]
+        revision = CatalogRevision.current().revision
+        write_chunk = bulk._write_chunk
+
+        def fail_second_chunk(model, chunk, *args):
+            if chunk[0][0] >= WRITE_CHUNK_SIZE:
+                raise OperationalError("database is locked")
+            return write_chunk(model, chunk, *args)
+
+        with mock.patch.object(bulk, "_write_chunk", side_effect=fail_second_chunk):
+            with self.assertRaises(OperationalError):
+                write_entities(Product, rows, upsert=False)
+
+        vendor.refresh_from_db()
+        self.assertEqual(Product.objects.count(), WRITE_CHUNK_SIZE)
+        self.assertEqual(vendor.product_count, WRITE_CHUNK_SIZE)
+        self.assertGreater(CatalogRevision.current().revision, revision)
+
+
+class BulkWriteVendorScopeTests(TestCase):
+    """
+    A batch is denied for existing vendors outside the token's scope; unknown
+    vendor ids only fail their own rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.allowed = Vendor.objects.create(name="Cisco")
+        cls.other = Vendor.objects.create(name="Juniper")
+        token = APIToken.objects.create(
+            name="bulk", user=User.objects.create_user("bulk"), can_write=True,
+            valid_until=timezone.now() + timedelta(hours=1),
+        )
+        token.allowed_vendors.set([cls.allowed])
+        cls.headers = {"authorization": f"Bearer {token.generate_jwt()}"}
+
+    def bulk_create(self, items):
+        return self.client.post(
+            reverse("product-bulk-create"), {"items": items}, content_type="application/json", headers=self.headers,
+        )
+
+    def test_unknown_vendor_fails_its_row(self):
+        missing = self.other.pk + 100
+        response = self.bulk_create([
+            {"vendor": self.allowed.pk, "name": "Catalyst 9300"},
+            {"vendor": missing, "name": "Typo"},
+        ])
+        self.assertEqual(response.status_code, 200, response.content)
+        results = {result["index"]: result for result in response.json()["results"]}
+        self.assertEqual(results[0]["status"], "created")
+        self.assertEqual(results[1]["status"], "failed")
+        self.assertIn("does not exist", results[1]["errors"]["vendor"][0])
+
+    def test_vendor_outside_scope_denies_batch(self):
+        response = self.bulk_create([
+            {"vendor": self.allowed.pk, "name": "Catalyst 9300"},
+            {"vendor": self.other.pk, "name": "MX204"},
+        ])
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Product.objects.exists())
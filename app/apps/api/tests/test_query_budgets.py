@@ -0,0 +1,20 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+
+
+class QueryBudgetTests(TransactionTestCase):
+    """
+    Runs `manage.py check_query_budgets` on the test database, so a missing
+    select_related() or an over-budget endpoint fails the test run. Not a TestCase:
+    write requests must run in their own transaction, as they do in production.
+    """
+
+    def test_query_budgets(self):
+        out = StringIO()
+        try:
+            call_command("check_query_budgets", current_database=True, stdout=out)
+        except CommandError as exc:
+            self.fail(f"{exc}\n{out.getvalue()}")
@@ -0,0 +1,29 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from apps.api.management.commands.explain_indexes import iter_plans, plan_problems
+
+
+class QueryPlanTests(TestCase):
+    """
+    Every filter and ordering the catalog endpoints advertise is served by an index,
+    with plans chosen on a seeded database with ANALYZE statistics (the planner may
+    prefer a scan on tiny or unanalyzed tables).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("generate_catalog", vendors=50, products=3000, software=3000, seed=1, stdout=StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_advertised_plans_use_indexes(self):
+        checked = 0
+        for label, plan, filtered in iter_plans():
+            checked += 1
+            with self.subTest(label):
+                self.assertEqual(plan_problems(plan, filtered), [], plan)
+        self.assertGreater(checked, 0)
@@ -0,0 +1,48 @@
+import random
+import string
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.api.bulk import ALIAS_CHUNK_SIZE, resolve_aliases
+from apps.eol.models import Vendor, Product, ProductAlias
+
+
+class ResolveAliasesTests(TestCase):
+    """
+    Alias resolution only probes key lengths that exist in the alias table, so
+    inputs that match nothing stay cheap.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        vendor = Vendor.objects.create(name="Cisco")
+        cls.switch = Product.objects.create(vendor=vendor, name="Catalyst 9300 48-port PoE+")
+        cls.legacy = Product.objects.create(vendor=vendor, name="Catalyst 2960-X")
+        ProductAlias.objects.create(product=cls.switch, alias="C9300-48P")
+        ProductAlias.objects.create(product=cls.legacy, alias="WS-C2960X")
+
+    def test_mostly_unmatched_inputs(self):
+        rng = random.Random(1)
+        unmatched = [
+            "".join(rng.choices(string.ascii_uppercase + string.digits + "-", k=rng.randint(10, 30)))
+            for _ in range(5000)
+        ]
+        entries = [("C9300-48P-E", None), ("ws c2960x", None), *((text, None) for text in unmatched)]
+
+        with CaptureQueriesContext(connection) as queries:
+            results = resolve_aliases(ProductAlias, entries)
+
+        self.assertEqual(results[0], ("prefix", "c930048p", [self.switch.pk]))
+        self.assertEqual(results[1], ("exact", "wsc2960x", [self.legacy.pk]))
+        self.assertEqual(results[2:], [(None, None, [])] * len(unmatched))
+        # Stored lengths, the exact probe of the one 8-character key, and one
+        # probe per chunk of 8-character prefixes (no other length exists).
+        self.assertLessEqual(len(queries), 2 + -(-len(unmatched) // ALIAS_CHUNK_SIZE))
+
+    def test_no_alias_of_a_probed_length(self):
+        entries = [("C930", None), ("X" * 7, None)]
+        with self.assertNumQueries(1):
+            results = resolve_aliases(ProductAlias, entries)
+        self.assertEqual(results, [(None, None, [])] * 2)
@@ -0,0 +1,59 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from apps.api.fastpath import ValuesSerializer
+from apps.api.serializers import ProductSerializer, SoftwareSerializer
+from apps.eol.models import Vendor, Product, Software
+
+
+class ValuesSerializerTests(TestCase):
+    """
+    The values() fast path renders the same JSON bytes as ProductSerializer and
+    SoftwareSerializer.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("generate_catalog", vendors=5, products=200, software=200, seed=1, stdout=StringIO())
+        # Edge cases the generator may not produce: no dates at all, every date, non-ASCII names.
+        vendor = Vendor.objects.create(name="Zürich Netzwerke „GmbH“")
+        dates = {
+            "end_of_life_announced_date": date(2020, 1, 31),
+            "end_of_sale_date": date(2021, 2, 28),
+            "end_of_engineering_date": date(2022, 3, 31),
+            "end_of_life_date": date(2099, 12, 31),
+        }
+        Product.objects.create(vendor=vendor, name="Schalter 48×1G ✓")
+        Product.objects.create(vendor=vendor, name='Quote "\\ test', **dates)
+        Software.objects.create(vendor=vendor, name="Betriebssystem", version="")
+        Software.objects.create(vendor=vendor, name="Betriebssystem 17.9.4a", version="17.9.4a", **dates)
+
+    def assert_identical(self, serializer_class, queryset):
+        renderer = JSONRenderer()
+        values_serializer = ValuesSerializer(serializer_class)
+        queryset = queryset.select_related("vendor").order_by("pk")
+        instances = list(queryset)
+        rows = list(values_serializer.values(queryset))
+        self.assertGreater(len(instances), 200)
+
+        expected = renderer.render(serializer_class(instances, many=True).data)
+        actual = renderer.render(values_serializer.many(rows))
+        if expected != actual:
+            mismatches = [
+                (instance.pk, slow, fast)
+                for instance, row in zip(instances, rows)
+                if (slow := renderer.render(serializer_class(instance).data))
+                != (fast := renderer.render(values_serializer.to_representation(row)))
+            ]
+            self.assertEqual(mismatches, [])
+        self.assertEqual(actual, expected)
+
+    def test_products(self):
+        self.assert_identical(ProductSerializer, Product.objects.all())
+
+    def test_software(self):
+        self.assert_identical(SoftwareSerializer, Software.objects.all())
@@ -3,6 +3,8 @@
 from rest_framework.throttling import SimpleRateThrottle
 from django.conf import settings
 
+from apps.api.ratelimit import rate_limiter
+
 
 class DynamicScopeRateThrottle(SimpleRateThrottle):
     """
@@ -14,9 +16,23 @@ class DynamicScopeRateThrottle(SimpleRateThrottle):
     The cache key is built manually as "<scope>:<identifier>" where identifier is:
       - the authenticated user's username for JWT users, or
       - the request IP address for anonymous users.
+    Hits are counted by the shared sliding-window limiter in apps/api/ratelimit.py
+    (one row per key, shared by all workers) instead of a per-process history list.
     """
 
     scope = "anon"
+    wait_seconds = None
+
+    def allow_request(self, request, view):
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self.wait_seconds = rate_limiter.hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
 
     def get_cache_key(self, request, view):
         """
@@ -41,6 +57,7 @@ class DynamicScopeRateThrottle(SimpleRateThrottle):
         self.rate = settings.API_THROTTLE_RATES.get(self.scope)
         if not self.rate:
             return None
+        self.num_requests, self.duration = self.parse_rate(self.rate)
 
         if hasattr(request, "user") and request.user and request.user.is_authenticated:
             identifier = request.user.username
@@ -0,0 +1,67 @@
+# apps/api/tokens.py
+
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from apps.api.cache import TTLCache
+from apps.api.models import APIToken, APITokenRevision
+
+
+@dataclass(frozen=True)
+class TokenState:
+    """
+    What TokenPermission needs to know about an APIToken, detached from the ORM.
+    """
+    pk: int
+    key: str
+    can_write: bool
+    can_edit: bool
+    can_delete: bool
+    allowed_vendor_ids: frozenset
+
+    def allows_vendor(self, vendor_id):
+        return vendor_id in self.allowed_vendor_ids
+
+    @classmethod
+    def load(cls, key):
+        """
+        Read the token and its allowed vendor ids (two queries). Returns None if no
+        token has this key.
+        """
+        row = (
+            APIToken.objects
+            .filter(key=key)
+            .values("pk", "can_write", "can_edit", "can_delete")
+            .first()
+        )
+        if row is None:
+            return None
+        vendor_ids = APIToken.allowed_vendors.through.objects.filter(
+            apitoken_id=row["pk"],
+        ).values_list("vendor_id", flat=True)
+        return cls(key=key, allowed_vendor_ids=frozenset(vendor_ids), **row)
+
+
+# Entries are namespaced by token key so one token can be evicted on its own;
+# the APITokenRevision fence covers writes made by other processes.
+token_cache = TTLCache(
+    max_entries=settings.API_TOKEN_CACHE.get("MAX_ENTRIES", 0),
+    timeout=settings.API_TOKEN_CACHE.get("TIMEOUT", 0),
+)
+
+
+def get_token_state(key):
+    """
+    Cached `TokenState.load(key)`. A hit costs one single-row revision read.
+    """
+    if not token_cache.enabled:
+        return TokenState.load(key)
+
+    revision = APITokenRevision.current().revision
+    state = token_cache.get(key, revision)
+    if state is None:
+        state = TokenState.load(key)
+        if state is not None:
+            token_cache.set(key, key, revision, state)
+    return state
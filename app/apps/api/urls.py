@@ -1,6 +1,8 @@
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
 from django.urls import path, include
-from apps.api.views import VendorViewSet, ProductViewSet, SoftwareViewSet
+from apps.api.views import VendorViewSet, ProductViewSet, SoftwareViewSet, ResponseCacheStatsView, ChangeFeedView, CatalogSnapshotView, CatalogSnapshotManifestView
+from apps.api.schema import CachedSpectacularAPIView
+from apps.api.async_views import AsyncListView, AsyncDetailView, AsyncLookupView
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
@@ -8,10 +10,29 @@ router.register(r"vendors", VendorViewSet, basename="vendor")
 router.register(r"products", ProductViewSet, basename="product")
 router.register(r"software", SoftwareViewSet, basename="software")
 
+# Async (ASGI) read endpoints mirroring the viewsets' list/retrieve/lookup.
+async_urlpatterns = [
+    path("vendors/", AsyncListView.as_view(viewset_class=VendorViewSet, basename="vendor"), name="async-vendor-list"),
+    path("vendors/<int:pk>/", AsyncDetailView.as_view(viewset_class=VendorViewSet, basename="vendor"), name="async-vendor-detail"),
+]
+for prefix, viewset, basename in (("products", ProductViewSet, "product"), ("software", SoftwareViewSet, "software")):
+    async_urlpatterns += [
+        path(f"{prefix}/", AsyncListView.as_view(viewset_class=viewset, basename=basename), name=f"async-{basename}-list"),
+        path(f"{prefix}/lookup/", AsyncLookupView.as_view(viewset_class=viewset, basename=basename), name=f"async-{basename}-lookup"),
+        path(f"{prefix}/<int:pk>/", AsyncDetailView.as_view(viewset_class=viewset, basename=basename), name=f"async-{basename}-detail"),
+    ]
+
 urlpatterns = [
-    path('schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('schema/', CachedSpectacularAPIView.as_view(), name='schema'),
     path('schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 
+    path("cache/stats/", ResponseCacheStatsView.as_view(), name="cache-stats"),
+    path("changes/", ChangeFeedView.as_view(), name="changes"),
+    path("snapshot/", CatalogSnapshotView.as_view(), name="snapshot"),
+    path("snapshot/manifest/", CatalogSnapshotManifestView.as_view(), name="snapshot-manifest"),
+
+    path("async/", include(async_urlpatterns)),
+
     path("", include(router.urls)),
 ]
\ No newline at end of file
@@ -1,45 +1,417 @@
-from rest_framework import viewsets, filters
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.permissions import IsAuthenticated
 
-from apps.eol.models import Vendor, Product, Software
-from apps.api.serializers import VendorSerializer, ProductSerializer, SoftwareSerializer
+from apps.eol import changes
+from apps.eol.models import Vendor, Product, Software, ProductAlias, SoftwareAlias, ChangeFeedState
+from core.metrics import TimedViewMixin, timed
+from core.routers import ReplicaReadMixin
+from apps.api.cache import CachedListMixin, response_cache
+from apps.api.conditional import ConditionalGetMixin
+from apps.api.filters import FullTextSearchFilter, RankedOrderingFilter, ProductFilterSet, SoftwareFilterSet
+from apps.api.fastpath import ValuesListMixin, ValuesSerializer
+from apps.api.pagination import EntityResultsSetPagination
+from apps.api.exports import streaming_export
+from apps.api import snapshots
+from apps.api.renderers import NDJSONRenderer, CSVRenderer
+from apps.api.bulk import parse_lookup_items, resolve_entities, parse_resolve_items, resolve_aliases, parse_write_items, write_entities, existing_vendor_ids
+from apps.api.serializers import VendorSerializer, ProductSerializer, SoftwareSerializer, BulkLookupSerializer, BulkResolveSerializer, BulkWriteSerializer
 
-class VendorViewSet(viewsets.ReadOnlyModelViewSet):
+class VendorViewSet(TimedViewMixin, ReplicaReadMixin, ConditionalGetMixin, CachedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [FullTextSearchFilter, RankedOrderingFilter]
 
     search_fields = ["name"]
     ordering_fields = ["name", "id"]
     ordering = ["name"]
 
 
-class EntityViewSet(viewsets.ModelViewSet):
+class EntityViewSet(TimedViewMixin, ReplicaReadMixin, ConditionalGetMixin, CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = None  # This will be set in subclasses
     serializer_class = None  # This will be set in subclasses
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = {
-        "vendor": ["exact"],
-        "end_of_life_date": ["lte", "gte", 'isnull'],
-        "end_of_sale_date": ["lte", "gte", 'isnull'],
-        "end_of_engineering_date": ["lte", "gte", 'isnull'],
-        "end_of_life_announced_date": ["lte", "gte", 'isnull'],
-    }
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
+    filterset_class = None  # This will be set in subclasses
+    alias_model = None  # This will be set in subclasses
     search_fields = ["name", "vendor__name"]
-    ordering_fields = ["name", "vendor__name", "end_of_life_date", "end_of_sale_date", "end_of_engineering_date", "end_of_life_announced_date"]
+    ordering_fields = ["name", "vendor__name", "end_of_life_date", "end_of_sale_date", "end_of_engineering_date", "end_of_life_announced_date", "next_transition_date"]
     ordering = ["vendor__name", "name"]
+    pagination_class = EntityResultsSetPagination
+    # pk__in chunk of `resolve`, below SQLite's 999 bound parameters.
+    resolve_chunk_size = 900
+
+    # POST actions that only read data; TokenPermission treats them like GET.
+    read_only_actions = ["lookup", "resolve"]
+
+    # Bulk write actions -> token flags they require. TokenPermission checks the
+    # flags and the vendor scope of the whole batch (see `get_bulk_vendor_ids`).
+    bulk_actions = {
+        "bulk_create": ("can_write",),
+        "bulk_upsert": ("can_write", "can_edit"),
+    }
 
 
     def get_queryset(self):
         return self.queryset.select_related("vendor").all()
 
+    @extend_schema(responses={(200, "application/x-ndjson"): OpenApiTypes.STR, (200, "text/csv"): OpenApiTypes.STR})
+    @action(detail=False, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer], pagination_class=None)
+    def export(self, request, *args, **kwargs):
+        """
+        Stream every object matching the list filters as NDJSON (default) or CSV
+        (`?format=csv`). Rows are read in chunks, so memory use does not grow with
+        the catalog.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return streaming_export(queryset, self.get_values_serializer(), request.accepted_renderer.format, self.basename)
+
+    @extend_schema(request=BulkLookupSerializer)
+    @action(detail=False, methods=["post"])
+    def lookup(self, request, *args, **kwargs):
+        """
+        Resolve many (vendor name, name) pairs in one call.
+
+        Every input row gets a result entry in the same order, with `match` set to
+        the serialized object or null when nothing matched.
+        """
+        pairs = parse_lookup_items(request.data, settings.API_BULK_LOOKUP_MAX_ITEMS)
+        matches = resolve_entities(self.get_queryset(), pairs)
+        return Response(self.get_lookup_data(pairs, matches))
+
+    def get_lookup_data(self, pairs, matches):
+        # Fleets repeat the same model many times; serialize each match once.
+        serialized = {}
+        results = []
+        with timed("serialize"):
+            for index, ((vendor, name), obj) in enumerate(zip(pairs, matches)):
+                if obj is not None and obj.pk not in serialized:
+                    serialized[obj.pk] = self.get_serializer(obj).data
+                results.append({
+                    "index": index,
+                    "vendor": vendor,
+                    "name": name,
+                    "match": serialized[obj.pk] if obj is not None else None,
+                })
+
+        found = sum(obj is not None for obj in matches)
+        return {
+            "count": len(pairs),
+            "found": found,
+            "missed": len(pairs) - found,
+            "results": results,
+        }
+
+
+    @extend_schema(request=BulkResolveSerializer)
+    @action(detail=False, methods=["post"])
+    def resolve(self, request, *args, **kwargs):
+        """
+        Match many raw inventory strings (part numbers, SKUs, model strings) through
+        the alias index in one call: normalized exact matches first, then the longest
+        alias the input starts with.
+
+        Every input row gets a result entry in the same order, with `match_type`
+        ("exact", "prefix" or null), the normalized `key` that matched and the
+        serialized `matches` (several when entities share an alias).
+        """
+        entries = parse_resolve_items(request.data, settings.API_BULK_LOOKUP_MAX_ITEMS)
+        resolved = resolve_aliases(self.alias_model, entries)
+
+        ids = sorted({pk for _, _, pks in resolved for pk in pks})
+        objects = {}
+        queryset = self.get_queryset().order_by()
+        for start in range(0, len(ids), self.resolve_chunk_size):
+            objects.update((obj.pk, obj) for obj in queryset.filter(pk__in=ids[start:start + self.resolve_chunk_size]))
+
+        serialized = {}
+        results = []
+        with timed("serialize"):
+            for index, ((text, vendor), (match_type, key, pks)) in enumerate(zip(entries, resolved)):
+                matches = []
+                for pk in pks:
+                    if pk in objects:
+                        if pk not in serialized:
+                            serialized[pk] = self.get_serializer(objects[pk]).data
+                        matches.append(serialized[pk])
+                results.append({
+                    "index": index,
+                    "alias": text,
+                    "vendor": vendor,
+                    "match_type": match_type if matches else None,
+                    "key": key if matches else None,
+                    "matches": matches,
+                })
+
+        found = sum(bool(result["matches"]) for result in results)
+        return Response({
+            "count": len(results),
+            "found": found,
+            "missed": len(results) - found,
+            "results": results,
+        })
+
+    def get_bulk_rows(self):
+        # Parsed once; TokenPermission reads the vendor ids before the action runs.
+        if not hasattr(self, "_bulk_rows"):
+            self._bulk_rows = parse_write_items(self.request.data, settings.API_BULK_WRITE_MAX_ITEMS)
+        return self._bulk_rows
+
+    def get_bulk_vendor_ids(self):
+        """
+        Existing vendors the batch writes to. Unknown vendor ids are left out: their
+        rows fail on their own instead of denying the whole batch.
+        """
+        if not hasattr(self, "_bulk_vendor_ids"):
+            rows, _ = self.get_bulk_rows()
+            self._bulk_vendor_ids = existing_vendor_ids({attrs["vendor"] for _, attrs in rows})
+        return self._bulk_vendor_ids
+
+    def bulk_write(self, upsert):
+        rows, errors = self.get_bulk_rows()
+        outcome = {index: ("failed", row_errors) for index, row_errors in errors.items()}
+        outcome.update(write_entities(self.get_queryset().model, rows, upsert, self.get_bulk_vendor_ids()))
+
+        counts = {"created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+        results = []
+        for index in sorted(outcome):
+            row_status, value = outcome[index]
+            counts[row_status] += 1
+            if row_status == "failed":
+                results.append({"index": index, "status": row_status, "errors": value})
+            else:
+                results.append({"index": index, "status": row_status, "id": value})
+
+        response_status = status.HTTP_400_BAD_REQUEST if results and counts["failed"] == len(results) else status.HTTP_200_OK
+        return Response({"count": len(results), **counts, "results": results}, status=response_status)
+
+    @extend_schema(request=BulkWriteSerializer, responses=OpenApiTypes.OBJECT)
+    @action(detail=False, methods=["post"], url_path="bulk-create")
+    def bulk_create(self, request, *args, **kwargs):
+        """
+        Create many objects in one call. Rows whose (vendor, name) already exists fail.
+
+        Every input row gets a result entry (`created` with its id, or `failed` with
+        errors); valid rows are written even when others fail.
+        """
+        return self.bulk_write(upsert=False)
+
+    @extend_schema(request=BulkWriteSerializer, responses=OpenApiTypes.OBJECT)
+    @action(detail=False, methods=["post"], url_path="bulk-upsert")
+    def bulk_upsert(self, request, *args, **kwargs):
+        """
+        Create or update many objects in one call, keyed on (vendor, name).
+
+        Lifecycle dates left out of a row keep their stored value. Each row is
+        reported as `created`, `updated`, `unchanged` or `failed`.
+        """
+        return self.bulk_write(upsert=True)
+
 
 class ProductViewSet(EntityViewSet):
     queryset = Product.objects.all()
+    alias_model = ProductAlias
     serializer_class = ProductSerializer
+    filterset_class = ProductFilterSet
 
 
 class SoftwareViewSet(EntityViewSet):
     queryset = Software.objects.all()
-    serializer_class = SoftwareSerializer
\ No newline at end of file
+    alias_model = SoftwareAlias
+    serializer_class = SoftwareSerializer
+    filterset_class = SoftwareFilterSet
+    ordering_fields = EntityViewSet.ordering_fields + ["family_key", "version_key"]
+
+
+class ResponseCacheStatsView(TimedViewMixin, APIView):
+    """
+    Hit/miss counters of this worker's response cache, for sizing it.
+    """
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request, *args, **kwargs):
+        return Response(response_cache.stats())
+
+
+class ChangeFeedView(TimedViewMixin, APIView):
+    """
+    Incremental change feed (delta sync) over vendors, products and software.
+
+    - Without `since`, only the current cursor is returned. Clients either take it and
+      download the catalog once (e.g. `export`), or start from the `change_cursor` of
+      a catalog snapshot; then they poll `?since=<cursor>`.
+    - Each page holds the events after `since`, collapsed to the last event per object.
+      `create`/`update` entries carry the object as the list endpoints render it
+      (treat both as upserts); `delete` entries are tombstones without data.
+    - Follow `next` while `has_more`; store `cursor` to resume later.
+    - Cursors older than the pruning horizon (`compact_change_feed --keep-days`)
+      get 410 Gone: the client must download the catalog again.
+    """
+
+    page_size = 1000
+    max_page_size = 10000
+    # pk__in chunk, below SQLite's 999 bound parameters.
+    fetch_chunk_size = 900
+    viewsets = {
+        "vendor": VendorViewSet,
+        "product": ProductViewSet,
+        "software": SoftwareViewSet,
+    }
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("since", int, description="Cursor from a previous response; omit to get the current cursor."),
+            OpenApiParameter("limit", int, description=f"Events per page (default {page_size}, max {max_page_size})."),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 410: OpenApiTypes.OBJECT},
+    )
+    def get(self, request, *args, **kwargs):
+        since = self.get_int_param(request, "since", None)
+        if since is None:
+            return Response({"cursor": changes.latest_cursor(), "has_more": False, "next": None, "changes": []})
+        limit = min(self.get_int_param(request, "limit", self.page_size) or self.page_size, self.max_page_size)
+
+        if since < ChangeFeedState.current().pruned_through:
+            return Response(
+                {"detail": "This cursor is older than the change feed history; download the catalog snapshot (/api/v1/snapshot/) again."},
+                status=status.HTTP_410_GONE,
+            )
+
+        events, cursor, has_more = changes.read(since, limit)
+        objects = self.get_objects(events)
+
+        results = []
+        for event_id, model, object_id, event_action in events:
+            data = objects.get((model, object_id))
+            if event_action != changes.Action.DELETE and data is None:
+                event_action = changes.Action.DELETE  # deleted after this event was written
+            results.append({
+                "id": event_id,
+                "model": model,
+                "object_id": object_id,
+                "action": event_action,
+                "data": data if event_action != changes.Action.DELETE else None,
+            })
+
+        next_link = None
+        if has_more:
+            next_link = replace_query_param(request.build_absolute_uri(), "since", cursor)
+        return Response({"cursor": cursor, "has_more": has_more, "next": next_link, "changes": results})
+
+    @staticmethod
+    def get_int_param(request, name, default):
+        value = request.query_params.get(name)
+        if value in (None, ""):
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            value = -1
+        if value < 0:
+            raise ValidationError({name: "Expected a non-negative integer."})
+        return value
+
+    def get_objects(self, events):
+        """
+        Current rows of the objects of non-delete events, rendered with the list
+        serializers' values() fast path: {(model, object_id): data}.
+        """
+        wanted = {}
+        for _, model, object_id, event_action in events:
+            if event_action != changes.Action.DELETE and model in self.viewsets:
+                wanted.setdefault(model, []).append(object_id)
+
+        objects = {}
+        for model, ids in wanted.items():
+            viewset = self.viewsets[model]
+            values_serializer = ValuesSerializer(viewset.serializer_class)
+            queryset = values_serializer.values(viewset.queryset.order_by(), "pk")
+            for start in range(0, len(ids), self.fetch_chunk_size):
+                for row in queryset.filter(pk__in=ids[start:start + self.fetch_chunk_size]):
+                    objects[(model, row["pk"])] = values_serializer.to_representation(row)
+        return objects
+
+
+class CatalogSnapshotManifestView(TimedViewMixin, APIView):
+    """
+    Describes the current catalog snapshot: revision, change-feed cursor, sha256,
+    size and object counts. Building it first if the catalog changed.
+    """
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request, *args, **kwargs):
+        return Response(snapshots.ensure_snapshot())
+
+
+class CatalogSnapshotView(TimedViewMixin, APIView):
+    """
+    Download the whole catalog as one gzipped NDJSON file (see apps/api/snapshots.py).
+
+    - It is rebuilt on demand only after the catalog revision moved; otherwise the
+      same file is served to every client.
+    - The ETag is strong (the file's sha256), so `If-None-Match` gets a 304 and
+      interrupted downloads resume with `Range` (+ `If-Range`).
+    - After loading it, follow the change feed from the header's `change_cursor`.
+    """
+    @extend_schema(responses={(200, "application/gzip"): OpenApiTypes.BINARY, (206, "application/gzip"): OpenApiTypes.BINARY})
+    def get(self, request, *args, **kwargs):
+        # Opened first: the file of the manifest read now may be replaced any time.
+        manifest, file = snapshots.open_snapshot()
+        etag = quote_etag(manifest["sha256"])
+        last_modified = parse_datetime(manifest["catalog_updated_at"]).timestamp()
+
+        conditional = get_conditional_response(request._request, etag=etag, last_modified=int(last_modified))
+        if conditional is not None:
+            file.close()
+            return self.set_headers(conditional, manifest, etag, last_modified)
+
+        byte_range = None
+        if self.range_applies(request, etag, last_modified):
+            try:
+                byte_range = snapshots.parse_range(request.headers.get("Range"), manifest["size"])
+            except ValueError:
+                file.close()
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response["Content-Range"] = f"bytes */{manifest['size']}"
+                return self.set_headers(response, manifest, etag, last_modified)
+
+        if byte_range is None:
+            response = FileResponse(file, as_attachment=True, filename=manifest["file"], content_type="application/gzip")
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                snapshots.iter_file_range(file, start, end),
+                status=status.HTTP_206_PARTIAL_CONTENT,
+                content_type="application/gzip",
+            )
+            response["Content-Length"] = end - start + 1
+            response["Content-Range"] = f"bytes {start}-{end}/{manifest['size']}"
+            response["Content-Disposition"] = f'attachment; filename="{manifest["file"]}"'
+        return self.set_headers(response, manifest, etag, last_modified)
+
+    @staticmethod
+    def range_applies(request, etag, last_modified):
+        # If-Range: resume only while the client's copy is still the current file.
+        if_range = request.headers.get("If-Range")
+        if not if_range:
+            return True
+        if if_range.startswith(("W/", '"')):
+            return if_range == etag
+        return parse_http_date_safe(if_range) == int(last_modified)
+
+    @staticmethod
+    def set_headers(response, manifest, etag, last_modified):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Accept-Ranges"] = "bytes"
+        response["X-Catalog-Revision"] = manifest["revision"]
+        return response
@@ -1,4 +1,10 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from apps.eol.aliases import ALIAS_MAX_LENGTH, alias_hash, normalize_alias
+from apps.eol.lifecycle import LifecycleStatus, MILESTONE_FIELDS, compute_lifecycle
 
 class LifecycleMixin(models.Model):
     """
@@ -33,6 +39,97 @@ class LifecycleMixin(models.Model):
         abstract = True
 
 
+class RevisionCounter(models.Model):
+    """
+    Abstract single-row counter. `bump()` it on every write to the data it guards;
+    caches remember the revision they were filled under and treat entries from an
+    older revision as stale, in every process.
+    """
+    revision = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    SINGLETON_ID = 1
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"r{self.revision}"
+
+    @classmethod
+    def current(cls):
+        # A plain read first: get_or_create() is routed like a write.
+        revision = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if revision is None:
+            revision, _ = cls.objects.get_or_create(pk=cls.SINGLETON_ID)
+        return revision
+
+    @classmethod
+    async def acurrent(cls):
+        revision = await cls.objects.filter(pk=cls.SINGLETON_ID).afirst()
+        if revision is None:
+            revision, _ = await cls.objects.aget_or_create(pk=cls.SINGLETON_ID)
+        return revision
+
+    @classmethod
+    def bump(cls):
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(
+            revision=F("revision") + 1,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            cls.objects.get_or_create(pk=cls.SINGLETON_ID, defaults={"revision": 1})
+
+
+class AbstractAlias(models.Model):
+    """
+    Alternative name (part number, SKU, inventory model string) of a catalog entity.
+    Subclasses add the foreign key named `ENTITY_FIELD`.
+
+    `key` is the normalized alias and `key_hash` its 64-bit hash (see
+    apps/eol/aliases.py); lookups probe the hash index and compare keys.
+    """
+    alias = models.CharField(
+        max_length=ALIAS_MAX_LENGTH,
+        help_text="Alias as entered, e.g. 'C9300-48P-E'."
+    )
+    key = models.CharField(
+        max_length=ALIAS_MAX_LENGTH,
+        editable=False,
+        help_text="Normalized alias: casefolded, without spaces or punctuation."
+    )
+    key_hash = models.BigIntegerField(
+        editable=False,
+        db_index=True,
+        help_text="64-bit blake2b hash of `key`."
+    )
+
+    ENTITY_FIELD = None
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.alias
+
+    def set_key_fields(self):
+        """
+        Refresh `key` / `key_hash` from `alias`. Called by save(); bulk writers must
+        call it themselves.
+        """
+        self.key = normalize_alias(self.alias)
+        self.key_hash = alias_hash(self.key)
+
+    def clean(self):
+        self.set_key_fields()
+        if not self.key:
+            raise ValidationError({"alias": "An alias needs at least one letter or digit."})
+
+    def save(self, *args, **kwargs):
+        self.set_key_fields()
+        super().save(*args, **kwargs)
+
+
 class TimeMixin(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -46,9 +143,55 @@ class AbstractEntity(
     TimeMixin,
     models.Model,
 ):
+    # — Derived from the lifecycle dates on save, refreshed daily by
+    #   `manage.py refresh_lifecycle_status` once `next_transition_date` passes.
+    lifecycle_status = models.CharField(
+        max_length=20,
+        choices=LifecycleStatus.choices,
+        default=LifecycleStatus.SUPPORTED,
+        editable=False,
+        db_index=True,
+        help_text="Current lifecycle status, derived from the lifecycle dates."
+    )
+    next_transition_date = models.DateField(
+        blank=True, null=True,
+        editable=False,
+        db_index=True,
+        help_text="Date the lifecycle status changes next, if any."
+    )
+
+    LIFECYCLE_FIELDS = ("lifecycle_status", "next_transition_date")
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Vendor the row was loaded with, so a save can tell a move between vendors
+        # (None when vendor_id was deferred).
+        instance._loaded_vendor_id = instance.__dict__.get("vendor_id")
+        return instance
+
+    def set_lifecycle_fields(self, today=None):
+        """
+        Refresh `lifecycle_status` / `next_transition_date` from the lifecycle dates.
+        Called by save(); bulk writers must call it themselves.
+        """
+        for field in MILESTONE_FIELDS:
+            # Accept ISO strings (e.g. objects.create(end_of_life_date="2030-01-01")).
+            setattr(self, field, self._meta.get_field(field).to_python(getattr(self, field)))
+        self.lifecycle_status, self.next_transition_date = compute_lifecycle(
+            self, today or timezone.localdate()
+        )
+
+    def save(self, *args, **kwargs):
+        self.set_lifecycle_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(MILESTONE_FIELDS).isdisjoint(update_fields):
+            kwargs["update_fields"] = {*update_fields, *self.LIFECYCLE_FIELDS}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} ({self.vendor.name})"
     
@@ -1,43 +1,86 @@
 # apps/eol/admin.py
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList, ORDER_VAR
+from django.core.exceptions import ValidationError
+from django.forms.models import BaseInlineFormSet
 from import_export.admin import ImportExportModelAdmin
-from django.db.models import Count
 
-from apps.eol.models import Vendor, Product, Software
+from apps.eol.aliases import normalize_alias
+from apps.eol.models import Vendor, Product, Software, ProductAlias, SoftwareAlias
 from apps.eol.resources import VendorResource, ProductResource, SoftwareResource
+from apps.eol import search
+
+
+class RankedChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        if "search_rank" in queryset.query.annotations and ORDER_VAR not in self.params:
+            return self._get_deterministic_ordering(["search_rank"])
+        return super().get_ordering(request, queryset)
+
+
+class FullTextSearchAdminMixin:
+    """
+    Serves changelist search from the FTS5 index and orders matches by relevance
+    unless a column ordering was picked. Falls back to `search_fields` otherwise.
+    """
+
+    def get_changelist(self, request, **kwargs):
+        return RankedChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        searched = search.search(queryset, search_term) if search_term else None
+        if searched is not None:
+            return searched, False
+        return super().get_search_results(request, queryset, search_term)
 
 
 @admin.register(Vendor)
-class VendorAdmin(ImportExportModelAdmin):
+class VendorAdmin(FullTextSearchAdminMixin, ImportExportModelAdmin):
     resource_class = VendorResource
 
     list_display = ("name", "product_count", "software_count")
     search_fields = ("name",)
     ordering = ("name",)
     list_filter = ("name",)
+    readonly_fields = ("product_count", "software_count")
+
 
-    def product_count(self, obj):
-        return obj._product_count
-    product_count.short_description = "Products"
+class AliasFormSet(BaseInlineFormSet):
+    def clean(self):
+        # `key` is not a form field, so (entity, key) uniqueness is checked here.
+        super().clean()
+        seen = set()
+        for form in self.forms:
+            if not form.cleaned_data or form.cleaned_data.get("DELETE"):
+                continue
+            key = normalize_alias(form.cleaned_data.get("alias") or "")
+            if key in seen:
+                raise ValidationError(f"Aliases must differ in more than case, spacing or punctuation: {form.cleaned_data['alias']!r}.")
+            seen.add(key)
 
-    def software_count(self, obj):
-        return obj._software_count
-    software_count.short_description = "Software Packages"
 
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.annotate(
-            _product_count=Count("products", distinct=True),
-            _software_count=Count("software_packages", distinct=True),
-        )
+class AliasInline(admin.TabularInline):
+    formset = AliasFormSet
+    fields = ("alias", "key")
+    readonly_fields = ("key",)
+    extra = 1
 
 
-class EntityAdmin(ImportExportModelAdmin):
+class ProductAliasInline(AliasInline):
+    model = ProductAlias
+
+
+class SoftwareAliasInline(AliasInline):
+    model = SoftwareAlias
+
+
+class EntityAdmin(FullTextSearchAdminMixin, ImportExportModelAdmin):
     resource_class = ProductResource
     list_display = (
         "name",
         "vendor",
+        "lifecycle_status",
         "end_of_life_announced_date",
         "end_of_life_date",
     )
@@ -46,10 +89,13 @@ class EntityAdmin(ImportExportModelAdmin):
         "vendor__name",
     )
     list_filter = (
+        "lifecycle_status",
         "vendor",
         "end_of_life_date",
     )
     readonly_fields = (
+        "lifecycle_status",
+        "next_transition_date",
         "created_at",
         "updated_at",
     )
@@ -67,6 +113,8 @@ class EntityAdmin(ImportExportModelAdmin):
                 "end_of_engineering_date",
                 "end_of_sale_date",
                 "end_of_life_date",
+                "lifecycle_status",
+                "next_transition_date",
             )
         }),
         ("Timestamps", {
@@ -81,9 +129,21 @@ class EntityAdmin(ImportExportModelAdmin):
 
 class SoftwareAdmin(EntityAdmin):
     resource_class = SoftwareResource
+    inlines = [SoftwareAliasInline]
+    list_display = EntityAdmin.list_display + ("family", "version")
+    readonly_fields = EntityAdmin.readonly_fields + ("family", "version")
+    fieldsets = EntityAdmin.fieldsets[:1] + (
+        ("Parsed Version", {
+            "fields": (
+                "family",
+                "version",
+            )
+        }),
+    ) + EntityAdmin.fieldsets[1:]
 
 class ProductAdmin(EntityAdmin):
     resource_class = ProductResource
+    inlines = [ProductAliasInline]
 
 admin.site.register(Product, ProductAdmin)
 admin.site.register(Software, SoftwareAdmin)
\ No newline at end of file
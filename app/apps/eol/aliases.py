@@ -0,0 +1,46 @@
+# apps/eol/aliases.py
+
+import hashlib
+import re
+import unicodedata
+
+
+ALIAS_MAX_LENGTH = 300
+
+# Prefix matching tries the input's own prefixes, longest first, down to
+# PREFIX_MIN_LENGTH characters (shorter aliases would match too much). Inputs are
+# only probed up to PREFIX_MAX_LENGTH characters: part numbers are short, and
+# every probed length is one more hash to look up.
+PREFIX_MIN_LENGTH = 4
+PREFIX_MAX_LENGTH = 40
+
+_SEPARATORS_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_alias(text):
+    """
+    Case, width and separators do not matter to inventory strings: "C9300-48P-E",
+    "c9300 48p e" and "C9300_48PE" all become "c930048pe".
+    """
+    return _SEPARATORS_RE.sub("", unicodedata.normalize("NFKC", text).casefold())[:ALIAS_MAX_LENGTH]
+
+
+def alias_hash(key):
+    """
+    Signed 64-bit blake2b of a normalized key: fits SQLite's INTEGER, so lookups
+    probe a compact integer index instead of comparing strings.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def prefix_candidates(key, lengths):
+    """
+    Proper prefixes of `key` tried by prefix matching, longest first. Only prefixes
+    whose length is in `lengths` (the key lengths stored in the alias table) can
+    match, so no other length is probed.
+    """
+    return [
+        key[:length]
+        for length in range(min(len(key) - 1, PREFIX_MAX_LENGTH), PREFIX_MIN_LENGTH - 1, -1)
+        if length in lengths
+    ]
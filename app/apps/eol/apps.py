@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.eol'
+
+    def ready(self):
+        from apps.eol import signals  # noqa: F401
@@ -0,0 +1,91 @@
+# apps/eol/changes.py
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.eol.models import ChangeEvent, ChangeFeedState
+
+
+Action = ChangeEvent.Action
+
+
+def record(model, action, object_ids):
+    """
+    Append one ChangeEvent per id of `model`. Called from signals for single-object
+    writes and directly by bulk paths (bulk_create/bulk_update/update()).
+    """
+    now = timezone.now()
+    ChangeEvent.objects.bulk_create([
+        ChangeEvent(model=model._meta.model_name, object_id=object_id, action=action, created_at=now)
+        for object_id in object_ids
+    ])
+
+
+def latest_cursor():
+    return ChangeEvent.objects.aggregate(latest=Max("id"))["latest"] or 0
+
+
+def read(since, limit):
+    """
+    Read up to `limit` events after cursor `since`, collapsed to the last event per
+    object (a client only needs the latest state).
+    Returns (events in cursor order, next cursor, has_more).
+    """
+    events = list(
+        ChangeEvent.objects
+        .filter(id__gt=since)
+        .order_by("id")
+        .values_list("id", "model", "object_id", "action")[:limit + 1]
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+    if not events:
+        return [], since, False
+
+    latest = {}
+    for event in events:
+        latest.pop(event[1:3], None)  # re-insert so dict order follows the last event
+        latest[event[1:3]] = event
+    return list(latest.values()), events[-1][0], has_more
+
+
+def compact(keep_days=None, dry_run=False):
+    """
+    Shrink the feed.
+
+    - Events superseded by a newer event for the same object are removed. That is
+      safe for every cursor: a client behind them still reads the newer event.
+    - With `keep_days`, events older than that are pruned too and
+      `ChangeFeedState.pruned_through` moves up; older cursors then get 410 Gone.
+    Returns (superseded, pruned) counts.
+    """
+    newest = (
+        ChangeEvent.objects
+        .order_by()
+        .values("model", "object_id")
+        .annotate(newest=Max("id"))
+        .values("newest")
+    )
+    superseded = ChangeEvent.objects.exclude(id__in=newest)
+
+    expired = ChangeEvent.objects.none()
+    if keep_days is not None:
+        expired = ChangeEvent.objects.filter(created_at__lt=timezone.now() - timedelta(days=keep_days))
+
+    if dry_run:
+        return superseded.count(), expired.count()
+
+    with transaction.atomic():
+        superseded_count, _ = superseded.delete()
+        horizon = expired.aggregate(horizon=Max("id"))["horizon"]
+        pruned_count = 0
+        if horizon is not None:
+            pruned_count, _ = ChangeEvent.objects.filter(id__lte=horizon).delete()
+            state = ChangeFeedState.current()
+            if horizon > state.pruned_through:
+                state.pruned_through = horizon
+                state.save(update_fields=["pruned_through"])
+    return superseded_count, pruned_count
@@ -0,0 +1,74 @@
+# apps/eol/counters.py
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.eol import changes
+from apps.eol.models import Vendor, Product, Software
+
+
+# Child model -> Vendor counter field it maintains.
+COUNTER_FIELDS = {
+    Product: "product_count",
+    Software: "software_count",
+}
+
+# pk__in chunk, below SQLite's 999 bound parameters.
+RECONCILE_CHUNK_SIZE = 900
+
+
+def adjust(model, vendor_id, delta):
+    """
+    Atomically add `delta` to the counter of `model` on vendor `vendor_id`. The
+    result is clamped at 0: a counter that drifted low must not make a delete
+    violate the column's CHECK constraint; reconcile() repairs the drift.
+    """
+    field = COUNTER_FIELDS[model]
+    if Vendor.objects.filter(pk=vendor_id).update(**{field: Greatest(F(field) + delta, Value(0))}):
+        # The counters are part of the vendor's API representation.
+        changes.record(Vendor, changes.Action.UPDATE, [vendor_id])
+
+
+def counted(model):
+    """
+    Subquery expression counting `model` rows of the outer Vendor.
+    """
+    counts = (
+        model.objects
+        .filter(vendor=OuterRef("pk"))
+        .order_by()
+        .values("vendor")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def reconcile(vendor_ids=None):
+    """
+    Recount the counters of `vendor_ids` (all vendors if None) from the child tables
+    and fix the ones that drifted. Each count is an index lookup on vendor_id.
+    Returns the number of vendors that were corrected.
+    """
+    queryset = Vendor.objects.order_by()
+    if vendor_ids is not None:
+        vendor_ids = list(vendor_ids)
+        chunks = [vendor_ids[start:start + RECONCILE_CHUNK_SIZE] for start in range(0, len(vendor_ids), RECONCILE_CHUNK_SIZE)]
+    else:
+        chunks = [None]
+
+    expressions = {field: counted(model) for model, field in COUNTER_FIELDS.items()}
+    fixed = 0
+    for chunk in chunks:
+        chunk_qs = queryset if chunk is None else queryset.filter(pk__in=chunk)
+        drifted = list(
+            chunk_qs
+            .annotate(**{f"actual_{field}": expression for field, expression in expressions.items()})
+            .exclude(**{field: F(f"actual_{field}") for field in expressions})
+            .values_list("pk", flat=True)
+        )
+        for start in range(0, len(drifted), RECONCILE_CHUNK_SIZE):
+            Vendor.objects.filter(pk__in=drifted[start:start + RECONCILE_CHUNK_SIZE]).update(**expressions)
+        changes.record(Vendor, changes.Action.UPDATE, drifted)
+        fixed += len(drifted)
+    return fixed
@@ -0,0 +1,20 @@
+# apps/eol/fields.py
+
+from django.db import models
+
+
+class SearchDocumentField(models.TextField):
+    """
+    Maps the hidden column an FTS5 table exposes under its own name. Filtering it
+    with `__match` runs a full-text query; it is also the argument of `bm25()`.
+    """
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
@@ -0,0 +1,200 @@
+# apps/eol/importers.py
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.eol import changes
+from apps.eol.lifecycle import LIFECYCLE_DATE_FIELDS
+from apps.eol.models import Vendor
+from apps.eol.signals import catalog_bulk_changed
+
+
+# Rows per chunk. Existing objects of a chunk are read with
+# `name IN (...) AND vendor_id IN (...)`, which must stay under SQLite's 999
+# bound parameters.
+IMPORT_CHUNK_SIZE = 400
+
+# Column holding the vendor name; "vendor__name" is what EntityResource exports.
+VENDOR_COLUMNS = ("vendor__name", "vendor")
+
+
+class ImportResult:
+    def __init__(self, max_errors):
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.vendors_created = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def fail(self, line, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, message))
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "vendors_created": self.vendors_created,
+        }
+
+
+class BulkEntityImporter:
+    """
+    Imports Product/Software rows in chunks instead of row by row.
+
+    Rows are dicts in the EntityResource export layout (`vendor__name`, `name`
+    and the lifecycle date columns; `id`, `created_at` and `updated_at` are
+    ignored). For every chunk:
+    - vendor names not seen before are resolved in one query (and created with
+      `create_vendors`),
+    - existing objects are fetched by (vendor, name) in one query and diffed
+      against the row: only date columns present in the file are compared and
+      written, unchanged rows are skipped,
+    - new objects go through `bulk_create`, changed ones through `bulk_update`,
+      in one transaction per chunk.
+    Derived lifecycle/version fields are computed here, as bulk writes skip save().
+    """
+
+    def __init__(self, model, create_vendors=False, dry_run=False, chunk_size=IMPORT_CHUNK_SIZE, max_errors=100):
+        self.model = model
+        self.create_vendors = create_vendors
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        # vendor name -> id; None marks a vendor a dry run would create.
+        self._vendor_ids = {}
+        # Vendors that received new rows; their counters are recounted at the end.
+        self._grown_vendor_ids = set()
+
+    def run(self, rows):
+        """
+        Import `rows`, an iterable of (line number, dict). Returns an ImportResult.
+        """
+        result = ImportResult(self.max_errors)
+        chunk = []
+        try:
+            for line, row in rows:
+                parsed = self.parse_row(line, row, result)
+                if parsed is None:
+                    continue
+                chunk.append(parsed)
+                if len(chunk) >= self.chunk_size:
+                    self.apply_chunk(chunk, result)
+                    chunk = []
+            if chunk:
+                self.apply_chunk(chunk, result)
+        finally:
+            # Also when a row or chunk raised: the chunks committed before it must
+            # not stay behind the catalog revision, response cache and counters.
+            if not self.dry_run:
+                if result.vendors_created:
+                    catalog_bulk_changed.send(sender=Vendor)
+                if result.created or result.updated:
+                    catalog_bulk_changed.send(sender=self.model, vendor_ids=self._grown_vendor_ids)
+        return result
+
+    def parse_row(self, line, row, result):
+        vendor = next((row[column] for column in VENDOR_COLUMNS if row.get(column)), None)
+        name = row.get("name")
+        vendor = vendor.strip() if isinstance(vendor, str) else None
+        name = name.strip() if isinstance(name, str) else None
+        if not vendor or not name:
+            result.fail(line, "Both a vendor name and a name are required.")
+            return None
+
+        dates = {}
+        for field in LIFECYCLE_DATE_FIELDS:
+            if field not in row:
+                continue
+            value = row[field]
+            if value is None or value == "":
+                dates[field] = None
+                continue
+            try:
+                dates[field] = parse_date(str(value).strip()[:10])
+            except ValueError:
+                dates[field] = None
+            if dates[field] is None:
+                result.fail(line, f"{field}: '{value}' is not a YYYY-MM-DD date.")
+                return None
+        return line, vendor, name, dates
+
+    def resolve_vendors(self, names, result):
+        missing = [name for name in names if name not in self._vendor_ids]
+        if not missing:
+            return
+        self._vendor_ids.update(Vendor.objects.filter(name__in=missing).values_list("name", "id"))
+
+        unknown = [name for name in missing if name not in self._vendor_ids]
+        if not unknown or not self.create_vendors:
+            return
+        result.vendors_created += len(unknown)
+        if self.dry_run:
+            self._vendor_ids.update(dict.fromkeys(unknown))
+            return
+        Vendor.objects.bulk_create([Vendor(name=name) for name in unknown], ignore_conflicts=True)
+        created = dict(Vendor.objects.filter(name__in=unknown).values_list("name", "id"))
+        changes.record(Vendor, changes.Action.CREATE, created.values())
+        self._vendor_ids.update(created)
+
+    def apply_chunk(self, chunk, result):
+        self.resolve_vendors({vendor for _, vendor, _, _ in chunk}, result)
+
+        # Later rows for the same (vendor, name) win; earlier ones count as skipped.
+        rows = {}
+        for line, vendor, name, dates in chunk:
+            if vendor not in self._vendor_ids:
+                result.fail(line, f"Unknown vendor '{vendor}'.")
+                continue
+            key = (self._vendor_ids[vendor], name)
+            if key in rows:
+                result.skipped += 1
+            rows[key] = (line, dates)
+
+        known = [key for key in rows if key[0] is not None]
+        existing = {}
+        if known:
+            queryset = self.model.objects.order_by().filter(
+                vendor_id__in={vendor_id for vendor_id, _ in known},
+                name__in={name for _, name in known},
+            )
+            existing = {(obj.vendor_id, obj.name): obj for obj in queryset}
+
+        now = timezone.now()
+        creates = []
+        updates = []
+        for (vendor_id, name), (line, dates) in rows.items():
+            obj = existing.get((vendor_id, name))
+            if obj is None:
+                obj = self.model(vendor_id=vendor_id, name=name, **dates)
+                obj.set_lifecycle_fields()
+                if hasattr(obj, "set_version_fields"):
+                    obj.set_version_fields()
+                creates.append(obj)
+            elif any(getattr(obj, field) != value for field, value in dates.items()):
+                for field, value in dates.items():
+                    setattr(obj, field, value)
+                obj.set_lifecycle_fields()
+                obj.updated_at = now
+                updates.append(obj)
+            else:
+                result.skipped += 1
+
+        if not self.dry_run:
+            self._grown_vendor_ids.update(obj.vendor_id for obj in creates)
+            with transaction.atomic():
+                self.model.objects.bulk_create(creates)
+                self.model.objects.bulk_update(
+                    updates,
+                    [*LIFECYCLE_DATE_FIELDS, *self.model.LIFECYCLE_FIELDS, "updated_at"],
+                )
+                changes.record(self.model, changes.Action.CREATE, [obj.pk for obj in creates])
+                changes.record(self.model, changes.Action.UPDATE, [obj.pk for obj in updates])
+        result.created += len(creates)
+        result.updated += len(updates)
@@ -0,0 +1,51 @@
+# apps/eol/lifecycle.py
+
+from django.db import models
+
+
+class LifecycleStatus(models.TextChoices):
+    SUPPORTED = "supported", "Supported"
+    END_OF_SALE = "end_of_sale", "End-of-Sale"
+    END_OF_ENGINEERING = "end_of_engineering", "End-of-Engineering"
+    END_OF_LIFE = "end_of_life", "End-of-Life"
+
+
+# Milestone date field per status, from least to most severe. An object is in the
+# most severe status whose date has been reached.
+MILESTONES = (
+    (LifecycleStatus.END_OF_SALE, "end_of_sale_date"),
+    (LifecycleStatus.END_OF_ENGINEERING, "end_of_engineering_date"),
+    (LifecycleStatus.END_OF_LIFE, "end_of_life_date"),
+)
+
+MILESTONE_FIELDS = tuple(field for _, field in MILESTONES)
+
+# Every date of LifecycleMixin, as written by importers and bulk APIs.
+LIFECYCLE_DATE_FIELDS = (
+    "end_of_life_announced_date",
+    "end_of_engineering_date",
+    "end_of_sale_date",
+    "end_of_life_date",
+)
+
+
+def compute_lifecycle(obj, today):
+    """
+    Return (status, next_transition_date) of `obj` on `today`.
+
+    `next_transition_date` is the earliest future milestone that would move `obj` to
+    a more severe status, or None if no such date is set. Dates are read from the
+    LifecycleMixin fields; a milestone without a date is never reached.
+    """
+    status, severity = LifecycleStatus.SUPPORTED, -1
+    for index, (milestone, field) in enumerate(MILESTONES):
+        value = getattr(obj, field)
+        if value is not None and value <= today:
+            status, severity = milestone, index
+
+    upcoming = [
+        value
+        for index, (_, field) in enumerate(MILESTONES)
+        if index > severity and (value := getattr(obj, field)) is not None and value > today
+    ]
+    return status, min(upcoming, default=None)
@@ -0,0 +1,176 @@
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from apps.eol.models import Product
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent readers and writers against a scratch copy of the database "
+        "under each SQLite profile in settings.SQLITE_PROFILES. Every operation ends like a "
+        "request does (close_old_connections), so CONN_MAX_AGE is part of the measurement."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="+", default=list(settings.SQLITE_PROFILES))
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--page-size", type=int, default=100, help="Rows per read (one API page).")
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["profiles"]) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(sorted(unknown))}.")
+        if connections["default"].vendor != "sqlite":
+            raise CommandError("The default database is not SQLite.")
+        self.pks = list(Product.objects.values_list("pk", flat=True))
+        if not self.pks:
+            raise CommandError("No products to benchmark against; import or generate a catalog first.")
+
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in options["profiles"]:
+                path = Path(directory) / f"bench-{profile}.sqlite3"
+                self.copy_database(path)
+                alias = f"bench_{profile}"
+                connections.settings[alias] = connections.configure_settings({
+                    "default": settings.DATABASES["default"],
+                    alias: {
+                        "ENGINE": "django.db.backends.sqlite3",
+                        "NAME": str(path),
+                        **settings.SQLITE_PROFILES[profile],
+                    },
+                })[alias]
+                try:
+                    results.append({"profile": profile, **self.run(alias, options)})
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'profile':<12} {'reads/s':>9} {'writes/s':>9} {'read p95':>9} {'write p95':>10} {'locked':>7}"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['profile']:<12} {row['reads_per_second']:>9.1f} {row['writes_per_second']:>9.1f} "
+                f"{row['read_p95_ms']:>7.1f}ms {row['write_p95_ms']:>8.1f}ms {row['locked_errors']:>7}"
+            )
+
+    def copy_database(self, path):
+        source = sqlite3.connect(str(settings.DATABASES["default"]["NAME"]))
+        target = sqlite3.connect(str(path))
+        try:
+            source.backup(target)
+            # Start every profile from a rollback journal; a profile may switch to WAL.
+            target.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            target.close()
+            source.close()
+
+    def run(self, alias, options):
+        deadline = time.monotonic() + options["seconds"]
+        read_latencies, write_latencies = [], []
+        errors = {"locked": 0}
+        lock = threading.Lock()
+
+        def finish_request():
+            # What request_finished does: close unless CONN_MAX_AGE keeps it.
+            connections[alias].close_if_unusable_or_obsolete()
+
+        def reader():
+            local = []
+            queryset = Product.objects.using(alias).select_related("vendor").order_by("vendor__name", "name")
+            try:
+                while time.monotonic() < deadline:
+                    offset = random.randrange(max(1, len(self.pks) - options["page_size"]))
+                    started = time.perf_counter()
+                    try:
+                        list(queryset[offset:offset + options["page_size"]])
+                    except OperationalError as exc:
+                        if "locked" not in str(exc):
+                            raise
+                        with lock:
+                            errors["locked"] += 1
+                    else:
+                        local.append(time.perf_counter() - started)
+                    finish_request()
+            finally:
+                connections[alias].close()
+            with lock:
+                read_latencies.extend(local)
+
+        def writer():
+            local = []
+            try:
+                while time.monotonic() < deadline:
+                    pk = random.choice(self.pks)
+                    started = time.perf_counter()
+                    try:
+                        # Read-then-write, like a PATCH: the transaction needs the write lock late.
+                        with transaction.atomic(using=alias):
+                            current = Product.objects.using(alias).filter(pk=pk).values_list("end_of_life_date", flat=True).first()
+                            Product.objects.using(alias).filter(pk=pk).update(
+                                end_of_life_date=(current or timezone.localdate()) + timedelta(days=1),
+                                updated_at=timezone.now(),
+                            )
+                    except OperationalError as exc:
+                        if "locked" not in str(exc):
+                            raise
+                        with lock:
+                            errors["locked"] += 1
+                    else:
+                        local.append(time.perf_counter() - started)
+                    finish_request()
+            finally:
+                connections[alias].close()
+            with lock:
+                write_latencies.extend(local)
+
+        threads = [threading.Thread(target=reader) for _ in range(options["readers"])]
+        threads += [threading.Thread(target=writer) for _ in range(options["writers"])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        return {
+            "readers": options["readers"],
+            "writers": options["writers"],
+            "seconds": round(elapsed, 2),
+            "reads": len(read_latencies),
+            "writes": len(write_latencies),
+            "reads_per_second": round(len(read_latencies) / elapsed, 1),
+            "writes_per_second": round(len(write_latencies) / elapsed, 1),
+            "read_p50_ms": round(percentile(read_latencies, 0.5) * 1000, 2),
+            "read_p95_ms": round(percentile(read_latencies, 0.95) * 1000, 2),
+            "write_p50_ms": round(percentile(write_latencies, 0.5) * 1000, 2),
+            "write_p95_ms": round(percentile(write_latencies, 0.95) * 1000, 2),
+            "read_mean_ms": round(statistics.fmean(read_latencies) * 1000, 2) if read_latencies else 0.0,
+            "locked_errors": errors["locked"],
+        }
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.eol import changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact the change feed: drop events superseded by a newer event for the same "
+        "object, and prune events older than --keep-days. Clients whose cursor predates "
+        "the pruned history get 410 Gone from /api/v1/changes/ and must resync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days", type=int, default=settings.CHANGE_FEED_RETENTION_DAYS,
+            help="Days of history to keep (default: settings.CHANGE_FEED_RETENTION_DAYS).",
+        )
+        parser.add_argument("--no-prune", action="store_true", help="Only drop superseded events.")
+        parser.add_argument("--dry-run", action="store_true", help="Count what would be removed.")
+
+    def handle(self, *args, **options):
+        if options["keep_days"] < 0:
+            raise CommandError("--keep-days must not be negative.")
+        keep_days = None if options["no_prune"] else options["keep_days"]
+        superseded, pruned = changes.compact(keep_days=keep_days, dry_run=options["dry_run"])
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {superseded} superseded and {pruned} expired event(s)."
+        ))
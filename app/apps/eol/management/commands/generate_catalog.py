@@ -0,0 +1,176 @@
+import itertools
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.eol import changes
+from apps.eol.models import Vendor, Product, Software
+from apps.eol.signals import catalog_bulk_changed
+
+
+# Vendor names are built from these parts, e.g. "Norvex Networks".
+NAME_STARTS = ("Ar", "Bel", "Cor", "Dyn", "El", "Fal", "Gal", "Hel", "Ion", "Jun", "Kor", "Lum", "Mer", "Nor", "Or", "Pal", "Quan", "Ros", "Sil", "Tor", "Ul", "Ver", "Wex", "Zen")
+NAME_ENDS = ("a", "ex", "ion", "is", "ix", "on", "ra", "tek", "tra", "us", "vo", "yx")
+NAME_SUFFIXES = ("Networks", "Systems", "Technologies", "Communications", "Devices", "Labs", "Security", "Computing")
+
+PRODUCT_SERIES = ("Catalyst", "Edge", "Core", "Access", "Nexus", "Gateway", "Firewall", "Router", "Switch", "Controller", "Appliance", "Sensor")
+PRODUCT_VARIANTS = ("", "", "", "-24P", "-48P", "-X", "-XL", "-M", "-R")
+SOFTWARE_FAMILIES = ("OS", "OS XE", "OS XR", "NX-OS", "Firmware", "Controller", "Agent", "Manager", "FabricOS", "EdgeOS")
+
+
+def percent(value, total):
+    return f"{100 * value / total:.0f}%" if total else "-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic catalog with bulk inserts: vendors with a Zipf-skewed share of "
+        "products and software, realistic lifecycle date spreads and parsed software versions. "
+        "Rows are appended; counters, the search index, the change feed and the catalog revision "
+        "are kept consistent. Use --seed for reproducible catalogs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vendors", type=int, default=1000)
+        parser.add_argument("--products", type=int, default=100000)
+        parser.add_argument("--software", type=int, default=100000)
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of the vendor distribution (0: uniform).")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per transaction.")
+
+    def handle(self, *args, **options):
+        if options["vendors"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--vendors and --batch-size must be positive.")
+        if min(options["products"], options["software"], options["skew"]) < 0:
+            raise CommandError("--products, --software and --skew must not be negative.")
+
+        self.rng = random.Random(options["seed"])
+        self.today = timezone.localdate()
+        started = time.monotonic()
+
+        vendors = self.create_vendors(options["vendors"])
+        self.stdout.write(f"{len(vendors)} vendors ready.")
+
+        # Vendor i gets a share proportional to 1 / (i + 1) ** skew.
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) ** options["skew"] for rank in range(len(vendors))))
+        for model, total, build in (
+            (Product, options["products"], self.build_product),
+            (Software, options["software"], self.build_software),
+        ):
+            if total:
+                self.generate(model, vendors, cum_weights, total, options["batch_size"], build)
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.monotonic() - started:.1f}s."))
+
+    def create_vendors(self, count):
+        """
+        Create `count` vendors (reusing those a run with the same seed created).
+        Returns their ids in rank order.
+        """
+        names = []
+        seen = set()
+        for index in itertools.count():
+            if len(names) >= count:
+                break
+            name = (
+                f"{self.rng.choice(NAME_STARTS)}{self.rng.choice(NAME_ENDS)} {self.rng.choice(NAME_SUFFIXES)}"
+            )
+            if name in seen:
+                name = f"{name} {index}"
+            seen.add(name)
+            names.append(name)
+
+        ids = {}
+        for start in range(0, len(names), 900):
+            chunk = names[start:start + 900]
+            ids.update(Vendor.objects.filter(name__in=chunk).values_list("name", "id"))
+        new = [name for name in names if name not in ids]
+        with transaction.atomic():
+            Vendor.objects.bulk_create([Vendor(name=name) for name in new], ignore_conflicts=True)
+            created = {}
+            for start in range(0, len(new), 900):
+                created.update(Vendor.objects.filter(name__in=new[start:start + 900]).values_list("name", "id"))
+            changes.record(Vendor, changes.Action.CREATE, created.values())
+        ids.update(created)
+        if created:
+            catalog_bulk_changed.send(sender=Vendor)
+        return [ids[name] for name in names]
+
+    def generate(self, model, vendors, cum_weights, total, batch_size, build):
+        # Continue each vendor's numbering after its existing rows (the counters), so
+        # names stay unique when a catalog is grown.
+        counters = self.existing_counts(model, vendors)
+        label = model._meta.verbose_name_plural
+        started = time.monotonic()
+        written = 0
+        touched = set()
+        while written < total:
+            size = min(batch_size, total - written)
+            objs = []
+            for vendor_id in self.rng.choices(vendors, cum_weights=cum_weights, k=size):
+                number = counters.get(vendor_id, 0)
+                counters[vendor_id] = number + 1
+                obj = build(vendor_id, number)
+                obj.set_lifecycle_fields(self.today)
+                objs.append(obj)
+                touched.add(vendor_id)
+            with transaction.atomic():
+                model.objects.bulk_create(objs)
+                changes.record(model, changes.Action.CREATE, [obj.pk for obj in objs])
+            written += size
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{label}: {written}/{total} ({percent(written, total)}, {written / elapsed:.0f} rows/s)")
+        # Recounts vendor counters and bumps the catalog revision.
+        catalog_bulk_changed.send(sender=model, vendor_ids=touched)
+
+    @staticmethod
+    def existing_counts(model, vendors):
+        # pk__in chunks stay below SQLite's 999 bound parameters.
+        field = "product_count" if model is Product else "software_count"
+        counts = {}
+        for start in range(0, len(vendors), 900):
+            counts.update(Vendor.objects.filter(pk__in=vendors[start:start + 900]).values_list("pk", field))
+        return counts
+
+    def lifecycle_dates(self):
+        """
+        A quarter of the rows have no announced lifecycle. Otherwise EOL is announced
+        between ten years ago and a year from now, End-of-Sale follows within a year,
+        End-of-Engineering 1-3 years and End-of-Life 3-5 years after that; single
+        milestones are sometimes unknown.
+        """
+        rng = self.rng
+        if rng.random() < 0.25:
+            return {}
+        announced = self.today + timedelta(days=rng.randint(-3650, 365))
+        end_of_sale = announced + timedelta(days=rng.randint(90, 365))
+        dates = {
+            "end_of_life_announced_date": announced,
+            "end_of_sale_date": end_of_sale,
+            "end_of_engineering_date": end_of_sale + timedelta(days=rng.randint(365, 3 * 365)),
+            "end_of_life_date": end_of_sale + timedelta(days=rng.randint(3 * 365, 5 * 365)),
+        }
+        for field in ("end_of_life_announced_date", "end_of_engineering_date"):
+            if rng.random() < 0.15:
+                dates[field] = None
+        return dates
+
+    def build_product(self, vendor_id, number):
+        # The vendor's running number keeps (vendor, name) unique.
+        series = PRODUCT_SERIES[(vendor_id + number % 3) % len(PRODUCT_SERIES)]
+        name = f"{series} {1000 + number}{self.rng.choice(PRODUCT_VARIANTS)}"
+        return Product(vendor_id=vendor_id, name=name, **self.lifecycle_dates())
+
+    def build_software(self, vendor_id, number):
+        # Each vendor ships two families; versions count up per vendor, so
+        # (vendor, name) is unique and version filters see realistic spreads.
+        family = SOFTWARE_FAMILIES[(vendor_id + number % 2) % len(SOFTWARE_FAMILIES)]
+        major, rest = divmod(number, 400)
+        minor, patch = divmod(rest, 20)
+        obj = Software(vendor_id=vendor_id, name=f"{family} {major + 1}.{minor}.{patch}", **self.lifecycle_dates())
+        obj.set_version_fields()
+        return obj
@@ -0,0 +1,100 @@
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.eol.importers import IMPORT_CHUNK_SIZE, BulkEntityImporter
+from apps.eol.models import Product, Software
+
+
+MODELS = {
+    "product": Product,
+    "software": Software,
+}
+
+
+@contextmanager
+def _open(path):
+    # utf-8-sig: spreadsheet exports often start with a BOM.
+    if path == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        try:
+            yield stream
+        finally:
+            # Leave the real stdin open.
+            stream.detach()
+        return
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8-sig", newline="") as stream:
+        yield stream
+
+
+def read_csv(stream, delimiter):
+    reader = csv.DictReader(stream, delimiter=delimiter)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(stream):
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as exc:
+            raise CommandError(f"Line {line}: invalid JSON ({exc}).")
+        yield line, row if isinstance(row, dict) else {}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import products or software from a CSV (EntityResource export layout) or "
+        "NDJSON file, in chunks. Rows are matched on (vendor name, name): new ones are "
+        "created, changed ones updated and unchanged ones skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=sorted(MODELS))
+        parser.add_argument("path", help="File to import (.csv, .ndjson, optionally .gz), or '-' for stdin.")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension, else csv.")
+        parser.add_argument("--delimiter", default=",", help="CSV delimiter.")
+        parser.add_argument("--create-vendors", action="store_true", help="Create vendors missing from the catalog.")
+        parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        format = options["format"] or ("ndjson" if path.removesuffix(".gz").endswith((".ndjson", ".jsonl")) else "csv")
+        if not 0 < options["chunk_size"] <= IMPORT_CHUNK_SIZE:
+            raise CommandError(f"--chunk-size must be between 1 and {IMPORT_CHUNK_SIZE}.")
+
+        importer = BulkEntityImporter(
+            MODELS[options["model"]],
+            create_vendors=options["create_vendors"],
+            dry_run=options["dry_run"],
+            chunk_size=options["chunk_size"],
+        )
+
+        started = time.monotonic()
+        try:
+            with _open(path) as stream:
+                rows = read_ndjson(stream) if format == "ndjson" else read_csv(stream, options["delimiter"])
+                result = importer.run(rows)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for line, message in result.errors:
+            self.stderr.write(f"line {line}: {message}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f"... and {result.failed - len(result.errors)} more errors.")
+
+        counts = ", ".join(f"{key}={value}" for key, value in result.as_dict().items())
+        prefix = "[dry run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{counts} in {time.monotonic() - started:.1f}s."
+        ))
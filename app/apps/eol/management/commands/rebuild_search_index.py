@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.eol import search
+from apps.eol.models import Product
+
+
+class Command(BaseCommand):
+    help = "Repopulate the FTS5 search index of vendors, products and software from the catalog tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        connection = connections[using]
+        if connection.vendor != "sqlite" or "eol_product_search" not in connection.introspection.table_names():
+            raise CommandError(f"Database '{using}' has no FTS5 search index (run migrate on SQLite).")
+
+        search.rebuild(using)
+        self.stdout.write(self.style.SUCCESS(
+            f"Search index rebuilt ({Product.objects.using(using).count()} products indexed)."
+        ))
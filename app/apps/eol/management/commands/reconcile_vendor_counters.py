@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.eol import counters
+from apps.eol.models import Vendor
+from apps.eol.signals import catalog_bulk_changed
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount Vendor.product_count / software_count from the product and software "
+        "tables and fix drifted counters (after raw SQL writes, loaddata, etc.)."
+    )
+
+    def handle(self, *args, **options):
+        fixed = counters.reconcile()
+        if fixed:
+            catalog_bulk_changed.send(sender=Vendor)
+        self.stdout.write(self.style.SUCCESS(
+            f"{fixed} of {Vendor.objects.count()} vendors had drifted counters."
+        ))
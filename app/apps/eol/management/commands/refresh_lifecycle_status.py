@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.eol import changes
+from apps.eol.lifecycle import MILESTONE_FIELDS, compute_lifecycle
+from apps.eol.models import Product, Software
+from apps.eol.signals import catalog_bulk_changed
+
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute lifecycle_status of products and software whose next_transition_date "
+        "has been reached. Only due rows are read (indexed), so it is cheap to run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report due rows without writing.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        for model in (Product, Software):
+            due = (
+                model.objects
+                .filter(next_transition_date__lte=today)
+                .order_by("pk")
+                .only("id", *MILESTONE_FIELDS, *model.LIFECYCLE_FIELDS)
+            )
+            if options["dry_run"]:
+                self.stdout.write(f"{model._meta.verbose_name_plural}: {due.count()} due.")
+                continue
+
+            updated = self.refresh(model, due, today)
+            if updated:
+                catalog_bulk_changed.send(sender=model)
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.verbose_name_plural}: {updated} refreshed."
+            ))
+
+    @staticmethod
+    def refresh(model, queryset, today):
+        fields = [*model.LIFECYCLE_FIELDS, "updated_at"]
+        now = timezone.now()
+        updated = 0
+        # Each batch is re-queried: refreshed rows drop out of the filter.
+        while batch := list(queryset[:BATCH_SIZE]):
+            for obj in batch:
+                obj.lifecycle_status, obj.next_transition_date = compute_lifecycle(obj, today)
+                obj.updated_at = now
+            with transaction.atomic():
+                model.objects.bulk_update(batch, fields)
+                changes.record(model, changes.Action.UPDATE, [obj.pk for obj in batch])
+            updated += len(batch)
+        return updated
@@ -0,0 +1,54 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto every read replica in "
+        "settings.DATABASE_REPLICAS (EOL_DB_REPLICAS) with SQLite's online backup API. "
+        "Readers of a replica keep working while it is refreshed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, help="Keep syncing every INTERVAL seconds.")
+        parser.add_argument(
+            "--pages", type=int, default=-1,
+            help="Pages copied per backup step (-1: all at once). Smaller steps hold the source lock for less time.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas configured; set EOL_DB_REPLICAS.")
+        aliases = ["default", *settings.DATABASE_REPLICAS]
+        for alias in aliases:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"Database '{alias}' is not SQLite; use the server's own replication.")
+
+        source = str(settings.DATABASES["default"]["NAME"])
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                target = str(settings.DATABASES[alias]["NAME"])
+                started = time.monotonic()
+                self.copy(source, target, options["pages"])
+                self.stdout.write(f"{alias}: synced from {source} in {time.monotonic() - started:.2f}s.")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"{len(settings.DATABASE_REPLICAS)} replica(s) in sync."))
+
+    @staticmethod
+    def copy(source, target, pages):
+        source_db = sqlite3.connect(source)
+        target_db = sqlite3.connect(target, timeout=30)
+        try:
+            source_db.backup(target_db, pages=pages, sleep=0.005)
+        except sqlite3.Error as exc:
+            raise CommandError(f"Backup to {target} failed: {exc}")
+        finally:
+            target_db.close()
+            source_db.close()
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:47
+
+import apps.eol.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+TOKENIZE = "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"
+TABLES = ("eol_vendor_search", "eol_product_search", "eol_software_search")
+
+
+def _entity_statements(table, entity_table):
+    vendor_name = "(SELECT name FROM eol_vendor WHERE id = new.vendor_id)"
+    return [
+        f"CREATE VIRTUAL TABLE {table} USING fts5(name, vendor_name, {TOKENIZE})",
+        f"INSERT INTO {table}(rowid, name, vendor_name) "
+        f"SELECT e.id, e.name, v.name FROM {entity_table} e JOIN eol_vendor v ON v.id = e.vendor_id",
+        f"CREATE TRIGGER {table}_ai AFTER INSERT ON {entity_table} BEGIN "
+        f"INSERT INTO {table}(rowid, name, vendor_name) VALUES (new.id, new.name, {vendor_name}); END",
+        f"CREATE TRIGGER {table}_ad AFTER DELETE ON {entity_table} BEGIN "
+        f"DELETE FROM {table} WHERE rowid = old.id; END",
+        f"CREATE TRIGGER {table}_au AFTER UPDATE OF id, name, vendor_id ON {entity_table} BEGIN "
+        f"DELETE FROM {table} WHERE rowid = old.id; "
+        f"INSERT INTO {table}(rowid, name, vendor_name) VALUES (new.id, new.name, {vendor_name}); END",
+    ]
+
+
+CREATE_STATEMENTS = [
+    f"CREATE VIRTUAL TABLE eol_vendor_search USING fts5(name, {TOKENIZE})",
+    "INSERT INTO eol_vendor_search(rowid, name) SELECT id, name FROM eol_vendor",
+    "CREATE TRIGGER eol_vendor_search_ai AFTER INSERT ON eol_vendor BEGIN "
+    "INSERT INTO eol_vendor_search(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER eol_vendor_search_ad AFTER DELETE ON eol_vendor BEGIN "
+    "DELETE FROM eol_vendor_search WHERE rowid = old.id; END",
+    *_entity_statements("eol_product_search", "eol_product"),
+    *_entity_statements("eol_software_search", "eol_software"),
+    # A vendor rename also rewrites the vendor_name column of its products/software.
+    "CREATE TRIGGER eol_vendor_search_au AFTER UPDATE OF id, name ON eol_vendor BEGIN "
+    "DELETE FROM eol_vendor_search WHERE rowid = old.id; "
+    "INSERT INTO eol_vendor_search(rowid, name) VALUES (new.id, new.name); "
+    "UPDATE eol_product_search SET vendor_name = new.name "
+    "WHERE rowid IN (SELECT id FROM eol_product WHERE vendor_id = new.id); "
+    "UPDATE eol_software_search SET vendor_name = new.name "
+    "WHERE rowid IN (SELECT id FROM eol_software WHERE vendor_id = new.id); END",
+]
+
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {table}_{suffix}" for table in TABLES for suffix in ("ai", "ad", "au")
+] + [
+    f"DROP TABLE IF EXISTS {table}" for table in TABLES
+]
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends keep the LIKE-based search.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0002_catalogrevision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSearch',
+            fields=[
+                ('product', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='eol.product')),
+                ('name', models.TextField()),
+                ('vendor_name', models.TextField()),
+                ('document', apps.eol.fields.SearchDocumentField(db_column='eol_product_search')),
+            ],
+            options={
+                'db_table': 'eol_product_search',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SoftwareSearch',
+            fields=[
+                ('software', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='eol.software')),
+                ('name', models.TextField()),
+                ('vendor_name', models.TextField()),
+                ('document', apps.eol.fields.SearchDocumentField(db_column='eol_software_search')),
+            ],
+            options={
+                'db_table': 'eol_software_search',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='VendorSearch',
+            fields=[
+                ('vendor', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='eol.vendor')),
+                ('name', models.TextField()),
+                ('document', apps.eol.fields.SearchDocumentField(db_column='eol_vendor_search')),
+            ],
+            options={
+                'db_table': 'eol_vendor_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
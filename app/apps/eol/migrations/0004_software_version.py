@@ -0,0 +1,57 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:52
+
+from django.db import migrations, models
+
+from apps.eol.search_schema import without_search_triggers
+from apps.eol.versions import normalize_family, parse_software_name, version_sort_key
+
+
+def populate_version_fields(apps, schema_editor):
+    Software = apps.get_model("eol", "Software")
+    batch = []
+    for software in Software.objects.only("id", "name").iterator(chunk_size=2000):
+        software.family, software.version = parse_software_name(software.name)
+        software.family_key = normalize_family(software.family)
+        software.version_key = version_sort_key(software.version) if software.version else None
+        batch.append(software)
+        if len(batch) >= 2000:
+            Software.objects.bulk_update(batch, ["family", "family_key", "version", "version_key"])
+            batch = []
+    if batch:
+        Software.objects.bulk_update(batch, ["family", "family_key", "version", "version_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0003_search_index'),
+    ]
+
+    operations = without_search_triggers(
+        migrations.AddField(
+            model_name='software',
+            name='family',
+            field=models.CharField(blank=True, editable=False, help_text="Software family parsed from the name, e.g. 'IOS XE'.", max_length=300),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='family_key',
+            field=models.CharField(blank=True, editable=False, help_text="Normalized family used for filtering, e.g. 'ios-xe'.", max_length=300),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='version',
+            field=models.CharField(blank=True, editable=False, help_text="Version parsed from the name, e.g. '17.3.1'.", max_length=100),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='version_key',
+            field=models.CharField(blank=True, editable=False, help_text='Sortable encoding of `version`.', max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['family_key', 'version_key'], name='eol_softwar_family__49f93c_idx'),
+        ),
+    ) + [
+        migrations.RunPython(populate_version_fields, migrations.RunPython.noop),
+    ]
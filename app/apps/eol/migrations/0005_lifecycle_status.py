@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:54
+
+from django.db import migrations, models
+from django.utils import timezone
+
+from apps.eol.lifecycle import MILESTONE_FIELDS, compute_lifecycle
+from apps.eol.search_schema import without_search_triggers
+
+
+def populate_lifecycle_fields(apps, schema_editor):
+    today = timezone.localdate()
+    fields = ["lifecycle_status", "next_transition_date"]
+    for model_name in ("Product", "Software"):
+        model = apps.get_model("eol", model_name)
+        batch = []
+        for obj in model.objects.only("id", *MILESTONE_FIELDS).iterator(chunk_size=2000):
+            obj.lifecycle_status, obj.next_transition_date = compute_lifecycle(obj, today)
+            batch.append(obj)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, fields)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0004_software_version'),
+    ]
+
+    operations = without_search_triggers(
+        migrations.AddField(
+            model_name='product',
+            name='lifecycle_status',
+            field=models.CharField(choices=[('supported', 'Supported'), ('end_of_sale', 'End-of-Sale'), ('end_of_engineering', 'End-of-Engineering'), ('end_of_life', 'End-of-Life')], db_index=True, default='supported', editable=False, help_text='Current lifecycle status, derived from the lifecycle dates.', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='next_transition_date',
+            field=models.DateField(blank=True, db_index=True, editable=False, help_text='Date the lifecycle status changes next, if any.', null=True),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='lifecycle_status',
+            field=models.CharField(choices=[('supported', 'Supported'), ('end_of_sale', 'End-of-Sale'), ('end_of_engineering', 'End-of-Engineering'), ('end_of_life', 'End-of-Life')], db_index=True, default='supported', editable=False, help_text='Current lifecycle status, derived from the lifecycle dates.', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='next_transition_date',
+            field=models.DateField(blank=True, db_index=True, editable=False, help_text='Date the lifecycle status changes next, if any.', null=True),
+        ),
+    ) + [
+        migrations.RunPython(populate_lifecycle_fields, migrations.RunPython.noop),
+    ]
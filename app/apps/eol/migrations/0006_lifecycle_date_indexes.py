@@ -0,0 +1,57 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0005_lifecycle_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name'], name='eol_product_name_5f4d32_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['end_of_life_date'], name='eol_product_end_of__711b6e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['end_of_sale_date'], name='eol_product_end_of__8d3660_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['end_of_engineering_date'], name='eol_product_end_of__07ccb6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['end_of_life_announced_date'], name='eol_product_end_of__aa785c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['name'], name='eol_softwar_name_e1e0e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['end_of_life_date'], name='eol_softwar_end_of__b0fe50_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['end_of_sale_date'], name='eol_softwar_end_of__b4ae6c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['end_of_engineering_date'], name='eol_softwar_end_of__0ae36d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['end_of_life_announced_date'], name='eol_softwar_end_of__ee7da4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['version_key'], name='eol_softwar_version_5e7ec2_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.eol.search_schema import without_search_triggers
+
+
+def populate_vendor_counters(apps, schema_editor):
+    Vendor = apps.get_model("eol", "Vendor")
+    counts = {}
+    for field, model_name in (("product_count", "Product"), ("software_count", "Software")):
+        model = apps.get_model("eol", model_name)
+        totals = (
+            model.objects.filter(vendor=OuterRef("pk"))
+            .order_by().values("vendor").annotate(total=Count("pk")).values("total")
+        )
+        counts[field] = Coalesce(Subquery(totals), Value(0))
+    Vendor.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0006_lifecycle_date_indexes'),
+    ]
+
+    operations = without_search_triggers(
+        migrations.AddField(
+            model_name='vendor',
+            name='product_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of products of this vendor.'),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='software_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of software packages of this vendor.'),
+        ),
+    ) + [
+        migrations.RunPython(populate_vendor_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0007_vendor_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeFeedState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pruned_through', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Change Feed State',
+                'verbose_name_plural': 'Change Feed State',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(help_text='Model name: vendor, product or software.', max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=6)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Change Event',
+                'verbose_name_plural': 'Change Events',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['model', 'object_id'], name='eol_changee_model_d78011_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0008_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text="Alias as entered, e.g. 'C9300-48P-E'.", max_length=300)),
+                ('key', models.CharField(editable=False, help_text='Normalized alias: casefolded, without spaces or punctuation.', max_length=300)),
+                ('key_hash', models.BigIntegerField(db_index=True, editable=False, help_text='64-bit blake2b hash of `key`.')),
+                ('product', models.ForeignKey(help_text='Product this alias names.', on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='eol.product')),
+            ],
+            options={
+                'verbose_name': 'Product Alias',
+                'verbose_name_plural': 'Product Aliases',
+                'unique_together': {('product', 'key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SoftwareAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text="Alias as entered, e.g. 'C9300-48P-E'.", max_length=300)),
+                ('key', models.CharField(editable=False, help_text='Normalized alias: casefolded, without spaces or punctuation.', max_length=300)),
+                ('key_hash', models.BigIntegerField(db_index=True, editable=False, help_text='64-bit blake2b hash of `key`.')),
+                ('software', models.ForeignKey(help_text='Software package this alias names.', on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='eol.software')),
+            ],
+            options={
+                'verbose_name': 'Software Alias',
+                'verbose_name_plural': 'Software Aliases',
+                'unique_together': {('software', 'key')},
+            },
+        ),
+    ]
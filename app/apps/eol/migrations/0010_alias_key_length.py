@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:57
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eol', '0009_aliases'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productalias',
+            index=models.Index(django.db.models.functions.text.Length('key'), name='eol_productalias_key_length'),
+        ),
+        migrations.AddIndex(
+            model_name='softwarealias',
+            index=models.Index(django.db.models.functions.text.Length('key'), name='eol_softwarealias_key_length'),
+        ),
+    ]
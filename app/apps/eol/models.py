@@ -1,5 +1,9 @@
 from django.db import models
-from apps.eol.abstracts import AbstractEntity
+from django.db.models.functions import Length
+from django.utils import timezone
+from apps.eol.abstracts import AbstractAlias, AbstractEntity, RevisionCounter
+from apps.eol.fields import SearchDocumentField
+from apps.eol.versions import normalize_family, parse_software_name, version_sort_key
 
 class Vendor(models.Model):
     name = models.CharField(
@@ -8,6 +12,18 @@ class Vendor(models.Model):
         help_text="Vendor or manufacturer name."
     )
 
+    # — Maintained by signals and bulk writers (see apps/eol/counters.py)
+    product_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of products of this vendor."
+    )
+    software_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of software packages of this vendor."
+    )
+
     class Meta:
         ordering = ["name"]
         verbose_name = "Vendor"
@@ -35,6 +51,12 @@ class Product(AbstractEntity):
         ]
         indexes = [
             models.Index(fields=["vendor", "name"]),
+            # Range filters and orderings exposed by the API (see `manage.py explain_indexes`).
+            models.Index(fields=["name"]),
+            models.Index(fields=["end_of_life_date"]),
+            models.Index(fields=["end_of_sale_date"]),
+            models.Index(fields=["end_of_engineering_date"]),
+            models.Index(fields=["end_of_life_announced_date"]),
         ]
         ordering = ["vendor__name", "name"]
         verbose_name = "Product"
@@ -54,13 +76,238 @@ class Software(AbstractEntity):
         help_text="Vendor or manufacturer of the software package."
     )
 
+    # — Derived from `name` on save (see apps/eol/versions.py)
+    family = models.CharField(
+        max_length=300,
+        blank=True,
+        editable=False,
+        help_text="Software family parsed from the name, e.g. 'IOS XE'."
+    )
+    family_key = models.CharField(
+        max_length=300,
+        blank=True,
+        editable=False,
+        help_text="Normalized family used for filtering, e.g. 'ios-xe'."
+    )
+    version = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False,
+        help_text="Version parsed from the name, e.g. '17.3.1'."
+    )
+    version_key = models.CharField(
+        max_length=255,
+        null=True,  # NULL keeps unversioned rows out of version range comparisons
+        blank=True,
+        editable=False,
+        help_text="Sortable encoding of `version`."
+    )
+
+    VERSION_FIELDS = ("family", "family_key", "version", "version_key")
+
     class Meta:
         unique_together = [
             ("vendor", "name")
         ]
         indexes = [
             models.Index(fields=["vendor", "name"]),
+            # Range filters and orderings exposed by the API (see `manage.py explain_indexes`).
+            models.Index(fields=["name"]),
+            models.Index(fields=["end_of_life_date"]),
+            models.Index(fields=["end_of_sale_date"]),
+            models.Index(fields=["end_of_engineering_date"]),
+            models.Index(fields=["end_of_life_announced_date"]),
+            models.Index(fields=["family_key", "version_key"]),
+            models.Index(fields=["version_key"]),
         ]
         ordering = ["vendor__name", "name"]
         verbose_name = "Software Package"
         verbose_name_plural = "Software Packages"
+
+    def set_version_fields(self):
+        """
+        Refresh the parsed family/version columns from `name`. Called by save();
+        bulk writers must call it themselves.
+        """
+        self.family, self.version = parse_software_name(self.name)
+        self.family_key = normalize_family(self.family)
+        self.version_key = version_sort_key(self.version) if self.version else None
+
+    def save(self, *args, **kwargs):
+        self.set_version_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *self.VERSION_FIELDS}
+        super().save(*args, **kwargs)
+
+
+#
+# ─── ALIASES (part numbers, SKUs, inventory strings; see apps/eol/aliases.py) ──────
+#
+class ProductAlias(AbstractAlias):
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="aliases",
+        help_text="Product this alias names."
+    )
+
+    ENTITY_FIELD = "product"
+
+    class Meta:
+        unique_together = [
+            ("product", "key")
+        ]
+        indexes = [
+            # Read by alias resolution to skip key lengths no alias has.
+            models.Index(Length("key"), name="eol_productalias_key_length"),
+        ]
+        verbose_name = "Product Alias"
+        verbose_name_plural = "Product Aliases"
+
+
+class SoftwareAlias(AbstractAlias):
+    software = models.ForeignKey(
+        Software,
+        on_delete=models.CASCADE,
+        related_name="aliases",
+        help_text="Software package this alias names."
+    )
+
+    ENTITY_FIELD = "software"
+
+    class Meta:
+        unique_together = [
+            ("software", "key")
+        ]
+        indexes = [
+            # Read by alias resolution to skip key lengths no alias has.
+            models.Index(Length("key"), name="eol_softwarealias_key_length"),
+        ]
+        verbose_name = "Software Alias"
+        verbose_name_plural = "Software Aliases"
+
+
+#
+# ─── FULL-TEXT SEARCH INDEX (SQLite FTS5, maintained by triggers) ──────────────────
+#
+# Unmanaged: the virtual tables and their triggers are created by migration
+# 0003_search_index. `rowid` is the indexed object's primary key.
+#
+class VendorSearch(models.Model):
+    vendor = models.OneToOneField(
+        Vendor,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_entry",
+    )
+    name = models.TextField()
+    document = SearchDocumentField(db_column="eol_vendor_search")
+
+    class Meta:
+        managed = False
+        db_table = "eol_vendor_search"
+
+
+class ProductSearch(models.Model):
+    product = models.OneToOneField(
+        Product,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_entry",
+    )
+    name = models.TextField()
+    vendor_name = models.TextField()
+    document = SearchDocumentField(db_column="eol_product_search")
+
+    class Meta:
+        managed = False
+        db_table = "eol_product_search"
+
+
+class SoftwareSearch(models.Model):
+    software = models.OneToOneField(
+        Software,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_entry",
+    )
+    name = models.TextField()
+    vendor_name = models.TextField()
+    document = SearchDocumentField(db_column="eol_software_search")
+
+    class Meta:
+        managed = False
+        db_table = "eol_software_search"
+
+
+class CatalogRevision(RevisionCounter):
+    """
+    Single-row counter bumped on every write to Vendor, Product or Software
+    (including deletes). It is a cheap, global validator for cached catalog data.
+    """
+
+    class Meta:
+        verbose_name = "Catalog Revision"
+        verbose_name_plural = "Catalog Revisions"
+
+
+class ChangeEvent(models.Model):
+    """
+    Append-only feed of catalog changes, read by the change-feed API.
+
+    - One row per create/update/delete of a Vendor, Product or Software, written by
+      signals and by the bulk write paths (see apps/eol/changes.py).
+    - `id` is AUTOINCREMENT, so it only grows and is never reused: it is the cursor.
+      SQLite serializes writers, so ids also become visible in order.
+    - Deletes are tombstones: only the model and the object id are kept.
+    """
+
+    class Action(models.TextChoices):
+        CREATE = "create", "Create"
+        UPDATE = "update", "Update"
+        DELETE = "delete", "Delete"
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=16, help_text="Model name: vendor, product or software.")
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=Action.choices)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["model", "object_id"]),
+        ]
+        verbose_name = "Change Event"
+        verbose_name_plural = "Change Events"
+
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.model}:{self.object_id}"
+
+
+class ChangeFeedState(models.Model):
+    """
+    Single row holding the highest ChangeEvent id removed by age-based pruning.
+    Cursors below it may have missed events and must resync from a full download.
+    """
+    pruned_through = models.PositiveBigIntegerField(default=0)
+
+    SINGLETON_ID = 1
+
+    class Meta:
+        verbose_name = "Change Feed State"
+        verbose_name_plural = "Change Feed State"
+
+    def __str__(self):
+        return f"pruned through #{self.pruned_through}"
+
+    @classmethod
+    def current(cls):
+        state = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if state is None:
+            state, _ = cls.objects.get_or_create(pk=cls.SINGLETON_ID)
+        return state
@@ -0,0 +1,116 @@
+# apps/eol/search.py
+
+import re
+
+from django.db import connections, router, transaction
+from django.db.models import F, FloatField, Func, Value
+
+from apps.eol.models import Vendor, Product, Software, VendorSearch, ProductSearch, SoftwareSearch
+
+
+# Relative bm25 weights of the indexed columns: a hit in the object's own name
+# counts ten times as much as a hit in its vendor's name.
+NAME_WEIGHT = 10.0
+VENDOR_NAME_WEIGHT = 1.0
+
+SEARCH_MODELS = {
+    Vendor: VendorSearch,
+    Product: ProductSearch,
+    Software: SoftwareSearch,
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_available = {}
+
+
+#
+# ─── INDEX MAINTENANCE ─────────────────────────────────────────────────────────────
+#
+# The FTS5 tables and the triggers keeping them in sync with every write path
+# (ORM saves, bulk_create/update, raw SQL, cascades) are created by migration
+# 0003_search_index.
+#
+def rebuild_statements():
+    """
+    SQL repopulating the index from the catalog tables and merging its b-trees.
+    """
+    statements = [
+        "DELETE FROM eol_vendor_search",
+        "INSERT INTO eol_vendor_search(rowid, name) SELECT id, name FROM eol_vendor",
+    ]
+    for table, entity_table in (("eol_product_search", "eol_product"), ("eol_software_search", "eol_software")):
+        statements += [
+            f"DELETE FROM {table}",
+            f"INSERT INTO {table}(rowid, name, vendor_name) "
+            f"SELECT e.id, e.name, v.name FROM {entity_table} e JOIN eol_vendor v ON v.id = e.vendor_id",
+        ]
+    statements += [
+        f"INSERT INTO {table}({table}) VALUES ('optimize')"
+        for table in ("eol_vendor_search", "eol_product_search", "eol_software_search")
+    ]
+    return statements
+
+
+#
+# ─── QUERIES ───────────────────────────────────────────────────────────────────────
+#
+def is_available(model):
+    """
+    True when `model` has an FTS5 index on the database its reads are routed to.
+    """
+    if model not in SEARCH_MODELS:
+        return False
+    alias = router.db_for_read(model)
+    connection = connections[alias]
+    if connection.vendor != "sqlite":
+        return False
+    if alias not in _available:
+        _available[alias] = "eol_product_search" in connection.introspection.table_names()
+    return _available[alias]
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query: every word becomes a quoted prefix term and
+    all terms must match (in any indexed column), like DRF's SearchFilter.
+    Returns None when the text contains no searchable word.
+    """
+    terms = _TOKEN_RE.findall(text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def can_search(model, text):
+    return build_match_query(text) is not None and is_available(model)
+
+
+def search(queryset, text):
+    """
+    Filter `queryset` to rows matching `text` and annotate `search_rank`
+    (bm25; lower is a better match). Returns None if the index cannot be used.
+
+    Aggregated querysets (GROUP BY) cannot evaluate bm25(); they are filtered
+    through a `pk IN (...)` subquery instead and left unranked.
+    """
+    model = queryset.model
+    if not can_search(model, text):
+        return None
+    match = build_match_query(text)
+
+    if queryset.query.group_by is not None:
+        matches = SEARCH_MODELS[model].objects.filter(document__match=match).values("pk")
+        return queryset.filter(pk__in=matches)
+
+    weights = [Value(NAME_WEIGHT)] if model is Vendor else [Value(NAME_WEIGHT), Value(VENDOR_NAME_WEIGHT)]
+    return queryset.filter(search_entry__document__match=match).annotate(
+        search_rank=Func(F("search_entry__document"), *weights, function="bm25", output_field=FloatField()),
+    )
+
+
+def rebuild(using="default"):
+    connection = connections[using]
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for statement in rebuild_statements():
+            cursor.execute(statement)
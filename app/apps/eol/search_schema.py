@@ -0,0 +1,81 @@
+# apps/eol/search_schema.py
+
+from django.db import migrations
+
+
+# Trigger definitions of the FTS5 search index (see migration 0003_search_index).
+#
+# SQLite cannot alter most columns in place: Django rebuilds the table, drops the
+# old one (and its triggers with it) and renames the copy. Triggers on other
+# tables that reference the rebuilt one make the rename fail. Migrations that
+# alter eol_vendor, eol_product or eol_software therefore wrap their operations
+# in `without_search_triggers()`, which drops the triggers first and recreates
+# them afterwards.
+
+TABLES = ("eol_vendor_search", "eol_product_search", "eol_software_search")
+
+
+def _entity_triggers(table, entity_table):
+    vendor_name = "(SELECT name FROM eol_vendor WHERE id = new.vendor_id)"
+    return [
+        f"CREATE TRIGGER {table}_ai AFTER INSERT ON {entity_table} BEGIN "
+        f"INSERT INTO {table}(rowid, name, vendor_name) VALUES (new.id, new.name, {vendor_name}); END",
+        f"CREATE TRIGGER {table}_ad AFTER DELETE ON {entity_table} BEGIN "
+        f"DELETE FROM {table} WHERE rowid = old.id; END",
+        f"CREATE TRIGGER {table}_au AFTER UPDATE OF id, name, vendor_id ON {entity_table} BEGIN "
+        f"DELETE FROM {table} WHERE rowid = old.id; "
+        f"INSERT INTO {table}(rowid, name, vendor_name) VALUES (new.id, new.name, {vendor_name}); END",
+    ]
+
+
+CREATE_TRIGGERS = [
+    "CREATE TRIGGER eol_vendor_search_ai AFTER INSERT ON eol_vendor BEGIN "
+    "INSERT INTO eol_vendor_search(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER eol_vendor_search_ad AFTER DELETE ON eol_vendor BEGIN "
+    "DELETE FROM eol_vendor_search WHERE rowid = old.id; END",
+    *_entity_triggers("eol_product_search", "eol_product"),
+    *_entity_triggers("eol_software_search", "eol_software"),
+    # A vendor rename also rewrites the vendor_name column of its products/software.
+    "CREATE TRIGGER eol_vendor_search_au AFTER UPDATE OF id, name ON eol_vendor BEGIN "
+    "DELETE FROM eol_vendor_search WHERE rowid = old.id; "
+    "INSERT INTO eol_vendor_search(rowid, name) VALUES (new.id, new.name); "
+    "UPDATE eol_product_search SET vendor_name = new.name "
+    "WHERE rowid IN (SELECT id FROM eol_product WHERE vendor_id = new.id); "
+    "UPDATE eol_software_search SET vendor_name = new.name "
+    "WHERE rowid IN (SELECT id FROM eol_software WHERE vendor_id = new.id); END",
+]
+
+DROP_TRIGGERS = [
+    f"DROP TRIGGER IF EXISTS {table}_{suffix}" for table in TABLES for suffix in ("ai", "ad", "au")
+]
+
+
+def _has_index(schema_editor):
+    connection = schema_editor.connection
+    return connection.vendor == "sqlite" and "eol_product_search" in connection.introspection.table_names()
+
+
+def drop_search_triggers(apps, schema_editor):
+    if not _has_index(schema_editor):
+        return
+    for statement in DROP_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def create_search_triggers(apps, schema_editor):
+    if not _has_index(schema_editor):
+        return
+    for statement in DROP_TRIGGERS + CREATE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def without_search_triggers(*operations):
+    """
+    Wrap migration operations that rebuild catalog tables so the search index
+    triggers are dropped before and recreated after them (in both directions).
+    """
+    return [
+        migrations.RunPython(drop_search_triggers, create_search_triggers),
+        *operations,
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
@@ -0,0 +1,76 @@
+# apps/eol/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from apps.eol import changes, counters
+from apps.eol.models import Vendor, Product, Software, CatalogRevision
+
+
+# Sent once by bulk write paths (bulk_create/bulk_update/update(), which skip
+# post_save) after they changed rows of `sender`. Pass `vendor_ids` when rows were
+# created or deleted so the vendor counters of those vendors are recounted.
+catalog_bulk_changed = Signal()
+
+
+#
+# ─── CATALOG REVISION ───────────────────────────────────────────────────────────────
+#
+@receiver(post_save, sender=Vendor)
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Software)
+@receiver(post_delete, sender=Vendor)
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Software)
+@receiver(catalog_bulk_changed)
+def bump_catalog_revision(sender, **kwargs):
+    CatalogRevision.bump()
+
+
+#
+# ─── VENDOR COUNTERS ────────────────────────────────────────────────────────────────
+#
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Software)
+def count_saved_entity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return  # loaddata: run `manage.py reconcile_vendor_counters` afterwards
+    if created:
+        counters.adjust(sender, instance.vendor_id, +1)
+    else:
+        loaded_vendor_id = getattr(instance, "_loaded_vendor_id", None)
+        if loaded_vendor_id is not None and loaded_vendor_id != instance.vendor_id:
+            counters.adjust(sender, loaded_vendor_id, -1)
+            counters.adjust(sender, instance.vendor_id, +1)
+    instance._loaded_vendor_id = instance.vendor_id
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Software)
+def count_deleted_entity(sender, instance, **kwargs):
+    vendor_id = getattr(instance, "_loaded_vendor_id", None) or instance.vendor_id
+    counters.adjust(sender, vendor_id, -1)
+
+
+@receiver(catalog_bulk_changed, sender=Product)
+@receiver(catalog_bulk_changed, sender=Software)
+def recount_bulk_vendors(sender, vendor_ids=None, **kwargs):
+    if vendor_ids:
+        counters.reconcile(vendor_ids)
+
+
+#
+# ─── CHANGE FEED ────────────────────────────────────────────────────────────────────
+#
+@receiver(post_save, sender=Vendor)
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Software)
+def record_saved_change(sender, instance, created, **kwargs):
+    changes.record(sender, changes.Action.CREATE if created else changes.Action.UPDATE, [instance.pk])
+
+
+@receiver(post_delete, sender=Vendor)
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Software)
+def record_deleted_change(sender, instance, **kwargs):
+    changes.record(sender, changes.Action.DELETE, [instance.pk])
@@ -0,0 +1,57 @@
+# apps/eol/versions.py
+
+import re
+
+
+# Width of one numeric component in a version key. Ten digits keep build numbers
+# and dates (e.g. 20240131) in order.
+COMPONENT_WIDTH = 10
+VERSION_KEY_MAX_LENGTH = 255
+
+_VERSION_TOKEN_RE = re.compile(r"^[vV]?(\d[\w.()\-]*)$")
+_COMPONENT_RE = re.compile(r"\d+|[a-zA-Z]+")
+_FAMILY_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_family(text):
+    """
+    "IOS XE", "IOS-XE" and "ios_xe" all become "ios-xe".
+    """
+    return _FAMILY_SEPARATOR_RE.sub("-", text.lower()).strip("-")
+
+
+def version_sort_key(version):
+    """
+    Build a string that sorts like the version it encodes.
+
+    Numeric runs are zero-padded and letter runs lowercased, joined with ".":
+    "17.3.1" -> "0000000017.0000000003.0000000001", "20.2R3" ->
+    "0000000020.0000000002.r.0000000003". A shorter version sorts before its
+    extensions (17.3 < 17.3.1 < 17.10). Returns None when there is no digit.
+    """
+    components = _COMPONENT_RE.findall(version)
+    if not any(component.isdigit() for component in components):
+        return None
+    key = ".".join(
+        component.zfill(COMPONENT_WIDTH) if component.isdigit() else component.lower()
+        for component in components
+    )
+    return key[:VERSION_KEY_MAX_LENGTH]
+
+
+def parse_software_name(name):
+    """
+    Split a software name into (family, version).
+
+    The version is the first whitespace-separated token that starts with a digit
+    (optionally prefixed with "v"); everything before it is the family:
+    "Omada SDN Controller 5.2.4" -> ("Omada SDN Controller", "5.2.4"),
+    "RouterOS v7.1" -> ("RouterOS", "7.1"). Names without such a token are all
+    family and no version.
+    """
+    tokens = name.split()
+    for index, token in enumerate(tokens):
+        match = _VERSION_TOKEN_RE.match(token)
+        if match:
+            return " ".join(tokens[:index]), match.group(1)
+    return name.strip(), ""
@@ -0,0 +1,316 @@
+# core/metrics.py
+
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+
+# Phases timed inside a request, in Server-Timing order.
+PHASES = ("auth", "permission", "throttle", "db", "serialize", "render")
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Methods labelled as sent; anything else a client invents is labelled "other".
+HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+
+#
+# ─── PER-REQUEST TIMINGS ───────────────────────────────────────────────────────────
+#
+class RequestMetrics:
+    """
+    Timings of one request. Shared by reference with threads running its sync code
+    (sync_to_async copies the context), so async views are measured too.
+    """
+
+    __slots__ = ("started", "phases", "queries", "view_finished")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.view_finished = None
+
+
+_request_metrics = contextvars.ContextVar("request_metrics", default=None)
+
+
+@contextmanager
+def timed(phase):
+    """
+    Add the time spent in the block to `phase` of the current request. Outside an
+    instrumented request this only costs a context variable read.
+    """
+    metrics = _request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] += time.perf_counter() - started
+
+
+def instrument_queries(execute, sql, params, many, context):
+    """
+    Connection execute wrapper counting queries and their time for the current request.
+    """
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.phases["db"] += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install_query_instrumentation(connection):
+    if instrument_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, instrument_queries)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    install_query_instrumentation(connection)
+
+
+class TimedViewMixin:
+    """
+    DRF view mixin timing authentication, permission and throttle checks into the
+    current request's metrics, and marking where the view handed its response over
+    to rendering.
+    """
+
+    def perform_authentication(self, request):
+        with timed("auth"):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with timed("permission"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timed("permission"):
+            super().check_object_permissions(request, obj)
+
+    def check_throttles(self, request):
+        with timed("throttle"):
+            super().check_throttles(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            metrics.view_finished = time.perf_counter()
+        return response
+
+
+#
+# ─── AGGREGATION (Prometheus text format) ─────────────────────────────────────────
+#
+class Histogram:
+    """
+    Thread-safe cumulative histogram with labels, rendered in the Prometheus text
+    exposition format.
+    """
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [count per bucket (non-cumulative, last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return "\n".join(lines)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """
+    This worker's request metrics. Every worker process keeps its own: scrape each
+    worker (or sum them) rather than a load-balanced URL.
+    """
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            "eol_http_request_duration_seconds", "Time to serve a request.",
+            ("endpoint", "method", "status"), DURATION_BUCKETS,
+        )
+        self.phase_duration = Histogram(
+            "eol_http_request_phase_seconds",
+            "Time a request spent authenticating, checking permissions and throttles, in SQL, serializing and rendering.",
+            ("endpoint", "phase"), DURATION_BUCKETS,
+        )
+        self.queries = Histogram(
+            "eol_http_request_queries", "SQL queries run by a request.",
+            ("endpoint",), QUERY_COUNT_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "eol_http_response_size_bytes", "Size of response bodies (streams only with a Content-Length).",
+            ("endpoint",), SIZE_BUCKETS,
+        )
+        self.histograms = (self.request_duration, self.phase_duration, self.queries, self.response_size)
+
+    def record(self, endpoint, method, status, metrics, total, size):
+        self.request_duration.observe((endpoint, method, str(status)), total)
+        for phase, seconds in metrics.phases.items():
+            if seconds:
+                self.phase_duration.observe((endpoint, phase), seconds)
+        self.queries.observe((endpoint,), metrics.queries)
+        if size is not None:
+            self.response_size.observe((endpoint,), size)
+
+    def render(self):
+        return "\n".join(histogram.render() for histogram in self.histograms) + "\n"
+
+    def clear(self):
+        for histogram in self.histograms:
+            histogram.clear()
+
+
+registry = MetricsRegistry()
+
+
+#
+# ─── MIDDLEWARE & ENDPOINT ─────────────────────────────────────────────────────────
+#
+class RequestMetricsMiddleware:
+    """
+    Measures every request and feeds `registry` (settings.API_METRICS["ENABLED"]).
+
+    - SQL queries are counted by a wrapper installed on every database connection.
+    - DRF views with TimedViewMixin add auth/permission/throttle timings; the
+      values() fast path and detail views add serialization time; rendering is the
+      time after the view returned its response.
+    - With API_METRICS["SERVER_TIMING"], responses carry a `Server-Timing` header
+      with the same numbers (opt-in: it tells clients about server internals).
+    Requests are labelled with their URL name (e.g. "product-list") and unknown
+    methods as "other", which keeps label cardinality bounded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported.
+        for connection in connections.all(initialized_only=True):
+            install_query_instrumentation(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.API_METRICS["ENABLED"]:
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+        return self.process_response(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not settings.API_METRICS["ENABLED"]:
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+        return self.process_response(request, response, metrics)
+
+    def process_response(self, request, response, metrics):
+        finished = time.perf_counter()
+        if metrics.view_finished is not None:
+            metrics.phases["render"] += finished - metrics.view_finished
+        total = finished - metrics.started
+
+        endpoint = endpoint_name(request)
+        if response.streaming:
+            size = int(response["Content-Length"]) if response.has_header("Content-Length") else None
+        else:
+            size = len(response.content)
+        method = request.method if request.method in HTTP_METHODS else "other"
+        registry.record(endpoint, method, response.status_code, metrics, total, size)
+
+        if settings.API_METRICS["SERVER_TIMING"]:
+            entries = [
+                f"{phase};dur={seconds * 1000:.2f}" + (f';desc="{metrics.queries} queries"' if phase == "db" else "")
+                for phase, seconds in metrics.phases.items()
+                if seconds or phase == "db"
+            ]
+            entries.append(f"total;dur={total * 1000:.2f}")
+            response["Server-Timing"] = ", ".join(entries)
+        return response
+
+
+def endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    return (match.view_name or match.route) if match is not None else "unmatched"
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for this worker's `registry`. Requires
+    API_METRICS["TOKEN"] as a Bearer token; without a configured token it is closed.
+    """
+    token = settings.API_METRICS["TOKEN"]
+    if not token:
+        return HttpResponseForbidden("Metrics are disabled: no metrics token is configured.")
+    if not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponseForbidden("Invalid metrics token.")
+    response = HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+    response["X-Worker-Pid"] = str(os.getpid())
+    return response
@@ -0,0 +1,216 @@
+# core/query_budgets.py
+
+import contextvars
+import logging
+import os
+import re
+import traceback
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_string_literals = re.compile(r"'(?:[^']|'')*'")
+_number_literals = re.compile(r"\b\d+(?:\.\d+)?\b")
+_value_lists = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_repeated_lists = re.compile(r"\(\?, \.\.\.\)(?:\s*,\s*\(\?, \.\.\.\))+")
+
+# Frames of the execute wrappers themselves are never the call site.
+_wrapper_files = {os.path.abspath(__file__), os.path.abspath(metrics.__file__)}
+
+
+#
+# ─── BUDGETS ───────────────────────────────────────────────────────────────────────
+#
+def query_budget(method, endpoint):
+    """
+    The most queries a `method` request to `endpoint` (a URL name, e.g.
+    "product-list") may run, from settings.QUERY_BUDGETS, or None when none is
+    declared.
+    """
+    budget = settings.QUERY_BUDGETS.get(endpoint)
+    if isinstance(budget, dict):
+        return budget.get(method)
+    return budget
+
+
+#
+# ─── SHAPES & CALL SITES ───────────────────────────────────────────────────────────
+#
+def query_shape(sql):
+    """
+    `sql` with parameters and literals replaced by `?` and value lists collapsed, so
+    statements differing only in their values (`WHERE id = 1` / `WHERE id = 2`,
+    `IN (?, ?)` / `IN (?, ?, ?)`) share one shape.
+    """
+    sql = _string_literals.sub("?", sql.replace("%s", "?"))
+    sql = _number_literals.sub("?", sql)
+    sql = _value_lists.sub("(?, ...)", sql)
+    return _repeated_lists.sub("(?, ...), ...", sql)
+
+
+def call_site():
+    """
+    The innermost frame of project code (under BASE_DIR, outside site-packages) on the
+    current stack, as "path:line in function".
+    """
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(base_dir) and "site-packages" not in filename and filename not in _wrapper_files:
+            return f"{os.path.relpath(filename, base_dir)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+#
+# ─── INSPECTION ────────────────────────────────────────────────────────────────────
+#
+class QueryInspector:
+    """
+    SQL run during one request or `inspect_queries()` block, on every connection:
+    how many statements ran and how often each shape did, with the call site of the
+    `threshold`-th repetition of a shape.
+
+    Like RequestMetrics it lives in a context variable and is shared by reference
+    with threads running the request's sync code. Nested inspectors also record into
+    the enclosing one.
+    """
+
+    __slots__ = ("threshold", "parent", "count", "shapes", "call_sites")
+
+    def __init__(self, threshold, parent=None):
+        self.threshold = threshold
+        self.parent = parent
+        self.count = 0
+        self.shapes = {}
+        self.call_sites = {}
+
+    def record(self, sql):
+        inspector = self
+        shape = query_shape(sql)
+        while inspector is not None:
+            inspector.count += 1
+            seen = inspector.shapes[shape] = inspector.shapes.get(shape, 0) + 1
+            if seen == inspector.threshold:
+                inspector.call_sites[shape] = call_site()
+            inspector = inspector.parent
+
+    def repeated(self):
+        """
+        [(shape, count, call site)] of the shapes run `threshold` times or more, most
+        frequent first.
+        """
+        rows = [
+            (shape, count, self.call_sites.get(shape, "unknown"))
+            for shape, count in self.shapes.items()
+            if count >= self.threshold
+        ]
+        return sorted(rows, key=lambda row: -row[1])
+
+
+_query_inspector = contextvars.ContextVar("query_inspector", default=None)
+
+
+def inspect_query(execute, sql, params, many, context):
+    """
+    Connection execute wrapper feeding the current QueryInspector. `executemany()`
+    counts as one statement.
+    """
+    inspector = _query_inspector.get()
+    if inspector is not None:
+        inspector.record(sql)
+    return execute(sql, params, many, context)
+
+
+def install_query_inspection(connection):
+    if inspect_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(inspect_query)
+
+
+@receiver(connection_created)
+def inspect_new_connection(sender, connection, **kwargs):
+    install_query_inspection(connection)
+
+
+@contextmanager
+def inspect_queries(threshold=None):
+    """
+    Collect the SQL run in the block into a new QueryInspector and yield it.
+    """
+    for connection in connections.all(initialized_only=True):
+        install_query_inspection(connection)
+    inspector = QueryInspector(
+        threshold or settings.QUERY_INSPECTOR["REPEAT_THRESHOLD"],
+        parent=_query_inspector.get(),
+    )
+    token = _query_inspector.set(inspector)
+    try:
+        yield inspector
+    finally:
+        _query_inspector.reset(token)
+
+
+#
+# ─── MIDDLEWARE ────────────────────────────────────────────────────────────────────
+#
+class QueryInspectorMiddleware:
+    """
+    Development-mode N+1 detector (settings.QUERY_INSPECTOR["DETECT"], on with DEBUG).
+
+    Logs a warning for every request that
+    - ran one statement shape REPEAT_THRESHOLD times or more, with the project code
+      that ran it: usually a relation read per row in a loop, i.e. a missing
+      `select_related()`/`prefetch_related()`;
+    - ran more queries than its endpoint's QUERY_BUDGETS entry.
+    Queries run while a streaming response is consumed are not seen.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.QUERY_INSPECTOR["DETECT"]:
+            return self.get_response(request)
+        with inspect_queries() as inspector:
+            response = self.get_response(request)
+        self.report(request, inspector)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.QUERY_INSPECTOR["DETECT"]:
+            return await self.get_response(request)
+        with inspect_queries() as inspector:
+            response = await self.get_response(request)
+        self.report(request, inspector)
+        return response
+
+    @staticmethod
+    def report(request, inspector):
+        endpoint = metrics.endpoint_name(request)
+        for shape, count, site in inspector.repeated():
+            logger.warning(
+                "%s %s ran %d queries of one shape (N+1?) from %s: %s",
+                request.method, request.path, count, site, shape,
+            )
+        budget = query_budget(request.method, endpoint)
+        if budget is not None and inspector.count > budget:
+            logger.warning(
+                "%s %s ran %d queries, over the %s budget of %d.",
+                request.method, request.path, inspector.count, endpoint, budget,
+            )
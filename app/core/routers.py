@@ -0,0 +1,165 @@
+# core/routers.py
+
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+# Set on responses to writes; while present, the client's requests read from the primary.
+PIN_COOKIE = "eol_pin_primary"
+
+# Apps whose tables are copied to the replicas. Everything else (auth, sessions, API
+# tokens) is always read from the primary.
+REPLICA_APP_LABELS = {"eol"}
+
+
+class RoutingState:
+    """
+    Per-request routing flags. `read_only` marks requests served by a read action
+    (including lookups sent as POST); `replica_reads` is then switched on unless the
+    client is `pinned` to the primary. `replica` is the one replica all of the
+    request's reads go to: replicas are synced at different times, so mixing them
+    could pair a newer catalog revision with older rows (or a page with the count
+    of another snapshot).
+    """
+
+    __slots__ = ("pinned", "read_only", "replica_reads", "replica")
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.read_only = False
+        self.replica_reads = False
+        self.replica = None
+
+
+_routing_state = contextvars.ContextVar("db_routing_state", default=None)
+
+
+def read_from_replicas():
+    """
+    Let the rest of the current request read catalog tables from a replica, unless
+    the request is pinned to the primary. Outside a request this does nothing.
+    """
+    state = _routing_state.get()
+    if state is not None:
+        state.read_only = True
+        state.replica_reads = not state.pinned
+        if state.replica_reads and state.replica is None and settings.DATABASE_REPLICAS:
+            state.replica = random.choice(settings.DATABASE_REPLICAS)
+
+
+def read_from_primary():
+    """
+    Send the remaining reads of the current request to the primary.
+    """
+    state = _routing_state.get()
+    if state is not None:
+        state.replica_reads = False
+
+
+class ReplicaRouter:
+    """
+    Routes catalog reads to `settings.DATABASE_REPLICAS`.
+
+    - Reads go to a replica only for models of REPLICA_APP_LABELS and only while the
+      current request allowed it (`read_from_replicas()`, see ReplicaReadMixin).
+      The replica is picked at random once per request. Management commands,
+      admin, auth and token checks read from the primary.
+    - Writes always go to the primary; migrations only run there, since replicas
+      are file copies of it (`manage.py sync_replicas`).
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if (
+            state is None
+            or not state.replica_reads
+            or state.replica is None
+            or model._meta.app_label not in REPLICA_APP_LABELS
+        ):
+            return "default"
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class PrimaryPinningMiddleware:
+    """
+    Gives every request its RoutingState and provides read-your-writes.
+
+    - Requests carrying PIN_COOKIE are pinned to the primary.
+    - A successful unsafe request (POST/PUT/PATCH/DELETE) that was not a read action
+      sets PIN_COOKIE for `settings.DATABASE_REPLICA_PIN_SECONDS`, covering the
+      replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self.process_response(request, response, state)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self.process_response(request, response, state)
+
+    def process_response(self, request, response, state):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in self.safe_methods
+            and not state.read_only
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    View mixin: the actions in `replica_actions` read catalog tables from a replica
+    (unless the request is pinned to the primary).
+    """
+
+    # `export` streams after the middleware has returned, so it reads from the primary.
+    replica_actions = ("list", "retrieve", "lookup")
+
+    def initial(self, request, *args, **kwargs):
+        if getattr(self, "action", None) in self.replica_actions:
+            read_from_replicas()
+        super().initial(request, *args, **kwargs)
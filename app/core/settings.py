@@ -44,6 +44,118 @@ API_THROTTLE_RATES = {
     "default": "100/min",
     "ha": "1000/min",
 }
+# Throttle counters shared by all workers on this host (see apps/api/ratelimit.py).
+API_RATE_LIMIT_DB = os.environ.get("EOL_RATE_LIMIT_DB", str(BASE_DIR / "ratelimit.sqlite3"))
+# Upper bound on (vendor, name) pairs accepted by one bulk lookup call.
+API_BULK_LOOKUP_MAX_ITEMS = 50000
+# Upper bound on rows accepted by one bulk create/upsert call.
+API_BULK_WRITE_MAX_ITEMS = 5000
+
+# Per-worker cache of serialized list responses (see apps/api/cache.py).
+# Set MAX_ENTRIES or TIMEOUT (seconds) to 0 to disable it.
+API_RESPONSE_CACHE = {
+    "MAX_ENTRIES": 256,
+    "TIMEOUT": 300,
+}
+
+# Per-worker cache of APIToken permissions (see apps/api/tokens.py).
+API_TOKEN_CACHE = {
+    "MAX_ENTRIES": 1024,
+    "TIMEOUT": 300,
+}
+
+# Long polling on the async read endpoints (see apps/api/async_views.py): a request
+# sending `Prefer: wait=<seconds>` with validators that still match is held until the
+# catalog revision moves (checked every POLL_INTERVAL seconds), for at most MAX_WAIT.
+API_LONG_POLL = {
+    "MAX_WAIT": 30,
+    "POLL_INTERVAL": 1.0,
+}
+
+# History kept by the change feed (/api/v1/changes/) when pruned with
+# `manage.py compact_change_feed`; clients with older cursors must resync.
+CHANGE_FEED_RETENTION_DAYS = 30
+
+# Where catalog snapshots (/api/v1/snapshot/, see apps/api/snapshots.py) are built.
+CATALOG_SNAPSHOT_DIR = os.environ.get("EOL_SNAPSHOT_DIR", str(BASE_DIR / "snapshots"))
+
+# Pre-rendered OpenAPI schema (see apps/api/schema.py), regenerated only when the code
+# version changes: BUILD_ID (e.g. the deployed commit), else a hash of the sources.
+# Rendered schemas are shared through DIR; "" keeps them in memory only.
+API_SCHEMA_CACHE = {
+    "BUILD_ID": os.environ.get("EOL_BUILD_ID", ""),
+    "DIR": os.environ.get("EOL_SCHEMA_CACHE_DIR", str(BASE_DIR / "schema_cache")),
+}
+
+# Request instrumentation (see core/metrics.py): per-endpoint histograms served at
+# /metrics (only with TOKEN set, sent as a Bearer token) and, opt-in, Server-Timing
+# response headers.
+API_METRICS = {
+    "ENABLED": True,
+    "SERVER_TIMING": os.environ.get("EOL_SERVER_TIMING", "") == "1",
+    "TOKEN": os.environ.get("EOL_METRICS_TOKEN", ""),
+}
+
+# Query budgets (see core/query_budgets.py): the most SQL queries one request to an
+# endpoint (URL name) may run, per HTTP method where they differ. `manage.py
+# check_query_budgets` runs every endpoint against a seeded test database and fails
+# when one is over budget, undeclared, or its queries grow with the page size.
+# Budgets are counted cold: per-worker caches empty, writes in their own transaction.
+QUERY_BUDGETS = {
+    # API (JWT user lookup included; token permissions counted uncached)
+    "api-root": 1,
+    "schema": 1,
+    "swagger-ui": 1,
+    "redoc": 1,
+    "cache-stats": 1,
+    "changes": 8,  # + 1 per 900 objects of one model on the page
+    "snapshot": 7,  # the first request of a revision builds the snapshot
+    "snapshot-manifest": 7,  # likewise
+    "vendor-list": 5,
+    "vendor-detail": 3,
+    "async-vendor-list": 4,
+    "async-vendor-detail": 3,
+    **{
+        name: budget
+        for basename in ("product", "software")
+        for name, budget in (
+            (f"{basename}-list", {"GET": 5, "POST": 13}),
+            (f"{basename}-detail", {"GET": 2, "PUT": 10, "PATCH": 9, "DELETE": 12}),
+            (f"{basename}-export", 2),
+            (f"{basename}-lookup", 3),
+            (f"{basename}-resolve", 5),
+            (f"{basename}-bulk-create", 14),
+            (f"{basename}-bulk-upsert", 15),
+            (f"async-{basename}-list", 4),
+            (f"async-{basename}-detail", 2),
+            (f"async-{basename}-lookup", 4),
+        )
+    },
+    # Pages outside the API
+    "metrics": 0,
+    "eol_index": 0,
+    # Admin (session and user lookups included)
+    "admin:eol_vendor_changelist": 6,
+    "admin:eol_vendor_add": 3,
+    "admin:eol_vendor_change": 4,
+    "admin:eol_product_changelist": 6,
+    "admin:eol_product_add": 4,
+    "admin:eol_product_change": 7,
+    "admin:eol_software_changelist": 6,
+    "admin:eol_software_add": 4,
+    "admin:eol_software_change": 7,
+    "admin:api_apitoken_changelist": 7,
+    "admin:api_apitoken_add": 4,
+    "admin:api_apitoken_change": 6,
+}
+
+# Development N+1 detector: with DETECT on, every request logs statement shapes it
+# ran REPEAT_THRESHOLD times or more (with the call site) and exceeded budgets.
+QUERY_INSPECTOR = {
+    "DETECT": os.environ.get("EOL_QUERY_DETECT", "1" if DEBUG else "") == "1",
+    "REPEAT_THRESHOLD": 5,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PERMISSION_CLASSES': [
@@ -91,8 +203,11 @@ SPECTACULAR_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    "core.metrics.RequestMetricsMiddleware",
+    "core.query_budgets.QueryInspectorMiddleware",
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.routers.PrimaryPinningMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -131,6 +246,62 @@ DATABASES = {
     }
 }
 
+# Read replicas: EOL_DB_REPLICAS is a comma-separated list of SQLite files kept in sync
+# with the primary by `manage.py sync_replicas`. Catalog reads of the API viewsets go
+# to them (see core/routers.py); a client that wrote is pinned to the primary for
+# DATABASE_REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+for _index, _path in enumerate(filter(None, os.environ.get("EOL_DB_REPLICAS", "").split(","))):
+    DATABASES[f"replica{_index + 1}"] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': _path.strip(),
+        'OPTIONS': {"init_command": "PRAGMA query_only = ON"},
+        'TEST': {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_index + 1}")
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = 5
+
+# SQLite tuning profiles, selected with EOL_DB_PROFILE ("default" or "production").
+# "production" runs SQLITE_PRAGMAS on every new connection, waits up to `timeout`
+# seconds for a lock (busy timeout) and starts transactions with BEGIN IMMEDIATE: a
+# deferred transaction that reads and then writes cannot wait for the write lock and
+# fails with "database is locked" at once. Connections are kept across requests
+# (CONN_MAX_AGE), which pays off with WSGI workers; ASGI uses a thread per request.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # readers no longer block the writer, nor the writer readers
+    "synchronous": "NORMAL",  # with WAL, only checkpoints fsync
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # KiB, per connection
+    "temp_store": "MEMORY",
+}
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "OPTIONS": {
+            "init_command": "; ".join(f"PRAGMA {name} = {value}" for name, value in SQLITE_PRAGMAS.items()),
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+    },
+}
+DB_PROFILE = os.environ.get("EOL_DB_PROFILE", "default")
+
+DATABASES["default"].update(SQLITE_PROFILES[DB_PROFILE])
+if DB_PROFILE == "production":
+    # Replicas are read-only copies: same read-side pragmas, no journal mode switch.
+    for _alias in DATABASE_REPLICAS:
+        DATABASES[_alias].update(SQLITE_PROFILES["production"], OPTIONS={
+            "init_command": "; ".join(
+                ["PRAGMA query_only = ON"]
+                + [f"PRAGMA {name} = {value}" for name, value in SQLITE_PRAGMAS.items() if name != "journal_mode"]
+            ),
+            "timeout": 20,
+        })
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
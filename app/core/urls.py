@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from core.metrics import metrics_view
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     
     path('', include("apps.eol.urls")),
     path('api/v1/', include("apps.api.urls")),
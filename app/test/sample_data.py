@@ -3,6 +3,7 @@
 # This script assumes the Django settings module is already configured via DJANGO_SETTINGS_MODULE.
 # You can run this using: 
 #    python manage.py shell < test/sample_data.py
+# For production-sized catalogs use `python manage.py generate_catalog` instead.
 
 import os
 import django